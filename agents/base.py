@@ -1,16 +1,68 @@
 """Base agent: shared LLM call logic."""
 
-from models.llm import llm_call
+from typing import Callable, Optional
+
+from config import STREAM_VALIDATION
+from models.context import fit_history
+from models.llm import llm_call, llm_stream
 from models.schemas import ConversationState
 
 
 class BaseAgent:
     """Shared logic for agents. Subclasses implement handle_message."""
 
-    async def _llm_conversation(self, messages: list[dict], system_prompt: str) -> str:
-        """Call conversation model with system + messages."""
+    async def _llm_conversation(
+        self,
+        messages: list[dict],
+        system_prompt: str,
+        state: Optional[ConversationState] = None,
+        call_site: Optional[str] = None,
+    ) -> str:
+        """
+        Call conversation model with system + messages. When state is given, messages are
+        history (state.messages, optionally plus the pending user turn) and are fitted to the
+        conversation context budget via the rolling summary. call_site selects the
+        reasoning policy (see config.CALL_SITE_POLICIES).
+        """
+        if state is not None:
+            system_prompt, messages = await fit_history(state, messages, system_prompt)
+        full = [{"role": "system", "content": system_prompt}] + messages
+        return await llm_call("conversation", full, call_site=call_site)
+
+    async def _llm_conversation_checked(
+        self,
+        messages: list[dict],
+        system_prompt: str,
+        validator: Callable[[str], Optional[str]],
+        state: Optional[ConversationState] = None,
+        call_site: Optional[str] = None,
+    ) -> tuple[str, Optional[str]]:
+        """
+        Like _llm_conversation, but runs validator on the growing reply while it streams.
+        validator(text_so_far) returns a violation name or None; on the first violation the
+        stream is closed and (partial_text, violation) is returned so the caller can start
+        its corrective call immediately. Returns (reply, None) when the reply passes.
+        With STREAM_VALIDATION off (or if streaming fails), validates the full completion.
+        """
+        if state is not None:
+            system_prompt, messages = await fit_history(state, messages, system_prompt)
         full = [{"role": "system", "content": system_prompt}] + messages
-        return await llm_call("conversation", full)
+        if STREAM_VALIDATION:
+            text = ""
+            stream = llm_stream("conversation", full, call_site=call_site)
+            try:
+                async for chunk in stream:
+                    text += chunk
+                    violation = validator(text)
+                    if violation:
+                        return text, violation
+                return text.strip(), None
+            except Exception:
+                pass  # fall back to a plain completion below
+            finally:
+                await stream.aclose()
+        reply = await llm_call("conversation", full, call_site=call_site)
+        return reply, validator(reply)
 
     async def handle_message(
         self, state: ConversationState, user_message: str
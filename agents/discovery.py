@@ -1,15 +1,24 @@
 """Discovery Agent: PM-style interviewer with extraction and completeness checkpoint."""
 
-from config import DISCOVERY_MIN_TURNS
+from typing import Optional
+
+from config import DEADLINE_RESERVE_S, DISCOVERY_MIN_TURNS
 from agents.base import BaseAgent
+from models import telemetry
+from models.context import fit_history, recent_within_budget
+from models.deadline import within_budget
+from models.policy import record_quality
 from models.schemas import ConversationState, DiscoverySummary
 from prompts.discovery import (
     DISCOVERY_ASK_FOR_IDEA_PROMPT,
+    DISCOVERY_FALLBACK_QUESTION,
+    DISCOVERY_GAP_QUESTIONS,
     DISCOVERY_SUMMARY_PROMPT,
     DISCOVERY_SYSTEM_PROMPT,
 )
 from tools.completeness import check_completeness
 from tools.extraction import extract_discovery_summary
+from tools.extraction_gate import GateDecision, gate_extraction
 from tools.intent import classify_discovery_review
 
 
@@ -42,6 +51,13 @@ def _build_prompt(state: ConversationState) -> str:
     return "\n".join(parts)
 
 
+def _gap_question(state: ConversationState) -> str:
+    """Degraded-mode reply (turn deadline reached): templated question for the first gap."""
+    _, gaps, _ = check_completeness(state.discovery_summary)
+    questions = [DISCOVERY_GAP_QUESTIONS[g] for g in gaps if g in DISCOVERY_GAP_QUESTIONS]
+    return questions[0] if questions else DISCOVERY_FALLBACK_QUESTION
+
+
 def _is_structured_output(reply: str) -> bool:
     """True if reply looks like a document/table instead of conversation."""
     if not reply or len(reply) < 20:
@@ -61,9 +77,35 @@ def _has_multi_question(reply: str) -> bool:
     return reply.count("?") >= 2
 
 
-async def _merge_extracted_into_summary(state: ConversationState, conv_text: str) -> None:
-    """Extract from conversation and merge into state.discovery_summary."""
-    extracted = await extract_discovery_summary(conv_text)
+def _reply_violation(reply: str) -> Optional[str]:
+    """
+    Incremental validator for streamed replies: fires as soon as a table marker or PRD
+    heading ("structured") or a second question mark ("multi_question") appears.
+    Counts each trigger in telemetry (discovery_validator.<name>).
+    """
+    if _is_structured_output(reply):
+        violation = "structured"
+    elif _has_multi_question(reply):
+        violation = "multi_question"
+    else:
+        return None
+    telemetry.incr(f"discovery_validator.{violation}")
+    return violation
+
+
+def _single_question_violation(reply: str) -> Optional[str]:
+    """Validator for the conversational retry: only multi-question can still trigger a retry."""
+    if _has_multi_question(reply):
+        telemetry.incr("discovery_validator.multi_question")
+        return "multi_question"
+    return None
+
+
+async def _merge_extracted_into_summary(
+    state: ConversationState, conv_text: str, fields: Optional[list[str]] = None
+) -> None:
+    """Extract from conversation (optionally only `fields`) and merge into state.discovery_summary."""
+    extracted = await extract_discovery_summary(conv_text, fields=fields)
     merged = state.discovery_summary.model_dump()
     for k, v in extracted.model_dump().items():
         if v is not None and v != [] and v != "":
@@ -88,7 +130,10 @@ class DiscoveryAgent(BaseAgent):
     Conducts discovery interview. Checkpoint-based: extract after each turn,
     check_completeness; when complete (and min turns), show summary for user
     confirmation. No per-aspect state machine. Output validation rejects
-    structured output (tables, PRDs).
+    structured output (tables, PRDs) and multi-question replies, checked on the
+    token stream so violations abort generation early. Under a turn deadline
+    (models/deadline.py) extraction keeps the previous summary and the question falls
+    back to a templated gap question.
     """
 
     async def handle_message(
@@ -97,6 +142,7 @@ class DiscoveryAgent(BaseAgent):
         state.messages.append({"role": "user", "content": user_message})
 
         # Already showed summary — user is responding; check if they confirmed
+        revising = False
         if state.discovery_summary_shown:
             confirmed = await classify_discovery_review(user_message)
             if confirmed:
@@ -105,10 +151,34 @@ class DiscoveryAgent(BaseAgent):
                 state.messages.append({"role": "assistant", "content": msg})
                 return msg, state
             state.discovery_summary_shown = False
+            revising = True
 
-        # Extract and merge into summary
-        conv_text = "\n".join(f"{m['role']}: {m['content']}" for m in state.messages)
-        await _merge_extracted_into_summary(state, conv_text)
+        # Extract and merge into summary, unless the gate finds nothing new in this turn.
+        # Revisions of the shown summary always get a full extraction.
+        if revising:
+            decision = GateDecision("full", reason="summary revision")
+        else:
+            decision = gate_extraction(state, user_message)
+        # Past the turn deadline the previous summary stands (it is only replaced on success)
+        if decision.action == "narrow":
+            # Only the PM's last question and this answer are needed for the targeted fields
+            conv_text = "\n".join(f"{m['role']}: {m['content']}" for m in state.messages[-2:])
+            await within_budget(
+                _merge_extracted_into_summary(state, conv_text, fields=decision.fields),
+                "extraction",
+                lambda: None,
+                reserve_s=DEADLINE_RESERVE_S["extraction"],
+            )
+        elif decision.action == "full":
+            # Earlier turns are already merged, so recent history suffices
+            recent = recent_within_budget(state.messages, "extraction")
+            conv_text = "\n".join(f"{m['role']}: {m['content']}" for m in recent)
+            await within_budget(
+                _merge_extracted_into_summary(state, conv_text),
+                "extraction",
+                lambda: None,
+                reserve_s=DEADLINE_RESERVE_S["extraction"],
+            )
 
         # Completeness check (only after minimum turns)
         turn_count = sum(1 for m in state.messages if m.get("role") == "user")
@@ -120,42 +190,68 @@ class DiscoveryAgent(BaseAgent):
                 state.messages.append({"role": "assistant", "content": summary_reply})
                 return summary_reply, state
 
-        # Normal conversation turn
+        # Normal conversation turn; past the turn deadline, a templated gap question
+        reply = await within_budget(self._ask_question(state), "discovery_question", lambda: _gap_question(state))
+        state.messages.append({"role": "assistant", "content": reply})
+        return reply, state
+
+    async def _ask_question(self, state: ConversationState) -> str:
+        """Next interview question from the conversation model, with validator retries."""
         system = _build_prompt(state)
         conv = [{"role": m["role"], "content": m["content"]} for m in state.messages]
-        reply = await self._llm_conversation(conv, system)
+        telemetry.incr("discovery_validator.checked")
+        reply, violation = await self._llm_conversation_checked(
+            conv, system, _reply_violation, state, call_site="discovery_question"
+        )
 
-        if _is_structured_output(reply):
-            reply = await self._retry_conversational(conv, system)
+        # Validators run on the stream, so a violating reply is cut off early and the
+        # corrective call starts right away
+        structured = violation == "structured"
+        if structured:
+            reply, violation = await self._retry_conversational(conv, system, state)
 
-        if _has_multi_question(reply):
-            reply = await self._retry_single_question(conv, system)
+        multi_question = violation == "multi_question"
+        if multi_question:
+            reply = await self._retry_single_question(conv, system, state)
 
-        state.messages.append({"role": "assistant", "content": reply})
-        return reply, state
+        # Validator retries are the quality signal for the adaptive reasoning policy
+        record_quality("discovery_question", ok=not (structured or multi_question))
+        return reply
 
     async def _generate_summary(self, state: ConversationState) -> str:
         """Generate discovery summary for user confirmation (handoff prep)."""
-        conv_text = "\n".join(f"{m['role']}: {m['content']}" for m in state.messages)
+        system, history = await fit_history(state, state.messages, DISCOVERY_SUMMARY_PROMPT)
+        conv_text = "\n".join(f"{m['role']}: {m['content']}" for m in history)
         messages = [
             {"role": "user", "content": f"Conversation:\n\n{conv_text}\n\nGenerate the summary as specified in the system prompt."}
         ]
-        return await self._llm_conversation(messages, DISCOVERY_SUMMARY_PROMPT)
+        return await self._llm_conversation(messages, system, call_site="discovery_summary")
 
-    async def _retry_conversational(self, conv: list[dict], system: str) -> str:
-        """Retry with corrective prompt when LLM produced structured output."""
+    async def _retry_conversational(
+        self, conv: list[dict], system: str, state: Optional[ConversationState] = None
+    ) -> tuple[str, Optional[str]]:
+        """
+        Retry with corrective prompt when LLM produced structured output.
+        Returns (reply, violation); violation is "multi_question" if the retry asked several.
+        """
         corrective = (
             "\n\nIMPORTANT: Reply only in natural conversation. "
             "Do NOT output tables, feature lists, or PRD-style documents. "
             "One short paragraph and one question max."
         )
-        return await self._llm_conversation(conv, system + corrective)
+        return await self._llm_conversation_checked(
+            conv, system + corrective, _single_question_violation, state, call_site="discovery_retry"
+        )
 
-    async def _retry_single_question(self, conv: list[dict], system: str) -> str:
+    async def _retry_single_question(
+        self, conv: list[dict], system: str, state: Optional[ConversationState] = None
+    ) -> str:
         """Retry with corrective prompt when LLM asked multiple questions at once."""
         corrective = (
             "\n\nIMPORTANT: Your last reply asked multiple questions. "
             "Ask ONLY ONE question — the single most important one right now. "
             "One short paragraph max. Do not combine or list questions."
         )
-        return await self._llm_conversation(conv, system + corrective)
+        return await self._llm_conversation(
+            conv, system + corrective, state, call_site="discovery_retry"
+        )
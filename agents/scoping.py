@@ -1,28 +1,154 @@
 """Scoping Agent: opinionated PM with web search, MVP proposal, and argue-back loop."""
 
+import asyncio
+import logging
+from typing import Optional
+
+from config import (
+    COMPARABLE_ENRICHMENT_ENABLED,
+    DEADLINE_RESERVE_S,
+    IDEA_INDEX_SKIP_SEARCH_SIMILARITY,
+    PHASE_PLANNER_ENABLED,
+    SCOPE_PATCH_ENABLED,
+    SCOPING_SINGLE_CALL_PROPOSAL,
+    SPECULATION_ENABLED,
+    SPECULATION_MAX_PER_SESSION,
+    SPECULATIVE_ARGUE_BACK,
+)
 from agents.base import BaseAgent
+from models import telemetry
+from models.deadline import within_budget, without_deadline
+from models.policy import record_quality
 from models.schemas import ComparableProduct, ConversationState, ScopingOutput
-from prompts.scoping import SCOPING_SYSTEM_PROMPT
-from tools.extraction import extract_scoping_output
-from tools.intent import classify_scoping_intent
+from prompts.scoping import SCOPING_STRUCTURED_OUTPUT_INSTRUCTIONS, SCOPING_SYSTEM_PROMPT
+from speculation import Speculation, SpeculationBudget
+from tools.extraction import extract_scope_patch, extract_scoping_output, parse_structured_proposal
+from tools.idea_index import IdeaMatch, idea_index
+from tools.intent import classify_scoping_intent, likely_scoping_pushback
+from tools.page_fetcher import enrich_comparables
+from tools.phase_planner import apply_plan, parse_capacity, plan_phases
+from tools.rice import apply_rice
+from tools.scope_patch import apply_scope_patch, patched_phases
 from tools.web_search import search_comparable_products
 
+logger = logging.getLogger("vibe_pm.scoping")
+
+
+def _recompute_rice(scope: ScopingOutput) -> None:
+    """Replace model-reported RICE scores with locally computed ones; record arithmetic mismatches."""
+    report = apply_rice(scope)
+    for name, reported, computed in report.mismatches():
+        telemetry.record("rice_mismatch", feature=name, reported=reported, computed=round(computed, 2))
+    telemetry.incr("rice.features", len(report.names))
+    telemetry.incr("rice.mismatch", len(report.mismatches()))
+
+
+def _similar_idea(summary) -> Optional[IdeaMatch]:
+    """Closest previously scoped idea, if any is similar enough to seed this proposal."""
+    try:
+        matches = idea_index.query(summary)
+    except Exception as e:
+        logger.warning("idea index lookup failed: %s", e)
+        return None
+    return matches[0] if matches else None
+
+
+def _seed_context(match: IdeaMatch) -> str:
+    """Prompt block describing a prior scope for a near-identical idea."""
+    scope = match.scoping_output
+    mvp = "; ".join(f"{f.name} ({f.priority})" for f in scope.mvp_features) or "none"
+    cut = "; ".join(c.name for c in scope.cut_features) or "none"
+    return f"""
+A very similar idea was scoped before (similarity {match.similarity:.0%}; target user: {match.summary.target_user or 'TBD'}; problem: {match.summary.core_problem or 'TBD'}).
+Its MVP features were: {mvp}. Cut: {cut}.
+Use it as a starting point only — adapt to this founder's user, problem, wishlist and constraints.
+"""
+
+
+def _replan_phases(state: ConversationState) -> None:
+    """Re-allocate features to phases within the team's week budgets (no LLM call)."""
+    scope = state.scoping_output
+    if not PHASE_PLANNER_ENABLED or scope is None or not scope.mvp_features:
+        return
+    capacity = parse_capacity(state.discovery_summary.constraints)
+    plan = plan_phases(scope, capacity, pinned=state.pinned_phases)
+    apply_plan(scope, plan)
+    telemetry.record(
+        "phase_plan",
+        team_size=capacity.team_size,
+        capacity_source=capacity.source,
+        phases={p.number: p.features for p in plan.phases},
+        overflow=plan.overflow,
+    )
+
 
 class ScopingAgent(BaseAgent):
     """
     On first entry (scoping_output is None): search comparables, generate MVP proposal, extract output.
     On subsequent messages: classify AGREE/PUSHBACK/QUESTION; if AGREE transition; if PUSHBACK do argue-back (max 3 rounds).
+    After each argue-back or concession, pending_patch applies the scope changes that reply
+    committed to (background; awaited before the next message or the spec).
+    Most replies are pushback, so the PUSHBACK reply is started speculatively alongside
+    the intent classifier (unless the reply is a question or a short affirmation) and
+    cancelled if the label turns out otherwise.
     """
 
+    def __init__(self):
+        self.pending_patch: Optional[asyncio.Task] = None
+        self.speculation_budget = SpeculationBudget(SPECULATION_MAX_PER_SESSION)
+
+    async def wait_for_patch(self) -> None:
+        """Let an in-flight scope patch finish so scoping_output reflects every reply so far."""
+        pending, self.pending_patch = self.pending_patch, None
+        if pending is not None:
+            await asyncio.gather(pending, return_exceptions=True)
+
+    def _schedule_patch(self, state: ConversationState, user_message: str, reply: str, call_site: str) -> None:
+        if not SCOPE_PATCH_ENABLED or state.scoping_output is None:
+            return
+        with without_deadline():  # awaited by the next turn, not this one
+            self.pending_patch = asyncio.ensure_future(self._patch_scope(state, user_message, reply, call_site))
+
+    async def _patch_scope(
+        self, state: ConversationState, user_message: str, reply: str, call_site: Optional[str] = None
+    ) -> None:
+        """
+        Apply add/remove/reprioritize ops from one exchange, then rescore and replan locally.
+        Whether the reply yielded a usable patch is reported as call_site's quality.
+        """
+        base = state.scoping_output
+        try:
+            data = await extract_scope_patch(base, user_message, reply)
+        except Exception as e:
+            logger.warning("scope patch extraction failed: %s", e)
+            data = None
+        if call_site is not None:
+            record_quality(call_site, ok=data is not None)
+        if data is None or state.scoping_output is not base:
+            telemetry.record("scope_patch", ok=False, changes=[])
+            return
+        patched = base.model_copy(deep=True)
+        changes = apply_scope_patch(patched, data)
+        if changes:
+            _recompute_rice(patched)
+            state.scoping_output = patched
+            state.pinned_phases.update(patched_phases(patched, data))
+            _replan_phases(state)
+        telemetry.record("scope_patch", ok=True, changes=changes)
+
     async def handle_message(
         self, state: ConversationState, user_message: str
     ) -> tuple[str, ConversationState]:
         # Initial proposal when entering scoping (no scoping_output yet)
         if state.scoping_output is None:
             return await self._generate_initial_proposal(state)
+        await self.wait_for_patch()
 
-        # Classify intent
+        # Classify intent (with the likely PUSHBACK reply already generating)
+        speculation = self._speculate_pushback(state, user_message)
         intent = await classify_scoping_intent(user_message)
+        if speculation is not None and intent != "PUSHBACK":
+            speculation.cancel()
         if intent == "AGREE":
             state.scope_agreed = True
             state.awaiting_scope_agreement = False
@@ -39,6 +165,8 @@ class ScopingAgent(BaseAgent):
                 conv,
                 SCOPING_SYSTEM_PROMPT
                 + "\n\nThe user is asking a clarifying question about the scope. Answer briefly, then ask if they're ready to proceed with this scope.",
+                state,
+                call_site="scoping_question",
             )
             state.messages.append({"role": "user", "content": user_message})
             state.messages.append({"role": "assistant", "content": reply})
@@ -47,37 +175,91 @@ class ScopingAgent(BaseAgent):
         # PUSHBACK: argue-back loop
         state.messages.append({"role": "user", "content": user_message})
         state.negotiation_rounds += 1
+        reply = None
+        if speculation is not None:
+            result = await speculation.commit(user_message)
+            if result is not None:
+                reply, speculative_state = result
+                state.history_summary = speculative_state.history_summary
+                state.history_summary_upto = speculative_state.history_summary_upto
+        if reply is None:
+            reply = await self._pushback_reply(state)
 
+        call_site = "argue_back"  # the site _pushback_reply used for this round
         if state.negotiation_rounds >= state.max_negotiation_rounds:
-            # Graceful concession
-            reply = await self._llm_conversation(
-                state.messages,
-                SCOPING_SYSTEM_PROMPT
-                + "\n\nYou've reached the max negotiation rounds. Gracefully concede: add or adjust what they asked for, flag the risk to scope/timeline, and say you're ready to move to the spec. Be brief.",
-            )
+            call_site = "concession"
             state.scope_agreed = True
             state.awaiting_scope_agreement = False
             state.phase = "spec"
-            state.messages.append({"role": "assistant", "content": reply})
-            return reply, state
+        state.messages.append({"role": "assistant", "content": reply})
+        self._schedule_patch(state, user_message, reply, call_site)
+        return reply, state
+
+    def _speculate_pushback(
+        self, state: ConversationState, user_message: str
+    ) -> Optional[Speculation]:
+        """Start the PUSHBACK reply on a snapshot of state (user turn appended), within budget."""
+        if not (SPECULATION_ENABLED and SPECULATIVE_ARGUE_BACK):
+            return None
+        if not likely_scoping_pushback(user_message):
+            return None  # keep the per-session budget for real pushback
+        if not self.speculation_budget.try_acquire("argue_back"):
+            return None
+        snapshot = state.model_copy(deep=True)
+        snapshot.messages.append({"role": "user", "content": user_message})
+        snapshot.negotiation_rounds += 1
 
+        async def run():
+            return await self._pushback_reply(snapshot), snapshot
+
+        return Speculation("argue_back", user_message, run())
+
+    async def _pushback_reply(self, state: ConversationState) -> str:
+        """
+        Reply to pushback; state.messages already ends with the user's turn and
+        negotiation_rounds counts it. At the round limit this is a graceful concession.
+        """
+        if state.negotiation_rounds >= state.max_negotiation_rounds:
+            return await self._llm_conversation(
+                state.messages,
+                SCOPING_SYSTEM_PROMPT
+                + "\n\nYou've reached the max negotiation rounds. Gracefully concede: add or adjust what they asked for, flag the risk to scope/timeline, and say you're ready to move to the spec. Be brief.",
+                state,
+                call_site="concession",
+            )
         # Evaluate pushback: CONCEDE or HOLD_FIRM
-        reply = await self._llm_conversation(
+        return await self._llm_conversation(
             state.messages,
             SCOPING_SYSTEM_PROMPT
             + "\n\nThe user is pushing back on your proposed scope. Evaluate their argument on: strength of argument, impact on scope, core-ness to value prop. Then either CONCEDE (add/change the feature and explain why) or HOLD_FIRM (explain why you're not changing). Reply in natural language only, no labels.",
+            state,
+            call_site="argue_back",
         )
-        state.messages.append({"role": "assistant", "content": reply})
-        return reply, state
 
     async def _generate_initial_proposal(
         self, state: ConversationState
     ) -> tuple[str, ConversationState]:
-        """Search comparables, generate MVP proposal, extract ScopingOutput."""
+        """Search comparables, generate MVP proposal (with inline ScopingOutput JSON), extract ScopingOutput if needed."""
         summary = state.discovery_summary
-        comparables = await search_comparable_products(summary)
+        match = _similar_idea(summary)
+        prior = match.scoping_output if match is not None else None
+        if prior is not None and prior.comparable_products and match.similarity >= IDEA_INDEX_SKIP_SEARCH_SIMILARITY:
+            comparables = [
+                {"title": c.name, "href": c.url, "body": c.relevance} for c in prior.comparable_products
+            ]
+            telemetry.incr("idea_index.search_skipped")
+        else:
+            comparables = await search_comparable_products(summary)
+        # Optional: page summaries replace the search snippets where they arrive in time
+        page_summaries = {}
+        if COMPARABLE_ENRICHMENT_ENABLED:
+            page_summaries = await within_budget(
+                enrich_comparables(comparables[:5]), "enrichment", dict, reserve_s=DEADLINE_RESERVE_S["enrichment"]
+            )
         comp_text = "\n".join(
-            f"- {r.get('title', '')}: {r.get('body', '')[:200]}..."
+            f"- {r.get('title', '')}: {page_summaries[r['href']]}"
+            if isinstance(r, dict) and r.get("href") in page_summaries
+            else f"- {r.get('title', '')}: {r.get('body', '')[:200]}..."
             if isinstance(r, dict)
             else str(r)[:200]
             for r in comparables[:5]
@@ -98,13 +280,27 @@ Comparable products (from web search) — you MUST reference these in your reply
 
 Generate your MVP scope proposal. Start with: "Here's how I got here: I searched for [query], found [A, B, C], so I'm proposing …" Then explicitly reference the comparable products (e.g. "This sounds similar to X — what's different about your version?"). List P0/P1/P2 features, cut features with one-line reasons, the one core user flow and why it proves the idea, and 3-5 key screens (each: screen name + one-line description, derived from the core flow and P0 features). Then brief rationale. Be opinionated — cut aggressively. Social features, dashboards, and admin panels are never P0. Reply in natural language (no JSON). Then ask if they're ready to proceed or want to push back on anything.
 """
+        if prior is not None and prior.mvp_features:
+            context += _seed_context(match)
+            telemetry.record("idea_index.seeded", match=match.id, similarity=match.similarity)
+        if SCOPING_SINGLE_CALL_PROPOSAL:
+            context += SCOPING_STRUCTURED_OUTPUT_INSTRUCTIONS
         messages_for_llm = [{"role": "user", "content": context}]
-        reply = await self._llm_conversation(messages_for_llm, SCOPING_SYSTEM_PROMPT)
+        reply = await self._llm_conversation(
+            messages_for_llm, SCOPING_SYSTEM_PROMPT, call_site="scoping_proposal"
+        )
+
+        # Structured output for spec writer later: inline JSON when valid, else 8B extraction
+        structured = None
+        if SCOPING_SINGLE_CALL_PROPOSAL:
+            reply, structured = parse_structured_proposal(reply)
+            telemetry.record("scoping.inline_structured", ok=structured is not None)
+            record_quality("scoping_proposal", ok=structured is not None)
         state.messages.append({"role": "assistant", "content": reply})
         state.awaiting_scope_agreement = True
-
-        # Extract structured output for spec writer later
-        state.scoping_output = await extract_scoping_output(reply)
+        state.scoping_output = structured or await extract_scoping_output(reply)
+        _recompute_rice(state.scoping_output)
+        _replan_phases(state)
 
         # Merge actual search results into comparable_products so spec always has them
         existing_names = {c.name for c in state.scoping_output.comparable_products}
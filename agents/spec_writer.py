@@ -1,101 +1,308 @@
-"""Spec Writer Agent: single-pass Markdown spec generation from discovery + scoping (phased)."""
+"""Spec Writer Agent: Markdown spec generation from discovery + scoping (phased), single-pass or per section."""
 
+import asyncio
+import time
+from typing import Optional
+
+from config import (
+    FACT_CHECK_ENABLED,
+    FACT_CHECK_MAX_NEW_UNSUPPORTED,
+    SPEC_GENERATION_MODE,
+    SPEC_POLISH_SECTIONS,
+    SPEC_REVISION_TASK,
+)
 from agents.base import BaseAgent
-from models.schemas import ConversationState
-from prompts.spec_writer import SPEC_WRITER_SYSTEM_PROMPT
-from tools.templates import SPEC_TEMPLATE
-
-
-def _phase_content(scope, phase_num: int) -> tuple[str, str, str, str, str, str]:
-    """Build phase name, weeks, goal, features, flow, screens for phase_num (1/2/3)."""
-    tbd = "TBD — needs further discovery."
-    name = weeks = goal = features = flow = screens = tbd
-    if not scope or not scope.implementation_phases:
-        if scope and scope.mvp_features:
-            phase_features = [f for f in scope.mvp_features if f.phase == phase_num]
-            if phase_features:
-                features = "\n".join(f"- {f.name}: {f.description}" for f in phase_features)
-        return (f"Phase {phase_num}", "1-2 weeks", tbd, features or tbd, flow, screens)
-    phases = {p.phase_number: p for p in scope.implementation_phases}
-    p = phases.get(phase_num)
-    if not p:
-        if scope.mvp_features:
-            phase_features = [f for f in scope.mvp_features if f.phase == phase_num]
-            if phase_features:
-                features = "\n".join(f"- {f.name}: {f.description}" for f in phase_features)
-        return (f"Phase {phase_num}", "1-2 weeks", tbd, features or tbd, flow, screens)
-    name = p.name
-    weeks = p.estimated_weeks
-    goal = p.goal or tbd
-    phase_feature_names = set(p.features or [])
-    phase_features = [f for f in scope.mvp_features if f.name in phase_feature_names or f.phase == phase_num]
-    if not phase_features and p.features:
-        features = "\n".join(f"- {fn}" for fn in p.features)
-    else:
-        features = "\n".join(f"- {f.name}: {f.description}" for f in phase_features) if phase_features else tbd
-    if phase_num == 1 and scope.core_user_flow:
-        flow = scope.core_user_flow
-    if phase_num == 1 and scope.key_screens:
-        screens = "\n".join(f"- {s}" for s in scope.key_screens)
-    elif phase_num == 2 and scope.key_screens:
-        screens = "\n".join(f"- {s}" for s in scope.key_screens[len(scope.key_screens) // 2 :])
-    return (name, weeks, goal, features, flow, screens)
-
-
-def _rice_summary(scope) -> str:
-    """Build RICE summary from scoping output."""
-    if not scope or not scope.mvp_features:
-        return "TBD — needs further discovery."
-    lines = []
-    for f in scope.mvp_features:
-        if f.rice_score is not None or f.rice_reach is not None:
-            parts = [f.name]
-            if f.rice_reach is not None:
-                parts.append(f"Reach: {f.rice_reach}")
-            if f.rice_impact is not None:
-                parts.append(f"Impact: {f.rice_impact}")
-            if f.rice_confidence is not None:
-                parts.append(f"Confidence: {f.rice_confidence}")
-            if f.rice_effort is not None:
-                parts.append(f"Effort: {f.rice_effort} person-weeks")
-            if f.rice_score is not None:
-                parts.append(f"RICE score: {f.rice_score:.2f}")
-            lines.append(" — ".join(parts))
-    return "\n".join(lines) if lines else "TBD — needs further discovery."
+from models import telemetry
+from models.deadline import within_budget
+from models.llm import llm_call
+from models.schemas import ConversationState, SpecVersion
+from prompts.spec_writer import (
+    SPEC_POLISH_INSTRUCTIONS,
+    SPEC_REVISION_PROMPT,
+    SPEC_SECTION_GUIDANCE,
+    SPEC_SECTION_PROMPT,
+    SPEC_WRITER_SYSTEM_PROMPT,
+)
+from tools.fact_check import check_spec_facts
+from tools.intent import classify_spec_edit
+from tools.spec_cache import spec_cache, spec_cache_key
+from tools.spec_renderer import render_section, render_spec
+from tools.spec_sections import clean_section, split_spec, stitch_sections
+from tools.spec_validator import section_defects, spec_defects
+from tools.templates import SPEC_SECTION_TEMPLATES, SPEC_SECTIONS, SPEC_TEMPLATE
+
+
+def record_spec_version(
+    state: ConversationState,
+    spec_md: str,
+    change_request: Optional[str] = None,
+    sections_changed: Optional[list[str]] = None,
+) -> SpecVersion:
+    """Make spec_md the current spec and append it to state.spec_versions."""
+    version = SpecVersion(
+        version=len(state.spec_versions) + 1,
+        markdown=spec_md,
+        change_request=change_request,
+        sections_changed=sections_changed or [],
+    )
+    state.spec_versions.append(version)
+    state.spec_markdown = spec_md
+    return version
 
 
 class SpecWriterAgent(BaseAgent):
-    """Generates a structured, phased product spec in Markdown. Single LLM call, not conversational."""
+    """
+    Generates a structured, phased product spec in Markdown. Not conversational.
+    SPEC_GENERATION_MODE "single": one LLM call for the whole document.
+    "sections": one call per template section, run concurrently and stitched in template
+    order; a section that fails or comes back malformed falls back to the rendered section.
+    "template": deterministic render (tools/spec_renderer.py), no LLM; polish_spec() can
+    later rewrite the narrative sections with the spec model.
+    In the done phase, revise_spec() applies edit requests by regenerating only the
+    affected sections; every version is kept in state.spec_versions.
+    """
 
     async def handle_message(
         self, state: ConversationState, user_message: str
     ) -> tuple[str, ConversationState]:
         spec_md = await self._generate_spec(state)
-        state.spec_markdown = spec_md
+        return self.finish(state, spec_md), state
+
+    def finish(self, state: ConversationState, spec_md: str) -> str:
+        """Store a generated (or pre-generated) spec and move to done."""
+        record_spec_version(state, spec_md)
         state.phase = "done"
         state.messages.append(
             {"role": "assistant", "content": "Here's your product spec. You can download it below."}
         )
-        return spec_md, state
+        return spec_md
+
+    async def revise_spec(
+        self, state: ConversationState, user_message: str
+    ) -> Optional[str]:
+        """
+        Apply a done-phase edit request to state.spec_markdown, regenerating only the
+        affected sections (concurrently). Returns the reply, or None if the message is not
+        an edit request. Sections whose revision fails are left unchanged.
+        """
+        sections = split_spec(state.spec_markdown or "")
+        targets = [s for s in await classify_spec_edit(user_message) if s in sections]
+        if not targets:
+            return None
+        state.messages.append({"role": "user", "content": user_message})
+
+        context = self._build_context(state.discovery_summary, state.scoping_output, template=None)
+        revised = await asyncio.gather(
+            *(self._revise_section(s, sections[s], user_message, context) for s in targets)
+        )
+        changed = [s for s, text in zip(targets, revised) if text is not None and text != sections[s]]
+        if not changed:
+            reply = "I couldn't apply that change to the spec. Could you say which part to change and how?"
+            state.messages.append({"role": "assistant", "content": reply})
+            return reply
+
+        sections.update({s: text for s, text in zip(targets, revised) if s in changed})
+        version = record_spec_version(state, stitch_sections(sections).strip(), user_message, changed)
+        titles = ", ".join(SPEC_SECTION_GUIDANCE[s][0] for s in changed)
+        reply = f"Updated {titles} (spec version {version.version}). Revised section(s):\n\n"
+        reply += "\n\n".join(sections[s] for s in changed)
+        state.messages.append({"role": "assistant", "content": f"Updated {titles} (spec version {version.version})."})
+        return reply
+
+    async def _revise_section(
+        self, section_id: str, section: str, change_request: str, context: str
+    ) -> Optional[str]:
+        """Rewrite one section for an edit request: SPEC_REVISION_TASK model first, spec model if malformed."""
+        prompt = SPEC_REVISION_PROMPT.format(change_request=change_request, context=context, section=section)
+        messages = [
+            {"role": "system", "content": SPEC_WRITER_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+        for task_type in dict.fromkeys((SPEC_REVISION_TASK, "spec")):
+            try:
+                text = clean_section(section_id, await llm_call(task_type, messages))
+            except Exception:
+                text = None
+            telemetry.record("spec_revision", section=section_id, task_type=task_type, ok=text is not None)
+            if text is not None:
+                return text
+        return None
 
     async def _generate_spec(self, state: ConversationState) -> str:
-        """Single-pass generation: DiscoverySummary + ScopingOutput + template -> Markdown."""
+        """
+        DiscoverySummary + ScopingOutput + template -> Markdown, per SPEC_GENERATION_MODE.
+        LLM-generated specs are served from / stored in the content-addressed spec cache;
+        specs that needed a fallback are not cached. A generated spec that fails the fact
+        check (too little discovery coverage, invented names / numbers) or that misses the
+        turn deadline is replaced by the deterministic render.
+        """
         summary = state.discovery_summary
         scope = state.scoping_output
+        if SPEC_GENERATION_MODE == "template":
+            return render_spec(summary, scope)
+
+        key = spec_cache_key(summary, scope, SPEC_GENERATION_MODE)
+        cached = spec_cache.get(key)
+        if cached is not None:
+            return cached
+        if SPEC_GENERATION_MODE == "sections":
+            generate = self._generate_spec_sections(summary, scope)
+        else:
+            generate = self._generate_spec_single(summary, scope)
+        # Past the turn deadline: the deterministic render (not cached)
+        spec, complete = await within_budget(generate, "spec", lambda: (render_spec(summary, scope), False))
+        if FACT_CHECK_ENABLED and complete:
+            report = check_spec_facts(spec, summary, scope, [m.get("content") or "" for m in state.messages])
+            telemetry.record(
+                "spec_fact_check",
+                coverage=round(report.coverage, 3),
+                missing=len(report.missing),
+                unsupported=report.unsupported[:10],
+                ok=report.ok(),
+            )
+            if not report.ok():
+                return render_spec(summary, scope)
+        if complete:
+            spec_cache.put(key, spec)
+        return spec
 
+    async def _generate_spec_single(self, summary, scope) -> tuple[str, bool]:
+        """Whole document in one spec-model call. Returns (spec, False if the fallback was used)."""
         context = self._build_context(summary, scope)
         messages = [
             {"role": "system", "content": SPEC_WRITER_SYSTEM_PROMPT},
             {"role": "user", "content": f"Generate the full product spec following the template. Context:\n\n{context}\n\nOutput only the Markdown document, no commentary."},
         ]
-        from models.llm import llm_call
         spec = await llm_call("spec", messages)
-        if "# Product Spec:" not in spec and "# " not in spec:
-            spec = self._fill_template_fallback(summary, scope, spec)
-        return spec.strip()
+        defects = spec_defects(spec, summary, scope)
+        if not defects:
+            return spec.strip(), True
+        return await self._repair_sections(split_spec(spec), defects, summary, scope)
+
+    async def _generate_spec_sections(self, summary, scope) -> tuple[str, bool]:
+        """
+        Generate every template section concurrently from shared context; stitch in template
+        order. Defective sections get one targeted retry. Returns (spec, False if any section
+        fell back to its rendered version).
+        """
+        context = self._build_context(summary, scope, template=None)
+        texts = await asyncio.gather(
+            *(self._generate_section(section_id, context) for section_id in SPEC_SECTIONS)
+        )
+        sections = {section_id: text for section_id, text in zip(SPEC_SECTIONS, texts) if text}
+        defects = {}
+        for section_id in SPEC_SECTIONS:
+            problems = section_defects(section_id, sections.get(section_id), summary, scope)
+            if problems:
+                defects[section_id] = problems
+        if not defects:
+            return stitch_sections(sections).strip(), True
+        return await self._repair_sections(sections, defects, summary, scope, context)
 
-    def _build_context(self, summary, scope) -> str:
-        """Build context string for LLM from discovery + scoping (including phases and RICE)."""
+    async def _repair_sections(
+        self, sections: dict[str, str], defects: dict[str, list[str]], summary, scope, context: Optional[str] = None
+    ) -> tuple[str, bool]:
+        """
+        Regenerate only the defective sections, concurrently; a section still defective after
+        its retry falls back to its rendered version. Returns (spec, False if any fell back).
+        """
+        telemetry.record("spec_validation", defects=defects)
+        context = context or self._build_context(summary, scope, template=None)
+        targets = list(defects)
+        texts = await asyncio.gather(*(self._generate_section(s, context) for s in targets))
+        repaired = True
+        for section_id, text in zip(targets, texts):
+            if text is None or section_defects(section_id, text, summary, scope):
+                telemetry.incr(f"spec_section.repair_failed.{section_id}")
+                text = render_section(section_id, summary, scope)
+                repaired = False
+            sections[section_id] = text
+        return stitch_sections(sections).strip(), repaired
+
+    async def polish_spec(self, summary, scope, spec_md: str) -> str:
+        """
+        Rewrite the narrative sections (SPEC_POLISH_SECTIONS) of a rendered spec with the
+        spec model, concurrently, using the rendered text as the draft. Sections that fail,
+        are structurally defective (tools/spec_validator.py) or add named entities / numbers
+        found in neither the draft nor the discovery and scoping data keep their rendered
+        text; all other sections are untouched. Cached like full specs.
+        """
+        sections = split_spec(spec_md)
+        targets = [s for s in SPEC_POLISH_SECTIONS if s in sections]
+        if not targets:
+            return spec_md
+        key = spec_cache_key(summary, scope, "polish", sections=targets, draft=spec_md)
+        cached = spec_cache.get(key)
+        if cached is not None:
+            return cached
+        context = self._build_context(summary, scope, template=None)
+        texts = await asyncio.gather(
+            *(self._generate_section(s, context, draft=sections[s]) for s in targets)
+        )
+        texts = [
+            self._fact_checked(s, text, summary, scope, spec_md)
+            if text and not section_defects(s, text, summary, scope)
+            else None
+            for s, text in zip(targets, texts)
+        ]
+        sections.update({s: text for s, text in zip(targets, texts) if text})
+        polished = stitch_sections(sections).strip()
+        if all(texts):
+            spec_cache.put(key, polished)
+        return polished
+
+    def _fact_checked(self, section_id: str, text: str, summary, scope, draft_spec: str) -> Optional[str]:
+        """text, or None when it adds more than FACT_CHECK_MAX_NEW_UNSUPPORTED unsupported claims."""
+        if not FACT_CHECK_ENABLED:
+            return text
+        unsupported = check_spec_facts(text, summary, scope, [draft_spec]).unsupported
+        telemetry.record("spec_fact_check", section=section_id, unsupported=unsupported[:10])
+        if len(unsupported) > FACT_CHECK_MAX_NEW_UNSUPPORTED:
+            telemetry.incr(f"spec_section.fact_reject.{section_id}")
+            return None
+        return text
+
+    async def _generate_section(
+        self, section_id: str, context: str, draft: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        One section via the spec model; None if the call fails or the output is malformed.
+        draft (a rendered section) asks the model to improve it rather than write from scratch.
+        """
+        title, guidance = SPEC_SECTION_GUIDANCE[section_id]
+        if draft:
+            guidance += f"\n\n{SPEC_POLISH_INSTRUCTIONS}\n\nDraft:\n{draft}"
+        prompt = SPEC_SECTION_PROMPT.format(
+            section_title=title,
+            section_guidance=guidance,
+            context=context,
+            section_template=SPEC_SECTION_TEMPLATES[section_id].strip(),
+        )
+        messages = [
+            {"role": "system", "content": SPEC_WRITER_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+        started = time.monotonic()
+        try:
+            text = clean_section(section_id, await llm_call("spec", messages))
+        except Exception:
+            text = None
+        telemetry.record(
+            "spec_section",
+            section=section_id,
+            polish=draft is not None,
+            ok=text is not None,
+            latency_s=round(time.monotonic() - started, 3),
+        )
+        if text is None:
+            telemetry.incr(f"spec_section.fallback.{section_id}")
+        return text
+
+    def _build_context(self, summary, scope, template: Optional[str] = SPEC_TEMPLATE) -> str:
+        """
+        Build context string for LLM from discovery + scoping (including phases and RICE).
+        The template is appended unless template is None (section mode adds its own fragment).
+        """
         lines = [
             "## Discovery",
             f"Target user: {summary.target_user or 'TBD'}",
@@ -131,53 +338,8 @@ class SpecWriterAgent(BaseAgent):
                     lines.append(f"  - Phase {p.phase_number}: {p.name} ({p.estimated_weeks}) — {p.goal}")
                     for fn in p.features:
                         lines.append(f"    - {fn}")
-        lines.append("")
-        lines.append("Template to follow:")
-        lines.append(SPEC_TEMPLATE)
+        if template is not None:
+            lines.append("")
+            lines.append("Template to follow:")
+            lines.append(template)
         return "\n".join(lines)
-
-    def _fill_template_fallback(self, summary, scope, raw: str) -> str:
-        """Fallback: fill phased template placeholders from discovery + scoping."""
-        product_name = (summary.core_problem or "Product")[:50]
-        problem_statement = summary.core_problem or "TBD — needs further discovery."
-        target_user_persona = summary.target_user or "TBD — needs further discovery."
-        cut_features = "TBD — needs further discovery."
-        open_questions_risks = "TBD — needs further discovery."
-        technical_considerations = "TBD — needs further discovery."
-        comparable_products = "TBD — needs further discovery."
-
-        p1_name, p1_weeks, p1_goal, p1_features, p1_flow, p1_screens = _phase_content(scope, 1)
-        p2_name, p2_weeks, p2_goal, p2_features, p2_flow, p2_screens = _phase_content(scope, 2)
-        p3_name, p3_weeks, p3_goal, p3_features, _, _ = _phase_content(scope, 3)
-
-        if scope:
-            cut_features = "\n".join(f"- {c.name}: {c.reason_cut}" for c in scope.cut_features) or cut_features
-            comparable_products = "\n".join(f"- {c.name}: {c.relevance}" for c in scope.comparable_products) or comparable_products
-
-        rice_summary = _rice_summary(scope)
-
-        return SPEC_TEMPLATE.format(
-            product_name=product_name,
-            problem_statement=problem_statement,
-            target_user_persona=target_user_persona,
-            comparable_products=comparable_products,
-            phase_1_name=p1_name,
-            phase_1_weeks=p1_weeks,
-            phase_1_goal=p1_goal,
-            phase_1_features=p1_features,
-            phase_1_flow=p1_flow,
-            phase_1_screens=p1_screens,
-            phase_2_name=p2_name,
-            phase_2_weeks=p2_weeks,
-            phase_2_goal=p2_goal,
-            phase_2_features=p2_features,
-            phase_2_screens=p2_screens,
-            phase_3_name=p3_name,
-            phase_3_weeks=p3_weeks,
-            phase_3_goal=p3_goal,
-            phase_3_features=p3_features,
-            cut_features=cut_features,
-            rice_summary=rice_summary,
-            open_questions_risks=open_questions_risks,
-            technical_considerations=technical_considerations,
-        )
@@ -0,0 +1,199 @@
+"""HTTP API for programmatic clients, alongside the Chainlit UI (same Orchestrator, no UI overhead).
+
+    uvicorn api:app --port 8100
+
+POST   /sessions                      -> {"session_id", "phase", "message"}
+POST   /sessions/{id}/messages        -> text/event-stream: step*, message, spec?, spec_polished?, end
+GET    /sessions/{id}                 -> conversation state (JSON)
+GET    /sessions/{id}/spec[?version=] -> spec Markdown (latest version by default)
+DELETE /sessions/{id}
+
+Turns pass through admission control (503 + Retry-After when the queue is full); a
+session handles one turn at a time (409 while a turn is running).
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from config import (
+    API_IDEA_INDEX_ENABLED,
+    API_MAX_CONCURRENT_TURNS,
+    API_MAX_QUEUED_TURNS,
+    API_MAX_SESSIONS,
+    API_SESSION_TTL_S,
+    PROVIDER_PRELOAD,
+)
+from models import providers
+from orchestrator import WELCOME_MESSAGE
+from sessions import AdmissionController, Overloaded, Session, SessionStore
+from tools.idea_index import idea_index
+
+
+class MessageIn(BaseModel):
+    content: str
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Created inside the server's event loop (asyncio primitives bind to it on Python 3.9)
+    app.state.sessions = SessionStore(API_MAX_SESSIONS, API_SESSION_TTL_S)
+    app.state.admission = AdmissionController(API_MAX_CONCURRENT_TURNS, API_MAX_QUEUED_TURNS)
+    # Sessions belong to different founders; the shared idea index would leak between them
+    idea_index.enabled = API_IDEA_INDEX_ENABLED
+    if PROVIDER_PRELOAD:
+        # Warm LiteLLM & co. in a worker thread; startup does not wait for it
+        asyncio.get_running_loop().run_in_executor(None, providers.preload)
+    yield
+
+
+app = FastAPI(title="Vibe-PM API", lifespan=lifespan)
+
+
+@app.exception_handler(Overloaded)
+async def _overloaded(request: Request, exc: Overloaded) -> JSONResponse:
+    return JSONResponse(
+        {"detail": str(exc)}, status_code=503, headers={"Retry-After": str(exc.retry_after_s)}
+    )
+
+
+def _session(request: Request, session_id: str) -> Session:
+    session = request.app.state.sessions.get(session_id)
+    if session is None:
+        raise HTTPException(404, "session not found")
+    return session
+
+
+_turns: set[asyncio.Task] = set()  # running turns (and their polish waits)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/sessions")
+async def create_session(request: Request) -> dict:
+    session = request.app.state.sessions.create()
+    return {"session_id": session.id, "phase": session.orchestrator.state.phase, "message": WELCOME_MESSAGE}
+
+
+@app.post("/sessions/{session_id}/messages")
+async def post_message(request: Request, session_id: str, body: MessageIn) -> StreamingResponse:
+    session = _session(request, session_id)
+    if session.lock.locked():
+        raise HTTPException(409, "a message is already being processed for this session")
+    admission: AdmissionController = request.app.state.admission
+    admission.admit()  # raises Overloaded -> 503 before the stream starts
+    # Free (checked above, nothing awaited since), so this returns at once: a second post
+    # to this session gets 409 from here on, and no admission slot is held waiting for it
+    await session.lock.acquire()
+    queue = _start_turn(session, admission, body.content)
+    return StreamingResponse(
+        _turn_events(queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _start_turn(session: Session, admission: AdmissionController, content: str) -> asyncio.Queue:
+    """
+    Run one turn as its own task, which owns the session lock and the admission reservation
+    taken by post_message; its SSE events go to the returned queue, None marks the end.
+    The task runs whether or not the stream is ever read: if the client disconnects (even
+    before the first event), the turn still completes and leaves the session consistent.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    held = True
+
+    def end_turn() -> None:
+        nonlocal held
+        if held:
+            held = False
+            session.lock.release()
+            admission.release()
+
+    async def step_callback(name: str) -> None:
+        await queue.put(_sse("step", {"name": name}))
+
+    async def run() -> None:
+        try:
+            async with admission.slot():
+                orchestrator = session.orchestrator
+                try:
+                    response, state = await orchestrator.handle_message(content, step_callback=step_callback)
+                except Exception as e:
+                    await queue.put(_sse("error", {"detail": str(e)}))
+                    return
+                await queue.put(_sse("message", {"content": response, "phase": state.phase}))
+                if state.phase == "done" and state.spec_markdown:
+                    await queue.put(_sse("spec", {"version": len(state.spec_versions), "url": f"/sessions/{session.id}/spec"}))
+                polish, orchestrator.spec_polish = orchestrator.spec_polish, None
+        finally:
+            end_turn()
+        # After end_turn: the next turn may start while the polish finishes
+        if polish is not None:
+            polished: Optional[str] = None
+            try:
+                polished = await polish
+            except Exception:
+                pass
+            if polished:
+                versions = session.orchestrator.state.spec_versions
+                await queue.put(_sse("spec_polished", {"version": len(versions), "url": f"/sessions/{session.id}/spec"}))
+
+    def done(task: asyncio.Future) -> None:
+        _turns.discard(task)
+        end_turn()  # covers a task cancelled before run() ever started
+        queue.put_nowait(None)
+
+    task = asyncio.ensure_future(run())
+    _turns.add(task)  # the loop only keeps weak references to tasks
+    task.add_done_callback(done)
+    return queue
+
+
+async def _turn_events(queue: asyncio.Queue) -> AsyncIterator[str]:
+    """Stream a turn's events as SSE; waits for a background spec polish if one starts."""
+    while True:
+        event = await queue.get()
+        if event is None:
+            break
+        yield event
+    yield _sse("end", {})
+
+
+@app.get("/sessions/{session_id}")
+async def get_state(request: Request, session_id: str) -> dict:
+    session = _session(request, session_id)
+    state = session.orchestrator.state
+    return {"session_id": session.id, "busy": session.lock.locked(), **state.model_dump(mode="json")}
+
+
+@app.get("/sessions/{session_id}/spec")
+async def download_spec(request: Request, session_id: str, version: Optional[int] = None) -> PlainTextResponse:
+    state = _session(request, session_id).orchestrator.state
+    if version is not None:
+        match = [v for v in state.spec_versions if v.version == version]
+        if not match:
+            raise HTTPException(404, f"spec version {version} not found")
+        markdown = match[0].markdown
+    elif state.spec_markdown:
+        markdown = state.spec_markdown
+    else:
+        raise HTTPException(404, "no spec yet")
+    return PlainTextResponse(
+        markdown,
+        media_type="text/markdown; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="product_spec.md"'},
+    )
+
+
+@app.delete("/sessions/{session_id}", status_code=204)
+async def delete_session(request: Request, session_id: str) -> None:
+    if not request.app.state.sessions.delete(session_id):
+        raise HTTPException(404, "session not found")
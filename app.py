@@ -1,8 +1,16 @@
 """Chainlit entry point: session management, message handling, spec download."""
 
+import asyncio
+import threading
+
 import chainlit as cl
 
-from orchestrator import Orchestrator
+from config import PROVIDER_PRELOAD
+from models import providers
+
+if PROVIDER_PRELOAD:
+    # Warm LiteLLM & co. while the worker waits for its first session
+    threading.Thread(target=providers.preload, name="provider-preload", daemon=True).start()
 
 # Phase -> display name for message author and thinking step
 PHASE_AUTHOR = {
@@ -16,11 +24,12 @@ PHASE_AUTHOR = {
 @cl.on_chat_start
 async def start():
     """Initialize orchestrator per session and send welcome message."""
+    # Imported on first session so the worker starts serving without loading the agents
+    from orchestrator import WELCOME_MESSAGE, Orchestrator
+
     orchestrator = Orchestrator()
     cl.user_session.set("orchestrator", orchestrator)
-    await cl.Message(
-        content="Hi! I'm your AI PM. Tell me your product idea in a sentence or two, and I'll ask a few questions to understand the problem, scope an MVP, and then write you a product spec you can hand to a developer or code-gen tool."
-    ).send()
+    await cl.Message(content=WELCOME_MESSAGE).send()
 
 
 @cl.on_message
@@ -73,3 +82,29 @@ async def main(message: cl.Message):
             elements=elements,
             author=PHASE_AUTHOR["done"],
         ).send()
+
+    # Template-first spec: the polished version follows when the background pass finishes
+    polish, orchestrator.spec_polish = orchestrator.spec_polish, None
+    if polish is not None:
+        asyncio.ensure_future(_send_polished_spec(polish))
+
+
+async def _send_polished_spec(polish: asyncio.Task) -> None:
+    """Send the LLM-polished spec once ready; stay silent if polishing failed or changed nothing."""
+    try:
+        polished = await polish
+    except Exception:
+        return
+    if not polished:
+        return
+    await cl.Message(
+        content="I've polished the narrative sections of your spec. Updated version:",
+        elements=[
+            cl.File(
+                name="product_spec.md",
+                content=polished.encode("utf-8"),
+                display="inline",
+            )
+        ],
+        author=PHASE_AUTHOR["done"],
+    ).send()
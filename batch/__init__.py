@@ -0,0 +1,6 @@
+"""Headless batch mode: idea briefs (YAML/JSONL) -> scoped specs, concurrently and resumably."""
+
+from batch.briefs import Brief, load_briefs
+from batch.pipeline import BatchSummary, BriefResult, run_batch, run_brief
+
+__all__ = ["Brief", "load_briefs", "BatchSummary", "BriefResult", "run_batch", "run_brief"]
@@ -0,0 +1,106 @@
+"""Idea briefs for batch runs: load YAML/JSONL files and map each brief to a DiscoverySummary.
+
+A brief is a mapping with an optional id (or name/title), an optional free-text idea,
+and DiscoverySummary fields either at the top level or under "discovery":
+
+    - id: trainer-scheduling
+      idea: Scheduling and payments for independent gym trainers.
+      target_user: Independent gym trainers with 10-50 clients
+      core_problem: Booking and payment chasing eat hours every week
+      feature_wishlist: [scheduling, payments, progress photos]
+      constraints: solo founder, 8 weeks
+      persona: ...            # optional, simulated-founder mode
+      message_policy: pushback # optional, simulated-founder mode
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+from models.schemas import DiscoverySummary
+
+_LIST_FIELDS = ("current_alternatives", "feature_wishlist")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+@dataclass
+class Brief:
+    id: str
+    summary: DiscoverySummary
+    idea: Optional[str] = None
+    persona: Optional[str] = None
+    message_policy: str = "expansive"
+    raw: dict = field(default_factory=dict)
+
+    def opening_message(self) -> str:
+        """The founder's first turn, from the idea text or the summary."""
+        if self.idea:
+            return self.idea
+        s = self.summary
+        return f"I want to build a product for {s.target_user or 'users'} that solves: {s.core_problem or 'TBD'}."
+
+
+def _slug(text: str) -> str:
+    return _SLUG_RE.sub("-", text.lower()).strip("-")[:60]
+
+
+def _summary_from(data: dict) -> DiscoverySummary:
+    """Coerce brief fields into DiscoverySummary (strings stripped, comma lists split)."""
+    values: dict[str, Any] = {}
+    for name in DiscoverySummary.model_fields:
+        value = data.get(name)
+        if value is None:
+            continue
+        if name in _LIST_FIELDS:
+            if isinstance(value, str):
+                value = [v.strip() for v in value.split(",")]
+            values[name] = [str(v).strip() for v in value if v is not None and str(v).strip()]
+        elif not isinstance(value, (list, dict)):
+            values[name] = str(value).strip() or None
+    return DiscoverySummary(**values)
+
+
+def parse_brief(data: dict, index: int) -> Brief:
+    """One brief from a mapping; index names briefs that carry no id/name/title."""
+    if not isinstance(data, dict):
+        raise ValueError(f"brief #{index} is not a mapping")
+    discovery = data.get("discovery") if isinstance(data.get("discovery"), dict) else data
+    label = data.get("id") or data.get("name") or data.get("title")
+    brief_id = _slug(str(label)) if label else ""
+    return Brief(
+        id=brief_id or f"brief-{index:04d}",
+        summary=_summary_from(discovery),
+        idea=str(data["idea"]).strip() if data.get("idea") else None,
+        persona=data.get("persona"),
+        message_policy=data.get("message_policy") or "expansive",
+        raw=data,
+    )
+
+
+def load_briefs(path: Path) -> list[Brief]:
+    """
+    Briefs from a .jsonl file (one object per line) or a YAML/JSON file holding a list or
+    {"briefs": [...]}. Duplicate ids get a numeric suffix so results never collide.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".jsonl":
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        loaded = yaml.safe_load(text) or []
+        items = loaded.get("briefs", []) if isinstance(loaded, dict) else loaded
+    briefs: list[Brief] = []
+    used: set[str] = set()
+    for i, item in enumerate(items):
+        brief = parse_brief(item, i)
+        base, n = brief.id, 1
+        while brief.id in used:  # "a", "a" -> "a-2", even if another brief is already "a-2"
+            n += 1
+            brief.id = f"{base}-{n}"
+        used.add(brief.id)
+        briefs.append(brief)
+    return briefs
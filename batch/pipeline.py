@@ -0,0 +1,221 @@
+"""Run many briefs through scoping and spec writing concurrently, with checkpoint/resume.
+
+Each brief gets its own Orchestrator, started from the pre-filled DiscoverySummary. In
+"auto" mode the initial scope is accepted as proposed; in "simulated" mode the eval's
+SimulatedUser answers as the founder (up to BATCH_MAX_SCOPING_TURNS) before the scope is
+accepted. Results land in <out>/<brief id>/ (spec.md, result.json); every finished brief
+appends one line to <out>/checkpoint.jsonl, and a rerun skips briefs already marked ok.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Literal, Optional
+
+from batch.briefs import Brief
+from config import (
+    BATCH_CONCURRENCY,
+    BATCH_MAX_SCOPING_TURNS,
+    BATCH_REQUESTS_PER_MINUTE,
+)
+from eval.simulated_user import SimulatedUser
+from models import telemetry
+from models.llm import set_rate_limit
+from orchestrator import Orchestrator
+
+logger = logging.getLogger("vibe_pm.batch")
+
+Mode = Literal["auto", "simulated"]
+CHECKPOINT_FILE = "checkpoint.jsonl"
+SUMMARY_FILE = "summary.json"
+
+
+@dataclass
+class BriefResult:
+    id: str
+    status: Literal["ok", "error"]
+    elapsed_s: float
+    spec_path: Optional[str] = None
+    error: Optional[str] = None
+    turns: int = 0
+
+
+@dataclass
+class BatchSummary:
+    total: int
+    skipped: int  # already ok in the checkpoint
+    results: list[BriefResult] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> int:
+        return sum(r.status == "ok" for r in self.results)
+
+    @property
+    def failed(self) -> int:
+        return sum(r.status == "error" for r in self.results)
+
+
+def completed_ids(out_dir: Path) -> set[str]:
+    """Brief ids recorded as ok in the checkpoint (later lines win, so a retried failure counts)."""
+    path = Path(out_dir) / CHECKPOINT_FILE
+    status: dict[str, str] = {}
+    if path.exists():
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+                status[entry["id"]] = entry["status"]
+            except (ValueError, KeyError, TypeError):
+                continue  # torn last line from an interrupted run
+    return {brief_id for brief_id, s in status.items() if s == "ok"}
+
+
+def _append_checkpoint(out_dir: Path, result: BriefResult) -> None:
+    entry = {
+        "id": result.id,
+        "status": result.status,
+        "elapsed_s": result.elapsed_s,
+        "spec_path": result.spec_path,
+        "error": result.error,
+        "finished": time.time(),
+    }
+    with open(Path(out_dir) / CHECKPOINT_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+
+
+async def _negotiate(orchestrator: Orchestrator, brief: Brief, transcript: list[dict]) -> None:
+    """Let the simulated founder respond to the proposal until the spec is written or turns run out."""
+    simulator = SimulatedUser(
+        persona=brief.persona or f"You are the founder. {brief.opening_message()}",
+        message_policy=brief.message_policy,
+    )
+    for _ in range(BATCH_MAX_SCOPING_TURNS):
+        if orchestrator.state.phase != "scoping":
+            return
+        user_msg = await simulator.next_message(transcript)
+        if not user_msg:
+            return
+        response, state = await orchestrator.handle_message(user_msg)
+        transcript.append({"user": user_msg, "assistant": response, "phase": state.phase})
+
+
+async def run_brief(brief: Brief, mode: Mode = "auto") -> tuple[Orchestrator, list[dict]]:
+    """Scoping + spec for one brief. Returns the orchestrator (final state) and the transcript."""
+    orchestrator = Orchestrator()
+    opening = brief.opening_message()
+    proposal = await orchestrator.start_from_summary(brief.summary, opening)
+    transcript = [{"user": opening, "assistant": proposal, "phase": orchestrator.state.phase}]
+    if mode == "simulated":
+        await _negotiate(orchestrator, brief, transcript)
+    if orchestrator.state.phase == "scoping":
+        spec_response = await orchestrator.accept_scope()
+        transcript.append({"user": "[auto-agree]", "assistant": spec_response, "phase": orchestrator.state.phase})
+    if orchestrator.spec_polish is not None:
+        try:
+            await orchestrator.spec_polish
+        except Exception:
+            pass
+    return orchestrator, transcript
+
+
+def _write_result(out_dir: Path, brief: Brief, orchestrator: Orchestrator, transcript: list[dict]) -> Path:
+    """Write <out>/<id>/spec.md and result.json; returns the spec path."""
+    brief_dir = Path(out_dir) / brief.id
+    brief_dir.mkdir(parents=True, exist_ok=True)
+    state = orchestrator.state
+    spec_path = brief_dir / "spec.md"
+    spec_path.write_text(state.spec_markdown or "", encoding="utf-8")
+    payload = {
+        "id": brief.id,
+        "brief": brief.raw,
+        "phase": state.phase,
+        "discovery_summary": state.discovery_summary.model_dump(mode="json"),
+        "scoping_output": state.scoping_output.model_dump(mode="json") if state.scoping_output else None,
+        "negotiation_rounds": state.negotiation_rounds,
+        "transcript": transcript,
+    }
+    (brief_dir / "result.json").write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    return spec_path
+
+
+async def run_batch(
+    briefs: list[Brief],
+    out_dir: Path,
+    mode: Mode = "auto",
+    concurrency: int = BATCH_CONCURRENCY,
+    requests_per_minute: Optional[float] = BATCH_REQUESTS_PER_MINUTE,
+    resume: bool = True,
+    on_result: Optional[Callable[[BriefResult], None]] = None,
+) -> BatchSummary:
+    """
+    Run briefs with at most `concurrency` in flight and LLM requests capped at
+    requests_per_minute (process-wide, for the duration of the batch). With resume,
+    briefs already ok in out_dir's checkpoint are skipped; failed ones are retried.
+    Brief ids name the output directories, so they must be unique (load_briefs ensures it).
+    """
+    ids = [b.id for b in briefs]
+    duplicates = sorted({i for i in ids if ids.count(i) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate brief ids: {', '.join(duplicates)}")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    done = completed_ids(out_dir) if resume else set()
+    pending = [b for b in briefs if b.id not in done]
+    summary = BatchSummary(total=len(briefs), skipped=len(briefs) - len(pending))
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    started = time.monotonic()
+
+    async def one(brief: Brief) -> None:
+        async with semaphore:
+            t0 = time.monotonic()
+            try:
+                orchestrator, transcript = await run_brief(brief, mode)
+                if not orchestrator.state.spec_markdown:
+                    raise RuntimeError(f"no spec produced (ended in phase {orchestrator.state.phase})")
+                spec_path = _write_result(out_dir, brief, orchestrator, transcript)
+                result = BriefResult(
+                    id=brief.id,
+                    status="ok",
+                    elapsed_s=round(time.monotonic() - t0, 2),
+                    spec_path=str(spec_path.relative_to(out_dir)),
+                    turns=len(transcript),
+                )
+            except Exception as e:
+                logger.warning("brief %s failed: %s", brief.id, e)
+                result = BriefResult(
+                    id=brief.id,
+                    status="error",
+                    elapsed_s=round(time.monotonic() - t0, 2),
+                    error=f"{type(e).__name__}: {e}",
+                )
+            _append_checkpoint(out_dir, result)
+            telemetry.incr(f"batch.{result.status}")
+            summary.results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    set_rate_limit(requests_per_minute)
+    try:
+        await asyncio.gather(*(one(b) for b in pending))
+    finally:
+        set_rate_limit(None)
+    summary.elapsed_s = round(time.monotonic() - started, 2)
+    _write_summary(out_dir, summary)
+    return summary
+
+
+def _write_summary(out_dir: Path, summary: BatchSummary) -> None:
+    payload = {
+        "total": summary.total,
+        "skipped": summary.skipped,
+        "ok": summary.ok,
+        "failed": summary.failed,
+        "elapsed_s": summary.elapsed_s,
+        "llm_calls": telemetry.counters("llm_call").get("llm_call", 0),
+        "failures": {r.id: r.error for r in summary.results if r.status == "error"},
+    }
+    (Path(out_dir) / SUMMARY_FILE).write_text(json.dumps(payload, indent=2), encoding="utf-8")
@@ -0,0 +1,77 @@
+"""Batch CLI: turn a file of idea briefs into specs.
+
+    python batch/runner.py briefs.yaml --out batch_results/portfolio
+    python batch/runner.py briefs.jsonl --mode simulated --concurrency 8 --rpm 60
+"""
+
+import argparse
+import asyncio
+import sys
+import warnings
+from pathlib import Path
+
+warnings.filterwarnings("ignore", category=ResourceWarning)
+
+# Add project root so imports work
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
+
+from batch.briefs import load_briefs
+from batch.pipeline import BriefResult, run_batch
+from config import (
+    BATCH_CONCURRENCY,
+    BATCH_IDEA_INDEX_ENABLED,
+    BATCH_REQUESTS_PER_MINUTE,
+    BATCH_RESULTS_DIR,
+)
+from tools.idea_index import idea_index
+
+
+def _print_result(result: BriefResult) -> None:
+    if result.status == "ok":
+        print(f"[ok]    {result.id} ({result.elapsed_s}s) -> {result.spec_path}")
+    else:
+        print(f"[error] {result.id} ({result.elapsed_s}s): {result.error}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Vibe-PM batch: idea briefs -> specs")
+    parser.add_argument("briefs", type=Path, help="YAML/JSON list of briefs or a .jsonl file")
+    parser.add_argument("--out", type=Path, default=BATCH_RESULTS_DIR, help="results directory")
+    parser.add_argument(
+        "--mode",
+        choices=("auto", "simulated"),
+        default="auto",
+        help="auto: accept the proposed scope; simulated: SimulatedUser negotiates first",
+    )
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="briefs in flight")
+    parser.add_argument(
+        "--rpm", type=float, default=BATCH_REQUESTS_PER_MINUTE, help="LLM requests per minute (0 = unlimited)"
+    )
+    parser.add_argument("--no-resume", action="store_true", help="rerun briefs already completed in --out")
+    args = parser.parse_args()
+    # Briefs may come from different founders; the shared idea index would leak between them
+    idea_index.enabled = BATCH_IDEA_INDEX_ENABLED
+
+    briefs = load_briefs(args.briefs)
+    print(f"{len(briefs)} briefs -> {args.out} (mode={args.mode}, concurrency={args.concurrency}, rpm={args.rpm or 'unlimited'})")
+    summary = await run_batch(
+        briefs,
+        args.out,
+        mode=args.mode,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm or None,
+        resume=not args.no_resume,
+        on_result=_print_result,
+    )
+    print(
+        f"\nDone in {summary.elapsed_s}s: {summary.ok} ok, {summary.failed} failed, "
+        f"{summary.skipped} skipped (already complete)"
+    )
+    # Let litellm/httpx transport teardown finish before the loop closes
+    await asyncio.sleep(0.5)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -25,20 +25,194 @@ MODELS = {
 }
 
 # Reasoning config for GPT-OSS-20B (conversation task only)
-REASONING_EFFORT = "medium"  # "low" | "medium" | "high"
+REASONING_EFFORT = "medium"  # "low" | "medium" | "high"; default for calls without a call_site policy
 INCLUDE_REASONING = False  # set True to see reasoning in logs
 
+# Per-call-site policy for the conversation model. reasoning_effort/max_tokens are the
+# starting point; models/policy.py adapts them from observed latency and quality.
+# Note: GPT-OSS counts reasoning tokens against max_tokens, so keep these generous.
+CALL_SITE_POLICIES = {
+    "discovery_question": {"reasoning_effort": "low", "max_tokens": 1024, "target_latency_s": 2.0},
+    "discovery_retry": {"reasoning_effort": "low", "max_tokens": 1024, "target_latency_s": 2.0},
+    "discovery_summary": {"reasoning_effort": "low", "max_tokens": 2048, "target_latency_s": 4.0},
+    "scoping_proposal": {"reasoning_effort": "medium", "max_tokens": 6144, "target_latency_s": 15.0},
+    "scoping_question": {"reasoning_effort": "low", "max_tokens": 1536, "target_latency_s": 4.0},
+    "argue_back": {"reasoning_effort": "medium", "max_tokens": 2048, "target_latency_s": 8.0},
+    "concession": {"reasoning_effort": "low", "max_tokens": 1536, "target_latency_s": 4.0},
+}
+POLICY_MIN_SAMPLES = 5  # observations per call site before the policy adapts
+POLICY_ESCALATE_FAILURE_RATE = 0.3  # quality failures at/above this -> raise reasoning effort
+POLICY_DEESCALATE_FAILURE_RATE = 0.1  # slow and failures at/below this -> lower reasoning effort
+POLICY_MAX_TOKENS_CAP = 8192  # ceiling when growing max_tokens after truncated replies
+POLICY_DECAY_S = 900.0  # an adapted effort steps back toward the configured one after this long unchanged
+
+# Telemetry: in-process ring buffer of recent events (see models/telemetry.py)
+TELEMETRY_MAX_EVENTS = 2000
+
+# Stream conversation replies and run output validators on the partial text, aborting
+# generation as soon as one fires (see BaseAgent._llm_conversation_checked)
+STREAM_VALIDATION = True
+
+# Startup: heavy providers (LiteLLM, DuckDuckGo search, httpx) are imported on first use
+# (models/providers.py). Servers warm them in a background thread right after startup.
+PROVIDER_PRELOAD = True
+# import_bench.py fails when importing an entry point takes longer than this (cold process)
+COLD_START_BUDGET_S = 1.0
+
 # Retry config
 LLM_MAX_RETRIES = 3
-LLM_RETRY_DELAYS = (1, 2, 4)  # seconds, exponential backoff
+LLM_RETRY_DELAYS = (1, 2, 4)  # seconds, exponential backoff; skipped when the turn budget can't cover it
+
+# Per-turn deadline (models/deadline.py): the latency a founder is promised for one turn
+# (None = unbounded). Past it, components answer with their degraded fallback: templated
+# gap question, previous discovery summary, cached/empty search results, rendered spec.
+TURN_DEADLINE_S = 30.0
+# Seconds a component leaves in the budget for the steps that follow it in the same turn
+DEADLINE_RESERVE_S = {
+    "extraction": 8.0,  # the discovery question still has to be asked
+    "search": 15.0,  # proposal call + scoping extraction
+    "enrichment": 15.0,
+}
+
+# Extraction: request JSON mode (response_format=json_object) when the extraction model
+# supports it; otherwise the reply is streamed through the tolerant JSON parser.
+EXTRACTION_JSON_MODE = True
 
 # Discovery completeness
 DISCOVERY_COMPLETENESS_THRESHOLD = 0.75
 DISCOVERY_MANDATORY_FIELDS = ("target_user", "core_problem")
 DISCOVERY_MIN_TURNS = 4  # minimum user messages before completeness check can pass
+# Change-detection gate in front of discovery extraction (tools/extraction_gate.py)
+EXTRACTION_GATE_ENABLED = True
+EXTRACTION_GATE_SHORT_WORDS = 12  # replies up to this many words get narrowed extraction
 
 # Scoping
 MAX_NEGOTIATION_ROUNDS = 3
+# Ask the proposal call for prose + ScopingOutput JSON in one completion; the 8B
+# extraction call then only runs as a fallback when the JSON section fails validation.
+SCOPING_SINGLE_CALL_PROPOSAL = True
+
+# RICE engine (tools/rice.py): scores are recomputed from reach/impact/confidence/effort
+RICE_MISMATCH_RTOL = 0.05  # reported score off by more than 5% -> flagged as LLM arithmetic mismatch
+RICE_BAND_SHARES = (0.3, 0.4)  # top 30% of scored features -> P0, next 40% -> P1, rest -> P2
+RICE_REASSIGN_PRIORITIES = False  # True: overwrite Feature.priority with the score band
+RICE_CONFIDENCE_SWEEP = (0.5, 0.75, 1.0, 1.25)  # sensitivity sweep multipliers (confidence capped at 1)
+RICE_EFFORT_SWEEP = (0.5, 1.0, 1.5, 2.0)
+
+# Phase planner (tools/phase_planner.py): re-allocates features to phases within week budgets
+PHASE_PLANNER_ENABLED = True
+PHASE_WEEK_BUDGETS = (4, 4, 6)  # weeks per phase for the whole team; scaled down by a shorter stated timeline
+PHASE_PLANNER_DEFAULT_TEAM = 1.0  # developers, when constraints don't say
+PHASE_PLANNER_DEFAULT_EFFORT = 1.0  # person-weeks, for features without rice_effort
+PHASE_PLANNER_EFFORT_STEP = 0.5  # knapsack granularity in person-weeks
+PHASE_PLANNER_MAX_NODES = 200_000  # branch-and-bound search cap per phase (best plan so far is kept)
+
+# After each PUSHBACK reply, extract add/remove/reprioritize ops from that reply alone
+# (extraction model, background) and apply them to scoping_output (tools/scope_patch.py)
+SCOPE_PATCH_ENABLED = True
+
+# Speculative execution (speculation.py): start likely-next work in the background while
+# the founder is reading. Results are committed if the predicted branch is taken, else
+# cancelled. Caps are per session, per speculation kind (launches, not successes).
+SPECULATION_ENABLED = True
+SPECULATION_MAX_PER_SESSION = {
+    "scoping_proposal": 2,  # after the discovery summary is shown
+    "spec": 3,  # 70B spec call while scope agreement is pending; restarted when scope changes
+    "argue_back": 3,  # PUSHBACK reply started alongside scoping intent classification
+}
+SPECULATIVE_SPEC = True
+SPECULATIVE_ARGUE_BACK = True
+# Affirmations up to this many words ("sounds good, let's go") are not speculated on
+ARGUE_BACK_AFFIRMATION_MAX_WORDS = 6
+
+# Spec writer: "single" = one 70B call for the whole document; "sections" = one call per
+# template section (tools/templates.py), run concurrently and stitched in template order;
+# "template" = deterministic render from discovery + scoping (tools/spec_renderer.py), no LLM
+SPEC_GENERATION_MODE = "template"
+# Template mode: rewrite these narrative sections with the spec model in the background
+# and swap them in when ready (empty tuple disables the polish pass)
+SPEC_POLISH_SECTIONS = ("overview", "risks")
+# Done-phase spec edits regenerate only the affected sections, on this (small) model first;
+# the spec model is the fallback when its output is malformed
+SPEC_REVISION_TASK = "extraction"
+# Fact check (tools/fact_check.py): discovery facts the spec must cover and named
+# entities / numbers it may not invent. LLM-written specs that fail fall back to the
+# deterministic render; polished sections that add unsupported claims are discarded.
+FACT_CHECK_ENABLED = True
+FACT_CHECK_MIN_COVERAGE = 0.6  # share of discovery facts present in the spec
+FACT_CHECK_MAX_UNSUPPORTED = 3  # unsupported entities + numbers tolerated in a whole spec
+FACT_CHECK_MAX_NEW_UNSUPPORTED = 1  # per polished section, beyond those in its draft
+FACT_COVERAGE_MIN_SHARE = 0.5  # share of a fact's content words that must appear
+FACT_CHECK_SMALL_NUMBER = 10  # plain numbers up to this (phase numbers, counts) are not checked
+# Content-addressed on-disk cache of LLM-generated specs (tools/spec_cache.py)
+SPEC_CACHE_ENABLED = True
+SPEC_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "spec"
+SPEC_CACHE_MAX_ENTRIES = 200
+SPEC_CACHE_TTL_DAYS = 30
+
+# Similar-idea index (tools/idea_index.py): finished sessions keyed by MinHash of the
+# discovery summary; near-duplicates seed the scoping prompt and can skip web search
+IDEA_INDEX_ENABLED = True
+IDEA_INDEX_DIR = Path(__file__).resolve().parent / ".cache" / "ideas"
+IDEA_INDEX_NUM_PERM = 128
+IDEA_INDEX_BANDS = 32  # 4 rows per band: candidates from ~0.4 Jaccard upwards
+IDEA_INDEX_MIN_SIMILARITY = 0.5  # below this a prior session is not offered as a seed
+IDEA_INDEX_SKIP_SEARCH_SIMILARITY = 0.8  # reuse the prior comparables instead of searching
+# The index is one local store shared by every session in the process, so a multi-founder
+# server or a batch of other people's briefs would seed one founder's proposal with another's
+# scope and spec: off by default there (the Chainlit app is a single founder's local tool)
+API_IDEA_INDEX_ENABLED = False
+BATCH_IDEA_INDEX_ENABLED = False
+
+# Headless batch runs (batch/): briefs -> specs without a Chainlit session
+BATCH_RESULTS_DIR = Path(__file__).resolve().parent / "batch_results"
+BATCH_CONCURRENCY = 4  # briefs in flight at once
+BATCH_REQUESTS_PER_MINUTE = 30  # LLM requests across all briefs (Groq free tier is ~30 RPM)
+BATCH_MAX_SCOPING_TURNS = 6  # simulated-founder turns before the scope is accepted as is
+
+# HTTP API (api.py): one worker serves many programmatic sessions
+API_MAX_SESSIONS = 1000
+API_SESSION_TTL_S = 3600  # idle sessions are dropped after an hour
+API_MAX_CONCURRENT_TURNS = 8  # turns running at once across all sessions
+API_MAX_QUEUED_TURNS = 32  # turns waiting for a slot; beyond this, 503 + Retry-After
 
 # Web search
 WEB_SEARCH_MAX_RESULTS = 5
+# Comparable products also come from a local BM25 corpus (tools/product_corpus.py): the
+# bundled dataset plus every web result seen so far. "parallel" queries it alongside
+# DuckDuckGo and falls back to it at the deadline; "local_first" skips the web search when
+# the corpus already has enough strong matches; "web" is DuckDuckGo only.
+COMPARABLE_SEARCH_STRATEGY = "parallel"
+WEB_SEARCH_DEADLINE_S = 8.0  # DDGS retries sleep 5s; past this, answer from the corpus
+PRODUCT_CORPUS_BUNDLED = Path(__file__).resolve().parent / "data" / "comparable_products.jsonl"
+PRODUCT_CORPUS_DIR = Path(__file__).resolve().parent / ".cache" / "products"
+PRODUCT_CORPUS_BM25_K1 = 1.5
+PRODUCT_CORPUS_BM25_B = 0.75
+PRODUCT_CORPUS_MIN_SCORE = 4.0  # BM25 score below which a local match is not offered
+PRODUCT_CORPUS_SUFFICIENT = 3  # strong local matches needed to skip the web ("local_first")
+# Optional enrichment (tools/page_fetcher.py): fetch the top comparable pages concurrently,
+# extract their main text and summarize each with the extraction model, so the scoping
+# prompt sees more than a 200-character snippet. Pages that miss the deadline are skipped.
+COMPARABLE_ENRICHMENT_ENABLED = False
+ENRICH_MAX_PAGES = 3
+ENRICH_DEADLINE_S = 6.0  # fetch + summarize, all pages together
+ENRICH_FETCH_TIMEOUT_S = 4.0  # per request
+ENRICH_PER_HOST_LIMIT = 2  # concurrent connections per host
+PAGE_TEXT_MAX_CHARS = 4000  # extracted text passed to the summarizer
+PAGE_MAX_BYTES = 1_000_000  # response bodies are read up to this size; the rest is dropped
+PAGE_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "pages"
+PAGE_CACHE_FRESH_S = 86400  # within a day cached pages are used without revalidation
+
+# Context-window budgeting (approximate tokens, estimated at ~4 chars/token).
+# When system prompt + history exceed the budget for a task type, older turns are
+# replaced by a cached rolling summary; the most recent turns always stay verbatim.
+CONTEXT_BUDGETS = {
+    "conversation": 6000,
+    "extraction": 4000,
+    "classification": 1000,
+    "spec": 12000,
+}
+CONTEXT_CHARS_PER_TOKEN = 4
+CONTEXT_RECENT_MESSAGES = 6  # always kept verbatim
+CONTEXT_SUMMARY_TOKENS = 400  # reserved for the rolling summary of older turns
+CONTEXT_COMPACTION_STEP = 4  # summary boundary slides in steps of this many messages
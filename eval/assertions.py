@@ -4,6 +4,9 @@ import re
 from dataclasses import dataclass
 from typing import List, Optional
 
+from models.schemas import DiscoverySummary, ScopingOutput
+from tools.fact_check import check_spec_facts
+
 
 @dataclass
 class AssertionResult:
@@ -341,6 +344,30 @@ def universal_assertions(transcript: List[dict], state_dict: dict) -> List[Asser
             detail="skipped — target_user or spec is empty (prerequisite missing)",
         ))
 
+    # spec_fact_coverage — discovery facts covered, no invented names / numbers
+    if discovery and _nonempty(spec):
+        try:
+            scope_model = ScopingOutput(**scoping) if scoping else None
+            report = check_spec_facts(
+                spec,
+                DiscoverySummary(**discovery),
+                scope_model,
+                [t.get(k) or "" for t in transcript for k in ("user", "assistant")],
+            )
+            detail = "" if report.ok() else (
+                f"coverage {report.coverage:.0%} (missing: {report.missing[:3]}); "
+                f"unsupported: {report.unsupported[:5]}"
+            )
+            results.append(AssertionResult(name="spec_fact_coverage", passed=report.ok(), detail=detail))
+        except (TypeError, ValueError) as e:
+            results.append(AssertionResult(name="spec_fact_coverage", passed=False, detail=f"invalid state: {e}"))
+    else:
+        results.append(AssertionResult(
+            name="spec_fact_coverage",
+            passed=False,
+            detail="skipped — discovery_summary or spec is empty (prerequisite missing)",
+        ))
+
     # spec_has_sections — at least 2 expected ## headers present
     matched_headers = [h for h in _SPEC_HEADERS if h in spec_lower]
     sections_ok = len(matched_headers) >= 2
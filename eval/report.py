@@ -117,6 +117,81 @@ def _judge_section(scenario_results: List[dict]) -> List[str]:
     return lines
 
 
+def _telemetry_section(scenario_results: List[dict]) -> List[str]:
+    """Render pipeline telemetry (extraction parse outcomes, ...) per scenario."""
+    lines: List[str] = [
+        "## Pipeline Telemetry",
+        "",
+        "> Extraction parse outcomes: ok = strict JSON, repaired = tolerant parser fixed it, failed = empty model returned.",
+        "",
+        "| Scenario | Extraction | OK | Repaired | Failed | Failure rate |",
+        "|---|---|---|---|---|---|",
+    ]
+    for sr in scenario_results:
+        stats = (sr.get("state_dict") or {}).get("telemetry", {}).get("extraction_parse") or {}
+        if not stats:
+            lines.append(f"| {sr['scenario']} | — | — | — | — | — |")
+            continue
+        for kind, entry in sorted(stats.items()):
+            lines.append(
+                f"| {sr['scenario']} | {kind} | {entry['ok']} | {entry['repaired']} | "
+                f"{entry['failed']} | {entry['failure_rate']:.0%} |"
+            )
+    lines.append("")
+
+    lines += [
+        "> Extraction gate decisions per discovery turn (skip = no 8B call, narrow = targeted fields only).",
+        "",
+        "| Scenario | Skip | Narrow | Full |",
+        "|---|---|---|---|",
+    ]
+    for sr in scenario_results:
+        gate = (sr.get("state_dict") or {}).get("telemetry", {}).get("extraction_gate") or {}
+        lines.append(
+            f"| {sr['scenario']} | {gate.get('skip', '—')} | {gate.get('narrow', '—')} | {gate.get('full', '—')} |"
+        )
+    lines.append("")
+
+    lines += [
+        "> Discovery output validators (streamed; a trigger aborts generation and starts the corrective call).",
+        "",
+        "| Scenario | Replies checked | Structured | Multi-question | Trigger rate |",
+        "|---|---|---|---|---|",
+    ]
+    for sr in scenario_results:
+        validator = (sr.get("state_dict") or {}).get("telemetry", {}).get("discovery_validator") or {}
+        checked = validator.get("discovery_validator.checked", 0)
+        structured = validator.get("discovery_validator.structured", 0)
+        multi = validator.get("discovery_validator.multi_question", 0)
+        trigger_rate = f"{(structured + multi) / checked:.0%}" if checked else "—"
+        lines.append(f"| {sr['scenario']} | {checked} | {structured} | {multi} | {trigger_rate} |")
+    lines.append("")
+
+    lines += [
+        "> Speculative work started during founder think-time (committed = result served, cancelled/stale = discarded).",
+        "",
+        "| Scenario | Kind | Launched | Committed | Cancelled | Stale | Failed | Over budget | Hit rate |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    for sr in scenario_results:
+        spec_counters = (sr.get("state_dict") or {}).get("telemetry", {}).get("speculation") or {}
+        kinds = sorted({name.split(".")[1] for name in spec_counters})
+        if not kinds:
+            lines.append(f"| {sr['scenario']} | — | — | — | — | — | — | — | — |")
+            continue
+        for kind in kinds:
+            c = {outcome: spec_counters.get(f"speculation.{kind}.{outcome}", 0) for outcome in (
+                "launched", "committed", "cancelled", "stale", "failed", "over_budget"
+            )}
+            hit = f"{c['committed'] / c['launched']:.0%}" if c["launched"] else "—"
+            lines.append(
+                f"| {sr['scenario']} | {kind} | {c['launched']} | {c['committed']} | {c['cancelled']} | "
+                f"{c['stale']} | {c['failed']} | {c['over_budget']} | {hit} |"
+            )
+    lines.append("")
+    return lines
+
+
 # ---------------------------------------------------------------------------
 # Timestamped report
 # ---------------------------------------------------------------------------
@@ -247,6 +322,8 @@ def generate_report(
 
         lines.append("")
 
+    lines += _telemetry_section(scenario_results)
+
     # -----------------------------------------------------------------------
     # Layer 3: LLM Judge Scores (only when judge was run)
     # -----------------------------------------------------------------------
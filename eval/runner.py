@@ -20,6 +20,9 @@ if str(_root) not in sys.path:
 import yaml
 
 from orchestrator import Orchestrator
+from models import telemetry
+from tools.extraction import extraction_parse_stats
+from tools.idea_index import idea_index
 from eval.rubric import RUBRIC_DIMENSIONS, get_rubric_text
 from eval.simulated_user import SimulatedUser
 from eval.assertions import run_assertions, print_checklist
@@ -83,6 +86,7 @@ async def run_conversation(
     """
     orchestrator = Orchestrator()
     transcript = []
+    telemetry.reset()
 
     if user_messages is not None:
         # Fixed message list (manual override)
@@ -140,6 +144,13 @@ async def run_conversation(
                 transcript.append({"user": "[SIMULATED USER RETURNED EMPTY]", "assistant": "", "phase": state.phase})
                 break
 
+    # Score the final spec: let a background polish pass (template mode) finish first
+    if orchestrator.spec_polish is not None:
+        try:
+            await orchestrator.spec_polish
+        except Exception:
+            pass
+
     # Build state summary for scoring
     state = orchestrator.state
     state_dict = {
@@ -152,10 +163,24 @@ async def run_conversation(
         "spec_length": len(state.spec_markdown or ""),
         "spec_markdown": state.spec_markdown or "",
         "negotiation_rounds": state.negotiation_rounds,
+        "telemetry": _telemetry_summary(),
     }
     return transcript, state_dict
 
 
+def _telemetry_summary() -> dict:
+    """Per-scenario pipeline telemetry for the report (parse outcomes, etc.)."""
+    return {
+        "extraction_parse": extraction_parse_stats(),
+        "extraction_gate": {
+            action: telemetry.counters(f"extraction_gate.{action}").get(f"extraction_gate.{action}", 0)
+            for action in ("skip", "narrow", "full")
+        },
+        "discovery_validator": telemetry.counters("discovery_validator."),
+        "speculation": telemetry.counters("speculation."),
+    }
+
+
 def format_transcript(transcript: List[dict]) -> str:
     """Format transcript for human or LLM review."""
     lines = []
@@ -195,6 +220,8 @@ async def main() -> None:
     )
     args = parser.parse_args()
     use_judge = args.judge
+    # Scenarios repeat every run; seeding them from earlier runs would hide regressions
+    idea_index.enabled = False
 
     scenario_names = ["vague_founder", "over_scoper", "clear_thinker", "arguer", "pivoter"]
     run_timestamp = datetime.now(timezone.utc)
@@ -0,0 +1,111 @@
+"""Import-time benchmark: cold-start cost of each entry point, from `python -X importtime`.
+
+    python import_bench.py                        # all entry points, budget from config
+    python import_bench.py api --top 20 --budget 0.8
+    python import_bench.py --runs 5
+
+Each module is imported in a fresh interpreter (best of --runs). Reports the import
+time, the heaviest packages (self time summed per top-level package) and the slowest
+imports the module makes itself (cumulative). Exits 1 when a module is over the cold-start budget or
+imports a provider that models/providers.py loads lazily. Modules that cannot be
+imported here (e.g. chainlit not installed) are reported and skipped.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from config import COLD_START_BUDGET_S
+from models.providers import PROVIDERS
+
+ROOT = Path(__file__).resolve().parent
+ENTRY_POINTS = ("orchestrator", "api", "eval.runner", "batch.runner", "app")
+
+_PROBE = (
+    "import json, sys, time\n"
+    "t = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - t\n"
+    "print(json.dumps({{'import_s': elapsed, 'eager': [m for m in {deferred!r} if m in sys.modules]}}))\n"
+)
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """(module, depth, self_us, cumulative_us) per line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+            rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+def measure(module: str) -> dict:
+    """Import module once in a fresh interpreter; import time, eager providers and importtime rows."""
+    code = _PROBE.format(module=module, deferred=tuple(PROVIDERS.values()))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        error = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+        return {"module": module, "error": error}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["module"] = module
+    result["rows"] = parse_importtime(proc.stderr)
+    return result
+
+
+def report(result: dict, top: int) -> None:
+    rows = result["rows"]
+    by_package: dict[str, int] = defaultdict(int)
+    for name, _, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    print(f"\n{result['module']}: {result['import_s']:.3f}s")
+    print("  heaviest packages (self time):")
+    for package, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"    {us / 1e6:8.3f}s  {package}")
+    print("  slowest imports made by the module itself (cumulative):")
+    direct = [r for r in rows if r[1] == 1]
+    for name, _, _, cumulative_us in sorted(direct, key=lambda r: -r[3])[:top]:
+        print(f"    {cumulative_us / 1e6:8.3f}s  {name}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark for the entry points")
+    parser.add_argument("modules", nargs="*", default=list(ENTRY_POINTS), help="Modules to import")
+    parser.add_argument("--budget", type=float, default=COLD_START_BUDGET_S, help="Max import time per module (s)")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per module; best run is reported")
+    parser.add_argument("--top", type=int, default=10, help="Rows per breakdown")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        runs = [measure(module) for _ in range(max(args.runs, 1))]
+        if "error" in runs[0]:
+            print(f"\n{module}: skipped ({runs[0]['error']})")
+            continue
+        best = min(runs, key=lambda r: r["import_s"])
+        report(best, args.top)
+        if best["import_s"] > args.budget:
+            failures.append(f"{module}: {best['import_s']:.3f}s > budget {args.budget:.3f}s")
+        if best["eager"]:
+            failures.append(f"{module}: imports lazily loaded provider(s) eagerly: {', '.join(best['eager'])}")
+
+    print()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if not failures:
+        print(f"OK: every module within the {args.budget:.3f}s cold-start budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,8 +7,10 @@ from models.schemas import (
     Feature,
     CutFeature,
     ComparableProduct,
+    SpecVersion,
 )
 from models.llm import llm_call
+from models.context import fit_history
 
 __all__ = [
     "ConversationState",
@@ -17,5 +19,7 @@ __all__ = [
     "Feature",
     "CutFeature",
     "ComparableProduct",
+    "SpecVersion",
     "llm_call",
+    "fit_history",
 ]
@@ -0,0 +1,134 @@
+"""Context-window budgeting: token estimates and rolling history compaction."""
+
+from typing import Optional
+
+from config import (
+    CONTEXT_BUDGETS,
+    CONTEXT_CHARS_PER_TOKEN,
+    CONTEXT_COMPACTION_STEP,
+    CONTEXT_RECENT_MESSAGES,
+    CONTEXT_SUMMARY_TOKENS,
+)
+from models.llm import TaskType, llm_call
+from models.schemas import ConversationState
+from prompts.extraction import HISTORY_SUMMARY_PROMPT
+
+# Per-message overhead (role markers, separators) in estimated tokens
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Cheap token estimate (~4 chars/token). Good enough for budgeting, not billing."""
+    if not text:
+        return 0
+    return len(text) // CONTEXT_CHARS_PER_TOKEN + 1
+
+
+def messages_tokens(messages: list[dict]) -> int:
+    """Estimated tokens for a chat message list."""
+    return sum(estimate_tokens(m.get("content")) + _MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def context_budget(task_type: TaskType) -> int:
+    """Token budget for a task type (falls back to the conversation budget)."""
+    return CONTEXT_BUDGETS.get(task_type, CONTEXT_BUDGETS["conversation"])
+
+
+def _render(messages: list[dict]) -> str:
+    return "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+
+
+def _compaction_cut(messages: list[dict], available: int) -> int:
+    """
+    Index of the first message kept verbatim. Walks back from the newest message,
+    always keeping CONTEXT_RECENT_MESSAGES, then as many more as fit in `available`.
+    The cut is rounded up to a multiple of CONTEXT_COMPACTION_STEP so the cached
+    summary only changes when the boundary slides by a full step.
+    """
+    keep_from = len(messages)
+    used = 0
+    while keep_from > 0:
+        cost = messages_tokens([messages[keep_from - 1]])
+        if len(messages) - keep_from >= CONTEXT_RECENT_MESSAGES and used + cost > available:
+            break
+        used += cost
+        keep_from -= 1
+    if keep_from == 0:
+        return 0
+    step = max(1, CONTEXT_COMPACTION_STEP)
+    aligned = -(-keep_from // step) * step
+    return min(aligned, max(0, len(messages) - CONTEXT_RECENT_MESSAGES))
+
+
+async def _rolling_summary(state: ConversationState, messages: list[dict], cut: int) -> str:
+    """
+    Summary of messages[:cut], cached on state. Regenerated only when the cut slides:
+    forward slides fold just the newly-evicted turns into the previous summary.
+    """
+    if state.history_summary is not None and state.history_summary_upto == cut:
+        return state.history_summary
+
+    if state.history_summary is not None and 0 < state.history_summary_upto < cut:
+        previous, start = state.history_summary, state.history_summary_upto
+    else:
+        previous, start = "", 0
+
+    prompt = HISTORY_SUMMARY_PROMPT.format(
+        previous_summary=previous,
+        conversation=_render(messages[start:cut]),
+    )
+    try:
+        summary = await llm_call("extraction", [{"role": "user", "content": prompt}])
+    except Exception:
+        # Keep whatever we had; otherwise fall back to a hard truncation of the evicted turns
+        if previous:
+            return previous
+        limit = CONTEXT_SUMMARY_TOKENS * CONTEXT_CHARS_PER_TOKEN
+        return _render(messages[:cut])[-limit:]
+
+    state.history_summary = summary
+    state.history_summary_upto = cut
+    return summary
+
+
+async def fit_history(
+    state: ConversationState,
+    messages: list[dict],
+    system_prompt: str,
+    task_type: TaskType = "conversation",
+) -> tuple[str, list[dict]]:
+    """
+    Fit system prompt + messages into the task type's context budget.
+    Returns (system_prompt, messages) unchanged when they fit; otherwise older turns
+    are folded into a rolling summary appended to the system prompt and only recent
+    turns are returned verbatim.
+
+    `messages` must start with state.messages (callers may append the pending user
+    turn), since the cached summary is indexed by position in the history.
+    """
+    budget = context_budget(task_type)
+    if estimate_tokens(system_prompt) + messages_tokens(messages) <= budget:
+        return system_prompt, messages
+
+    available = budget - estimate_tokens(system_prompt) - CONTEXT_SUMMARY_TOKENS
+    cut = _compaction_cut(messages, available)
+    if cut <= 0:
+        return system_prompt, messages
+
+    summary = await _rolling_summary(state, messages, cut)
+    system = f"{system_prompt}\n\n--- Earlier conversation (summarized) ---\n{summary}"
+    return system, messages[cut:]
+
+
+def recent_within_budget(messages: list[dict], task_type: TaskType) -> list[dict]:
+    """Newest messages that fit the task type's budget (no summary). For extraction over history."""
+    budget = context_budget(task_type)
+    kept: list[dict] = []
+    used = 0
+    for m in reversed(messages):
+        cost = messages_tokens([m])
+        if kept and used + cost > budget:
+            break
+        kept.append(m)
+        used += cost
+    return list(reversed(kept))
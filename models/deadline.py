@@ -0,0 +1,119 @@
+"""Per-turn deadline, propagated through the call tree with a context variable.
+
+Orchestrator.handle_message opens a TurnBudget (TURN_DEADLINE_S); every coroutine and
+task started inside the turn sees it via remaining(). Components that have a cheap
+answer to fall back on wrap their slow path in within_budget(), which cancels it when
+the budget (minus whatever the component must leave for later steps) runs out and
+returns the degraded answer instead. Time spent queueing for a shared resource (the
+batch LLM rate limiter) is not the turn's own work: exclude() pushes the deadline back
+by it, and within_budget re-reads the deadline before giving up. Degradations are
+recorded in telemetry as "degraded" events and degraded.<component> counters.
+Background work that outlives the turn (speculation, polish, scope patches) is started
+under without_deadline().
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+from models import telemetry
+
+T = TypeVar("T")
+
+
+@dataclass
+class TurnBudget:
+    deadline: float  # time.monotonic() by which the turn should have answered
+    degraded: list[str] = field(default_factory=list)  # components that fell back, in order
+    excluded_s: float = 0.0  # queueing time the deadline was pushed back by
+    _excluded_until: float = 0.0  # end of the latest excluded interval
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def exclude(self, started: float, ended: float) -> None:
+        """Push the deadline back by [started, ended], minus any part already excluded."""
+        credit = ended - max(started, self._excluded_until)
+        self._excluded_until = max(self._excluded_until, ended)
+        if credit > 0:
+            self.deadline += credit
+            self.excluded_s += credit
+
+
+_budget: ContextVar[Optional[TurnBudget]] = ContextVar("turn_budget", default=None)
+
+
+def current_budget() -> Optional[TurnBudget]:
+    return _budget.get()
+
+
+def remaining(reserve_s: float = 0.0) -> Optional[float]:
+    """Seconds left in the current turn after keeping reserve_s back; None outside a turn."""
+    budget = _budget.get()
+    return None if budget is None else budget.remaining() - reserve_s
+
+
+@contextmanager
+def turn_deadline(seconds: Optional[float]) -> Iterator[Optional[TurnBudget]]:
+    """Run the enclosed code (and tasks it starts) under a fresh budget; None = no deadline."""
+    budget = TurnBudget(time.monotonic() + seconds) if seconds else None
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+def without_deadline():
+    """For work that continues after the turn has answered (tasks copy the context at creation)."""
+    return turn_deadline(None)
+
+
+def exclude(started: float, ended: float) -> None:
+    """Do not count [started, ended] (time.monotonic()) against the current turn, if any."""
+    budget = _budget.get()
+    if budget is not None:
+        budget.exclude(started, ended)
+
+
+def degrade(component: str, reason: str) -> None:
+    """Record that component answered with its degraded fallback in the current turn."""
+    budget = _budget.get()
+    if budget is not None:
+        budget.degraded.append(component)
+    telemetry.incr(f"degraded.{component}")
+    telemetry.record("degraded", component=component, reason=reason)
+
+
+async def within_budget(
+    aw: Awaitable[T], component: str, fallback: Callable[[], T], reserve_s: float = 0.0
+) -> T:
+    """
+    Await aw within the turn's remaining budget minus reserve_s; once that runs out, aw is
+    cancelled and fallback() is returned instead. Without a turn budget, just awaits aw.
+    Exceptions from aw propagate unchanged.
+    """
+    left = remaining(reserve_s)
+    if left is None:
+        return await aw
+    if left <= 0:
+        if asyncio.iscoroutine(aw):
+            aw.close()
+        degrade(component, "exhausted")
+        return fallback()
+    task = asyncio.ensure_future(aw)
+    try:
+        while left > 0:
+            done, _ = await asyncio.wait({task}, timeout=left)
+            if task in done:
+                return task.result()
+            left = remaining(reserve_s)  # the deadline may have been pushed back meanwhile
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    task.cancel()
+    degrade(component, "timeout")
+    return fallback()
@@ -1,31 +1,27 @@
-"""LiteLLM wrapper with task-type model routing and retry logic."""
+"""LiteLLM wrapper with task-type model routing and retry logic (LiteLLM is imported on first call)."""
 
 import asyncio
-from typing import Any, Literal
-
-import litellm
+import time
+from typing import Any, AsyncIterator, Literal, Optional
 
 from config import (
     GROQ_API_KEY,
     MODELS,
     LLM_MAX_RETRIES,
     LLM_RETRY_DELAYS,
-    REASONING_EFFORT,
 )
+from models import deadline, providers, telemetry
+from models.policy import CallPlan, reasoning_policy
+from models.ratelimit import RateLimiter
 
 # Task types map to model keys in config
 TaskType = Literal["conversation", "extraction", "classification", "spec"]
 
 
-async def llm_call(
-    task_type: TaskType,
-    messages: list[dict[str, str]],
-    **kwargs: Any,
-) -> str:
-    """
-    Call LLM with task-type routing. Uses Groq models via LiteLLM.
-    Retries with exponential backoff on failure.
-    """
+def _prepare_call(
+    task_type: TaskType, call_site: Optional[str], kwargs: dict[str, Any]
+) -> tuple[str, str, dict[str, Any], Optional[CallPlan]]:
+    """Resolve model, API key and LiteLLM params (reasoning policy + caller kwargs)."""
     model = MODELS.get(task_type, MODELS["conversation"])
     api_key = GROQ_API_KEY
 
@@ -33,29 +29,234 @@ async def llm_call(
         raise ValueError("GROQ_API_KEY not set. Add it to .env or environment.")
 
     extra: dict[str, Any] = {}
+    plan = None
     if task_type == "conversation" and "gpt-oss" in model:
+        plan = reasoning_policy.plan(call_site)
         # reasoning_effort is Groq-specific; allow it past LiteLLM's OpenAI param validator
-        extra["reasoning_effort"] = REASONING_EFFORT
+        extra["reasoning_effort"] = plan.reasoning_effort
         extra["allowed_openai_params"] = ["reasoning_effort"]
+        if plan.max_tokens is not None and "max_tokens" not in kwargs:
+            extra["max_tokens"] = plan.max_tokens
+    extra.update(kwargs)
+    return model, api_key, extra, plan
+
+
+_json_mode_support: dict[str, bool] = {}
+
+# Process-wide request budget (e.g. for batch runs); None = unlimited
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def set_rate_limit(per_minute: Optional[float], burst: int = 1) -> None:
+    """Cap LLM requests (every attempt, all task types) per minute across the process; None removes the cap."""
+    global _rate_limiter
+    _rate_limiter = RateLimiter(per_minute, burst) if per_minute else None
+
+
+async def _await_rate_limit() -> None:
+    """Wait for a request slot; the wait does not count against the turn deadline."""
+    if _rate_limiter is not None:
+        started = time.monotonic()
+        await _rate_limiter.acquire()
+        deadline.exclude(started, time.monotonic())
+
+
+def _retry_fits(attempt: int) -> bool:
+    """True if another attempt is allowed and its backoff ends before the turn deadline."""
+    if attempt >= LLM_MAX_RETRIES - 1:
+        return False
+    left = deadline.remaining()
+    if left is not None and left <= LLM_RETRY_DELAYS[attempt]:
+        telemetry.incr("llm_call.retry_skipped_deadline")
+        return False
+    return True
+
+
+def supports_json_mode(task_type: TaskType) -> bool:
+    """True if the model routed for task_type accepts response_format (JSON mode)."""
+    model = MODELS.get(task_type, MODELS["conversation"])
+    if model not in _json_mode_support:
+        try:
+            params = providers.litellm().get_supported_openai_params(model=model) or []
+        except Exception:
+            params = []
+        _json_mode_support[model] = "response_format" in params
+    return _json_mode_support[model]
+
+
+async def llm_call(
+    task_type: TaskType,
+    messages: list[dict[str, str]],
+    call_site: Optional[str] = None,
+    **kwargs: Any,
+) -> str:
+    """
+    Call LLM with task-type routing. Uses Groq models via LiteLLM.
+    Retries with exponential backoff on failure, unless the backoff would overrun the
+    current turn deadline (models/deadline.py).
+    call_site (e.g. "discovery_question", "argue_back") selects the adaptive reasoning
+    policy for the conversation model; explicit kwargs still win. Every call is
+    recorded in telemetry as an "llm_call" event.
+    """
+    model, api_key, extra, plan = _prepare_call(task_type, call_site, kwargs)
 
     last_error: Exception | None = None
+    started = time.monotonic()
     for attempt in range(LLM_MAX_RETRIES):
+        truncated = False
         try:
-            response = await litellm.acompletion(
+            await _await_rate_limit()
+            attempt_started = time.monotonic()
+            response = await providers.litellm().acompletion(
                 model=model,
                 messages=messages,
                 api_key=api_key,
                 **extra,
-                **kwargs,
             )
             choice = response.choices[0]
+            truncated = getattr(choice, "finish_reason", None) == "length"
             if choice.message.content is None:
                 raise ValueError("LLM returned empty content")
+            # Model latency of this attempt only: no earlier failures, backoff or rate-limit wait
+            latency = time.monotonic() - attempt_started
+            if plan is not None:
+                reasoning_policy.observe_call(call_site, latency, truncated=truncated)
+            telemetry.record(
+                "llm_call",
+                task_type=task_type,
+                call_site=call_site,
+                model=model,
+                reasoning_effort=extra.get("reasoning_effort"),
+                max_tokens=extra.get("max_tokens"),
+                latency_s=round(latency, 3),
+                elapsed_s=round(time.monotonic() - started, 3),
+                attempts=attempt + 1,
+                truncated=truncated,
+                ok=True,
+            )
             return choice.message.content.strip()
         except Exception as e:
             last_error = e
-            if attempt < LLM_MAX_RETRIES - 1:
-                delay = LLM_RETRY_DELAYS[attempt]
-                await asyncio.sleep(delay)
+            if truncated and plan is not None:
+                # Reasoning consumed the whole budget: let the policy grow max_tokens before retrying
+                reasoning_policy.observe_call(call_site, time.monotonic() - attempt_started, truncated=True)
+                replanned = reasoning_policy.plan(call_site)
+                if replanned.max_tokens is not None and "max_tokens" not in kwargs:
+                    extra["max_tokens"] = replanned.max_tokens
+            if not _retry_fits(attempt):
+                break
+            await asyncio.sleep(LLM_RETRY_DELAYS[attempt])
 
+    telemetry.record(
+        "llm_call",
+        task_type=task_type,
+        call_site=call_site,
+        model=model,
+        reasoning_effort=extra.get("reasoning_effort"),
+        max_tokens=extra.get("max_tokens"),
+        elapsed_s=round(time.monotonic() - started, 3),
+        attempts=attempt + 1,
+        ok=False,
+        error=type(last_error).__name__ if last_error else None,
+    )
     raise last_error or RuntimeError("LLM call failed after retries")
+
+
+async def llm_stream(
+    task_type: TaskType,
+    messages: list[dict[str, str]],
+    call_site: Optional[str] = None,
+    **kwargs: Any,
+) -> AsyncIterator[str]:
+    """
+    Stream content deltas from the routed model. Same routing and policy as llm_call.
+    Retries (with backoff) only while nothing has been yielded yet; a failure after the
+    first chunk is raised to the caller, which keeps whatever it already consumed.
+    Closing the generator early (e.g. a validator aborting generation) closes the stream.
+    """
+    model, api_key, extra, plan = _prepare_call(task_type, call_site, kwargs)
+    started = time.monotonic()
+    last_error: Exception | None = None
+    for attempt in range(LLM_MAX_RETRIES):
+        yielded = False
+        truncated = False
+        stream = None
+        try:
+            await _await_rate_limit()
+            attempt_started = time.monotonic()
+            stream = await providers.litellm().acompletion(
+                model=model,
+                messages=messages,
+                api_key=api_key,
+                stream=True,
+                **extra,
+            )
+            async for chunk in stream:
+                choice = chunk.choices[0] if chunk.choices else None
+                if choice is None:
+                    continue
+                if getattr(choice, "finish_reason", None) == "length":
+                    truncated = True
+                delta = getattr(choice.delta, "content", None)
+                if delta:
+                    yielded = True
+                    yield delta
+            if not yielded:
+                raise ValueError("LLM returned empty content")
+            latency = time.monotonic() - attempt_started
+            if plan is not None:
+                reasoning_policy.observe_call(call_site, latency, truncated=truncated)
+            telemetry.record(
+                "llm_call",
+                task_type=task_type,
+                call_site=call_site,
+                model=model,
+                reasoning_effort=extra.get("reasoning_effort"),
+                max_tokens=extra.get("max_tokens"),
+                latency_s=round(latency, 3),
+                elapsed_s=round(time.monotonic() - started, 3),
+                attempts=attempt + 1,
+                truncated=truncated,
+                streamed=True,
+                ok=True,
+            )
+            return
+        except GeneratorExit:
+            # Consumer stopped early (validator abort); release the HTTP stream
+            telemetry.record(
+                "llm_call",
+                task_type=task_type,
+                call_site=call_site,
+                model=model,
+                latency_s=round(time.monotonic() - attempt_started, 3),
+                attempts=attempt + 1,
+                streamed=True,
+                aborted=True,
+                ok=True,
+            )
+            if stream is not None and hasattr(stream, "aclose"):
+                try:
+                    await stream.aclose()
+                except Exception:
+                    pass
+            raise
+        except Exception as e:
+            if yielded:
+                raise
+            last_error = e
+            if not _retry_fits(attempt):
+                break
+            await asyncio.sleep(LLM_RETRY_DELAYS[attempt])
+
+    telemetry.record(
+        "llm_call",
+        task_type=task_type,
+        call_site=call_site,
+        model=model,
+        elapsed_s=round(time.monotonic() - started, 3),
+        attempts=attempt + 1,
+        streamed=True,
+        ok=False,
+        error=type(last_error).__name__ if last_error else None,
+    )
+    raise last_error or RuntimeError("LLM stream failed after retries")
@@ -0,0 +1,162 @@
+"""Adaptive reasoning-effort / max-tokens policy for conversation-model call sites."""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from statistics import median
+from typing import Optional
+
+from config import (
+    CALL_SITE_POLICIES,
+    POLICY_DECAY_S,
+    POLICY_DEESCALATE_FAILURE_RATE,
+    POLICY_ESCALATE_FAILURE_RATE,
+    POLICY_MAX_TOKENS_CAP,
+    POLICY_MIN_SAMPLES,
+    REASONING_EFFORT,
+)
+from models import telemetry
+
+EFFORT_LEVELS = ("low", "medium", "high")
+
+
+@dataclass
+class CallPlan:
+    """Parameters chosen for one call."""
+
+    call_site: Optional[str]
+    reasoning_effort: str
+    max_tokens: Optional[int] = None
+
+
+@dataclass
+class _SiteState:
+    effort: str
+    max_tokens: Optional[int]
+    target_latency_s: Optional[float]
+    base_effort: str = ""  # configured effort, which adapted settings decay back to
+    changed_at: float = 0.0  # time.monotonic() of the last effort change
+    latencies: deque = field(default_factory=lambda: deque(maxlen=POLICY_MIN_SAMPLES * 2))
+    outcomes: deque = field(default_factory=lambda: deque(maxlen=POLICY_MIN_SAMPLES * 2))
+
+
+class ReasoningPolicy:
+    """
+    Picks reasoning_effort and max_tokens per call site, starting from CALL_SITE_POLICIES.
+    Adapts one effort level at a time once POLICY_MIN_SAMPLES observations exist:
+    quality failures (validator retries, truncations) push effort up; calls slower than
+    the site's target latency with few failures push it down. Truncated replies grow
+    max_tokens up to POLICY_MAX_TOKENS_CAP. The policy is shared by every session, so an
+    adapted effort steps back toward the configured one after POLICY_DECAY_S without a
+    change (a slow stretch at the provider does not lower effort until restart).
+    """
+
+    def __init__(self, policies: Optional[dict] = None):
+        self._policies = CALL_SITE_POLICIES if policies is None else policies
+        self._sites: dict[str, _SiteState] = {}
+
+    def _site(self, call_site: str) -> _SiteState:
+        site = self._sites.get(call_site)
+        if site is None:
+            base = self._policies.get(call_site, {})
+            effort = base.get("reasoning_effort", REASONING_EFFORT)
+            site = _SiteState(
+                effort=effort,
+                max_tokens=base.get("max_tokens"),
+                target_latency_s=base.get("target_latency_s"),
+                base_effort=effort,
+            )
+            self._sites[call_site] = site
+        return site
+
+    def plan(self, call_site: Optional[str]) -> CallPlan:
+        """Current parameters for a call site (global defaults when call_site is None)."""
+        if call_site is None:
+            return CallPlan(call_site=None, reasoning_effort=REASONING_EFFORT)
+        site = self._site(call_site)
+        self._decay(call_site, site)
+        return CallPlan(call_site=call_site, reasoning_effort=site.effort, max_tokens=site.max_tokens)
+
+    def observe_call(self, call_site: Optional[str], latency_s: float, truncated: bool = False) -> None:
+        """Record a completed call's latency; truncation counts as a quality failure."""
+        if call_site is None:
+            return
+        site = self._site(call_site)
+        site.latencies.append(latency_s)
+        if truncated:
+            if site.max_tokens is not None:
+                grown = min(int(site.max_tokens * 1.5), POLICY_MAX_TOKENS_CAP)
+                if grown != site.max_tokens:
+                    telemetry.record("policy.max_tokens", call_site=call_site, old=site.max_tokens, new=grown)
+                    site.max_tokens = grown
+            self.observe_quality(call_site, ok=False)
+            return
+        self._adapt(call_site, site)
+
+    def observe_quality(self, call_site: Optional[str], ok: bool) -> None:
+        """Record whether the reply passed downstream validation."""
+        if call_site is None:
+            return
+        site = self._site(call_site)
+        site.outcomes.append(ok)
+        self._adapt(call_site, site)
+
+    def _adapt(self, call_site: str, site: _SiteState) -> None:
+        if len(site.outcomes) < POLICY_MIN_SAMPLES and len(site.latencies) < POLICY_MIN_SAMPLES:
+            return
+        failures = sum(1 for ok in site.outcomes if not ok)
+        failure_rate = failures / len(site.outcomes) if site.outcomes else 0.0
+        level = EFFORT_LEVELS.index(site.effort) if site.effort in EFFORT_LEVELS else 1
+        new_level = level
+        if len(site.outcomes) >= POLICY_MIN_SAMPLES and failure_rate >= POLICY_ESCALATE_FAILURE_RATE:
+            new_level = min(level + 1, len(EFFORT_LEVELS) - 1)
+        elif (
+            site.target_latency_s is not None
+            and len(site.latencies) >= POLICY_MIN_SAMPLES
+            and median(site.latencies) > site.target_latency_s
+            and failure_rate <= POLICY_DEESCALATE_FAILURE_RATE
+        ):
+            new_level = max(level - 1, 0)
+        if new_level == level:
+            return
+        self._set_effort(
+            call_site,
+            site,
+            EFFORT_LEVELS[new_level],
+            failure_rate=round(failure_rate, 3),
+            median_latency_s=round(median(site.latencies), 3) if site.latencies else None,
+        )
+
+    def _decay(self, call_site: str, site: _SiteState) -> None:
+        """One level back toward the configured effort once POLICY_DECAY_S passed without a change."""
+        if site.effort == site.base_effort or {site.effort, site.base_effort} - set(EFFORT_LEVELS):
+            return
+        if time.monotonic() - site.changed_at < POLICY_DECAY_S:
+            return
+        level = EFFORT_LEVELS.index(site.effort)
+        step = 1 if EFFORT_LEVELS.index(site.base_effort) > level else -1
+        self._set_effort(call_site, site, EFFORT_LEVELS[level + step], reason="decay")
+
+    def _set_effort(self, call_site: str, site: _SiteState, effort: str, **details) -> None:
+        telemetry.record("policy.effort", call_site=call_site, old=site.effort, new=effort, **details)
+        site.effort = effort
+        site.changed_at = time.monotonic()
+        # Start a fresh window so the next decision reflects the new setting
+        site.latencies.clear()
+        site.outcomes.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        """Current per-site settings (for logs and reports)."""
+        return {
+            name: {"reasoning_effort": s.effort, "max_tokens": s.max_tokens}
+            for name, s in self._sites.items()
+        }
+
+
+reasoning_policy = ReasoningPolicy()
+
+
+def record_quality(call_site: str, ok: bool) -> None:
+    """Report a call site's output quality (e.g. a validator forced a retry) to the shared policy."""
+    telemetry.incr(f"quality.{call_site}.{'ok' if ok else 'fail'}")
+    reasoning_policy.observe_quality(call_site, ok)
@@ -0,0 +1,64 @@
+"""Lazy loading of heavy third-party providers.
+
+LiteLLM alone takes seconds to import, and DuckDuckGo search and httpx add more; none of
+them is needed until the first LLM call, search or page fetch. Modules reach them
+through the accessors here instead of importing them at module level, so importing the
+app, the API or the eval runner stays fast. Each provider is imported once (the import
+time is recorded in telemetry as "provider_load"); servers can call preload() in the
+background right after startup so the first founder does not pay for it.
+import_bench.py checks that the entry points do not import these modules eagerly.
+"""
+
+import importlib
+import time
+import warnings
+from types import ModuleType
+
+from models import telemetry
+
+# Provider name -> module imported on first use
+PROVIDERS = {
+    "litellm": "litellm",
+    "ddgs": "duckduckgo_search",
+    "httpx": "httpx",
+}
+
+_loaded: dict[str, ModuleType] = {}
+
+# Suppress the package-rename deprecation warning emitted by duckduckgo_search
+# (it was renamed to 'ddgs', but ddgs requires Python 3.10+ and this project
+# targets Python 3.9, so we stay on duckduckgo_search for now).
+warnings.filterwarnings("ignore", message=r".*has been renamed.*ddgs.*", category=RuntimeWarning)
+
+
+def load(name: str) -> ModuleType:
+    """The provider's module, importing it on first use."""
+    module = _loaded.get(name)
+    if module is None:
+        started = time.perf_counter()
+        module = importlib.import_module(PROVIDERS[name])
+        _loaded[name] = module
+        telemetry.record("provider_load", provider=name, import_s=round(time.perf_counter() - started, 3))
+    return module
+
+
+def litellm() -> ModuleType:
+    return load("litellm")
+
+
+def httpx() -> ModuleType:
+    return load("httpx")
+
+
+def ddgs():
+    """A new DuckDuckGo search client (duckduckgo_search.DDGS)."""
+    return load("ddgs").DDGS()
+
+
+def preload(names: tuple[str, ...] = tuple(PROVIDERS)) -> None:
+    """Import providers now (call from a worker thread at server startup to warm them)."""
+    for name in names:
+        try:
+            load(name)
+        except ImportError:
+            telemetry.incr(f"provider_load.missing.{name}")
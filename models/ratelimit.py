@@ -0,0 +1,29 @@
+"""Async token-bucket rate limiter for LLM requests (shared by all concurrent sessions)."""
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Allow at most per_minute acquisitions per rolling minute, with bursts up to `burst`."""
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0  # tokens per second
+        self.capacity = float(max(burst, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may start. Waiters are served in arrival order."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
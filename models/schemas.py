@@ -30,6 +30,7 @@ class Feature(BaseModel):
     rice_effort: Optional[float] = None
     rice_score: Optional[float] = None
     phase: int = 1
+    depends_on: list[str] = Field(default_factory=list)  # names of features that must ship first
 
 
 class CutFeature(BaseModel):
@@ -69,6 +70,15 @@ class ScopingOutput(BaseModel):
     implementation_phases: list[ImplementationPhase] = Field(default_factory=list)
 
 
+class SpecVersion(BaseModel):
+    """One entry in the spec's version history."""
+
+    version: int
+    markdown: str
+    change_request: Optional[str] = None  # None for the initially generated spec
+    sections_changed: list[str] = Field(default_factory=list)
+
+
 class ConversationState(BaseModel):
     """Full conversation state across phases."""
 
@@ -80,5 +90,11 @@ class ConversationState(BaseModel):
     negotiation_rounds: int = 0
     max_negotiation_rounds: int = 3
     spec_markdown: Optional[str] = None
+    spec_versions: list[SpecVersion] = Field(default_factory=list)  # every version, latest last
+    # Phases the founder set explicitly during negotiation; the phase planner keeps them
+    pinned_phases: dict[str, int] = Field(default_factory=dict)
     scope_agreed: bool = False
     awaiting_scope_agreement: bool = False
+    # Rolling summary of messages[:history_summary_upto], used when history exceeds the context budget
+    history_summary: Optional[str] = None
+    history_summary_upto: int = 0
@@ -0,0 +1,50 @@
+"""In-process telemetry: counters and a ring buffer of recent events (LLM calls, pipeline decisions)."""
+
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Any, Optional
+
+from config import TELEMETRY_MAX_EVENTS
+
+logger = logging.getLogger("vibe_pm.telemetry")
+
+_counters: dict[str, int] = defaultdict(int)
+_events: deque = deque(maxlen=TELEMETRY_MAX_EVENTS)
+
+
+def incr(name: str, n: int = 1) -> None:
+    """Increment a named counter."""
+    _counters[name] += n
+
+
+def record(event: str, **fields: Any) -> None:
+    """Record a structured event and bump its counter. Also logged at DEBUG."""
+    entry = {"event": event, "ts": time.time(), **fields}
+    _events.append(entry)
+    _counters[event] += 1
+    logger.debug("%s %s", event, fields)
+
+
+def counters(prefix: str = "") -> dict[str, int]:
+    """Snapshot of counters, optionally filtered by name prefix."""
+    return {k: v for k, v in _counters.items() if k.startswith(prefix)}
+
+
+def events(event: Optional[str] = None) -> list[dict]:
+    """Recent events, optionally filtered by event name."""
+    return [e for e in _events if event is None or e["event"] == event]
+
+
+def rate(numerator: str, denominator: str) -> Optional[float]:
+    """Ratio of two counters, or None when the denominator is zero."""
+    total = _counters.get(denominator, 0)
+    if not total:
+        return None
+    return _counters.get(numerator, 0) / total
+
+
+def reset() -> None:
+    """Clear all counters and events (e.g. between eval scenarios)."""
+    _counters.clear()
+    _events.clear()
@@ -1,12 +1,33 @@
 """Orchestrator: phase manager, handoff messages, skip prevention. Routes Discovery -> Scoping -> Spec -> Done."""
 
+import asyncio
+import time
 from typing import Awaitable, Callable, Optional
 
-from models.schemas import ConversationState
+from config import (
+    SPEC_GENERATION_MODE,
+    SPEC_POLISH_SECTIONS,
+    SPECULATION_ENABLED,
+    SPECULATION_MAX_PER_SESSION,
+    SPECULATIVE_SPEC,
+    TURN_DEADLINE_S,
+)
+from models import telemetry
+from models.deadline import turn_deadline, within_budget, without_deadline
+from models.schemas import ConversationState, DiscoverySummary
 from agents.discovery import DiscoveryAgent
 from agents.scoping import ScopingAgent
-from agents.spec_writer import SpecWriterAgent
+from agents.spec_writer import SpecWriterAgent, record_spec_version
+from speculation import Speculation, SpeculationBudget
+from tools.idea_index import idea_index
+from tools.spec_renderer import render_spec
+
 
+WELCOME_MESSAGE = (
+    "Hi! I'm your AI PM. Tell me your product idea in a sentence or two, and I'll ask a few "
+    "questions to understand the problem, scope an MVP, and then write you a product spec you "
+    "can hand to a developer or code-gen tool."
+)
 
 HANDOFF_MESSAGES = {
     "discovery_to_scoping": (
@@ -50,6 +71,16 @@ class Orchestrator:
     Sequential phase manager: Discovery -> Scoping -> Spec -> Done.
     Explicit handoff messages at each transition. Skip prevention when user tries to jump ahead.
     step_callback(name) shows "work in progress" in the UI.
+    While the discovery summary awaits confirmation, the initial scoping proposal is
+    generated speculatively on a copy of state: committed on CONFIRM, cancelled on REVISE.
+    Likewise, while scope agreement is pending the spec is pre-generated from the current
+    ScopingOutput and served on AGREE if the scope has not changed since; after a PUSHBACK
+    reply it is restarted once that reply's scope patch has been applied.
+    In template mode the spec is rendered instantly and spec_polish (when set) is a
+    background task that swaps LLM-polished narrative sections into state.spec_markdown.
+    Once done, messages that ask for changes revise the affected spec sections.
+    Each founder turn runs under TURN_DEADLINE_S (models/deadline.py); background work
+    (speculation, polish) is started outside it.
     """
 
     def __init__(self):
@@ -57,6 +88,154 @@ class Orchestrator:
         self.discovery_agent = DiscoveryAgent()
         self.scoping_agent = ScopingAgent()
         self.spec_writer_agent = SpecWriterAgent()
+        self.speculation_budget = SpeculationBudget(SPECULATION_MAX_PER_SESSION)
+        self._speculations: dict[str, Speculation] = {}
+        self.spec_polish: Optional[asyncio.Task] = None
+        self._idea_id: Optional[str] = None  # this session's entry in the similar-idea index
+
+    def _speculate(
+        self, kind: str, key: str, start: Callable[[ConversationState], Awaitable]
+    ) -> None:
+        """
+        Start start(snapshot) in the background on a deep copy of state, unless a
+        speculation of this kind with the same key is already running. A running one
+        with a different key is stale and is cancelled first.
+        """
+        if not SPECULATION_ENABLED:
+            return
+        running = self._speculations.get(kind)
+        if running is not None:
+            if running.matches(key):
+                return
+            self._cancel_speculation(kind)
+        if not self.speculation_budget.try_acquire(kind):
+            return
+        snapshot = self.state.model_copy(deep=True)
+        with without_deadline():
+            self._speculations[kind] = Speculation(kind, key, start(snapshot))
+
+    def _cancel_speculation(self, kind: str) -> None:
+        speculation = self._speculations.pop(kind, None)
+        if speculation is not None:
+            speculation.cancel()
+
+    async def _take_speculation(self, kind: str, key: str):
+        """Result of the speculation of this kind if it was computed from `key`, else None."""
+        speculation = self._speculations.pop(kind, None)
+        if speculation is None:
+            return None
+        return await speculation.commit(key)
+
+    @staticmethod
+    def _proposal_key(state: ConversationState) -> str:
+        """Inputs the initial proposal depends on: the confirmed discovery summary."""
+        return state.discovery_summary.model_dump_json()
+
+    @staticmethod
+    def _spec_key(state: ConversationState) -> str:
+        """Inputs the spec depends on: discovery summary + current scoping output."""
+        scope = state.scoping_output.model_dump_json() if state.scoping_output else ""
+        return state.discovery_summary.model_dump_json() + "\n" + scope
+
+    def _speculate_proposal(self) -> None:
+        """Generate the initial scoping proposal while the founder reads the discovery summary."""
+
+        def start(snapshot: ConversationState):
+            snapshot.phase = "scoping"
+            return self.scoping_agent._generate_initial_proposal(snapshot)
+
+        self._speculate("scoping_proposal", self._proposal_key(self.state), start)
+
+    def _speculate_spec(self) -> None:
+        """Pre-generate the spec from the current scope while agreement is pending."""
+        if not SPECULATIVE_SPEC or self.state.scoping_output is None:
+            return
+        if SPEC_GENERATION_MODE == "template":
+            return  # rendering is instant; nothing to hide
+        if not self.state.awaiting_scope_agreement:
+            return
+        self._speculate("spec", self._spec_key(self.state), self.spec_writer_agent._generate_spec)
+
+    async def _enter_scoping(self) -> str:
+        """Initial scoping proposal: commit the speculative result if valid, else run it now."""
+        result = await self._take_speculation("scoping_proposal", self._proposal_key(self.state))
+        if result is not None:
+            reply, speculative_state = result
+            self.state.messages.append({"role": "assistant", "content": reply})
+            self.state.scoping_output = speculative_state.scoping_output
+            self.state.awaiting_scope_agreement = True
+            return reply
+        reply, self.state = await self.scoping_agent.handle_message(self.state, "")
+        return reply
+
+    async def _enter_spec(self) -> str:
+        """Spec generation: serve the pre-generated spec if the scope is unchanged, else generate now."""
+        await self.scoping_agent.wait_for_patch()
+        spec_md = await within_budget(
+            self._take_speculation("spec", self._spec_key(self.state)),
+            "spec",
+            lambda: render_spec(self.state.discovery_summary, self.state.scoping_output),
+        )
+        if spec_md is not None:
+            spec_response = self.spec_writer_agent.finish(self.state, spec_md)
+        else:
+            spec_response, self.state = await self.spec_writer_agent.handle_message(self.state, "")
+            self._start_spec_polish()
+        self._index_session()
+        return spec_response
+
+    def _index_session(self) -> None:
+        """Record (or update) this session in the similar-idea index for future founders."""
+        if not self.state.spec_markdown:
+            return
+        self._idea_id = idea_index.add(
+            self.state.discovery_summary,
+            self.state.scoping_output,
+            self.state.spec_markdown,
+            record_id=self._idea_id,
+        )
+
+    def _start_spec_polish(self) -> None:
+        """Template mode: polish the rendered spec's narrative sections in the background."""
+        if SPEC_GENERATION_MODE != "template" or not SPEC_POLISH_SECTIONS or not self.state.spec_markdown:
+            return
+        with without_deadline():
+            self.spec_polish = asyncio.ensure_future(self._polish_spec(self.state.spec_markdown))
+
+    async def _polish_spec(self, rendered: str) -> Optional[str]:
+        """Swap the polished spec into state; None if nothing changed or the spec was replaced meanwhile."""
+        polished = await self.spec_writer_agent.polish_spec(
+            self.state.discovery_summary, self.state.scoping_output, rendered
+        )
+        if polished == rendered or self.state.spec_markdown != rendered:
+            return None
+        record_spec_version(self.state, polished, "LLM polish", list(SPEC_POLISH_SECTIONS))
+        self._index_session()
+        return polished
+
+    async def start_from_summary(self, summary: DiscoverySummary, idea: Optional[str] = None) -> str:
+        """
+        Headless entry (batch runs): skip discovery with a pre-filled summary and return
+        the initial scoping proposal. idea, if given, is recorded as the founder's opening turn.
+        """
+        self.state.discovery_summary = summary
+        self.state.discovery_summary_shown = True
+        if idea:
+            self.state.messages.append({"role": "user", "content": idea})
+        self.state.phase = "scoping"
+        reply = await self._enter_scoping()
+        self._speculate_spec()
+        return reply
+
+    async def accept_scope(self) -> str:
+        """Headless entry: agree to the current scope without a founder turn and write the spec."""
+        if self.state.phase == "scoping":
+            self.state.scope_agreed = True
+            self.state.awaiting_scope_agreement = False
+            self.state.phase = "spec"
+        if self.state.phase != "spec":
+            return ""
+        return await self._enter_spec()
 
     async def handle_message(
         self,
@@ -66,7 +245,25 @@ class Orchestrator:
         """
         Route to active agent. On phase transition, show handoff message and trigger next agent.
         If user tries to skip steps, return skip-prevention message.
+        Runs under the per-turn deadline; components past it answer with degraded fallbacks.
         """
+        started = time.monotonic()
+        phase = self.state.phase
+        with turn_deadline(TURN_DEADLINE_S) as budget:
+            result = await self._route(user_message, step_callback)
+        telemetry.record(
+            "turn",
+            phase=phase,
+            latency_s=round(time.monotonic() - started, 3),
+            degraded=list(budget.degraded) if budget is not None else [],
+        )
+        return result
+
+    async def _route(
+        self,
+        user_message: str,
+        step_callback: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> tuple[str, ConversationState]:
         state = self.state
         phase = state.phase
 
@@ -80,11 +277,15 @@ class Orchestrator:
                 if step_callback:
                     await step_callback("Researching comparable products and preparing scope…")
                 handoff = HANDOFF_MESSAGES["discovery_to_scoping"]
-                scoping_response, new_state = await self.scoping_agent.handle_message(
-                    self.state, ""
-                )
-                self.state = new_state
+                scoping_response = await self._enter_scoping()
+                self._speculate_spec()
                 return f"{handoff}\n\n---\n\n{scoping_response}", self.state
+            if new_state.discovery_summary_shown:
+                # Founder is reading the summary; most confirm, so start scoping now
+                self._speculate_proposal()
+            else:
+                # Summary revised (or not shown yet): any speculative proposal is stale
+                self._cancel_speculation("scoping_proposal")
             return response, self.state
 
         if phase == "scoping":
@@ -94,11 +295,15 @@ class Orchestrator:
                 if step_callback:
                     await step_callback("Writing your phased product spec…")
                 handoff = HANDOFF_MESSAGES["scoping_to_spec"]
-                spec_response, new_state = await self.spec_writer_agent.handle_message(
-                    self.state, ""
-                )
-                self.state = new_state
+                spec_response = await self._enter_spec()
                 return f"{handoff}\n\n---\n\n{spec_response}", self.state
+            # Still negotiating: keep a spec for the current scope ready (restarted if it
+            # changed), once this reply's scope patch has landed
+            pending = self.scoping_agent.pending_patch
+            if pending is None:
+                self._speculate_spec()
+            else:
+                pending.add_done_callback(lambda _: self._speculate_spec())
             return response, self.state
 
         if phase == "spec":
@@ -106,7 +311,14 @@ class Orchestrator:
             self.state = new_state
             return response, self.state
 
+        # Done: edit requests revise only the affected spec sections
+        if state.spec_markdown:
+            response = await self.spec_writer_agent.revise_spec(state, user_message)
+            if response is not None:
+                return response, self.state
+
         return (
-            "We're done! You can download your spec below or start a new conversation.",
+            "We're done! You can download your spec below, ask me to change any part of it, "
+            "or start a new conversation.",
             self.state,
         )
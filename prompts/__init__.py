@@ -8,6 +8,7 @@ from prompts.extraction import (
     EXTRACTION_SCOPING_PROMPT,
     CLASSIFY_DISCOVERY_REVIEW_PROMPT,
     CLASSIFY_SCOPING_INTENT_PROMPT,
+    HISTORY_SUMMARY_PROMPT,
 )
 
 __all__ = [
@@ -18,4 +19,5 @@ __all__ = [
     "EXTRACTION_SCOPING_PROMPT",
     "CLASSIFY_DISCOVERY_REVIEW_PROMPT",
     "CLASSIFY_SCOPING_INTENT_PROMPT",
+    "HISTORY_SUMMARY_PROMPT",
 ]
@@ -61,3 +61,16 @@ Respond naturally to what they said. If they greeted you, greet them back briefl
 
 # Used when discovery completeness check passes — generate summary for user confirmation before handoff to scoping.
 DISCOVERY_SUMMARY_PROMPT = """Based on everything discussed in this discovery conversation, generate a concise summary of what you learned. Organize by: Target User, Core Problem, Current Alternatives, Why Now, Feature Vision, Success Metrics, Revenue Model, Constraints. Be factual — only include what the user actually said. Use short paragraphs or bullet points in plain language (no markdown tables). End with exactly: 'Does this capture everything correctly? If so, I will hand this off to scoping.'"""
+
+# Degraded mode (turn deadline reached): templated question for the first remaining gap.
+DISCOVERY_GAP_QUESTIONS = {
+    "target_user": "Who exactly would use this? Describe the person who feels this problem most.",
+    "core_problem": "What's the main problem they have today, and how painful is it for them?",
+    "current_alternatives": "How do they deal with this problem today — what tools or workarounds do they use?",
+    "why_now": "Why is now the right time for this? Has something changed recently?",
+    "feature_wishlist": "What are the few things the product absolutely has to do on day one?",
+    "success_metric": "How will you know it's working — what number would you look at in three months?",
+    "revenue_model": "How do you expect this to make money?",
+    "constraints": "What constraints are you working with — timeline, budget, team or technical limits?",
+}
+DISCOVERY_FALLBACK_QUESTION = "Is there anything else about the idea you'd like me to know before we move on?"
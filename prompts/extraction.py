@@ -20,10 +20,9 @@ Conversation:
 
 JSON:"""
 
-EXTRACTION_SCOPING_PROMPT = """Extract structured scoping output from the proposal below. Output valid JSON only, no other text. Use this exact schema:
-
-{
-  "mvp_features": [{"name": string, "description": string, "priority": "P0" or "P1" or "P2", "phase": 1 or 2 or 3, "rice_reach": number or null, "rice_impact": number or null, "rice_confidence": number or null, "rice_effort": number or null, "rice_score": number or null}],
+# Shared by the 8B extraction prompt and the single-call scoping proposal (prompts/scoping.py)
+SCOPING_OUTPUT_SCHEMA = """{
+  "mvp_features": [{"name": string, "description": string, "priority": "P0" or "P1" or "P2", "phase": 1 or 2 or 3, "rice_reach": number or null, "rice_impact": number or null, "rice_confidence": number or null, "rice_effort": number or null, "rice_score": number or null, "depends_on": [string]}],
   "cut_features": [{"name": string, "reason_cut": string}],
   "comparable_products": [{"name": string, "url": string or null, "relevance": string}],
   "core_user_flow": string or null,
@@ -34,7 +33,36 @@ EXTRACTION_SCOPING_PROMPT = """Extract structured scoping output from the propos
 
 key_screens: list of 3-5 strings, each a screen name and one-line description. Extract from the proposal; if none mentioned use [].
 implementation_phases: list of 3 phases (Phase 1: Core MVP, Phase 2: Essential Additions, Phase 3: Growth & Polish). Each has phase_number, name, goal, estimated_weeks (e.g. "1-2 weeks"), and features (list of feature names). If not clearly stated, infer from the proposal.
-mvp_features: include phase (1/2/3) and RICE fields when present; use null for missing RICE values.
+mvp_features: include phase (1/2/3) and RICE fields when present; use null for missing RICE values. depends_on: names of other mvp_features this one cannot ship without (e.g. payments depends on accounts); [] if none."""
+
+# Per-field schema lines for narrowed extraction (EXTRACTION_DISCOVERY_FIELDS_PROMPT)
+DISCOVERY_FIELD_SCHEMA = {
+    "target_user": '"target_user": string or null',
+    "core_problem": '"core_problem": string or null',
+    "current_alternatives": '"current_alternatives": list of strings',
+    "why_now": '"why_now": string or null',
+    "feature_wishlist": '"feature_wishlist": list of strings',
+    "success_metric": '"success_metric": string or null',
+    "revenue_model": '"revenue_model": string or null',
+    "constraints": '"constraints": string or null',
+}
+
+EXTRACTION_DISCOVERY_FIELDS_PROMPT = """Extract only the requested discovery fields from the latest exchange below (the PM's question and the founder's answer). Output valid JSON only, no other text. Use this exact schema — use null for missing fields and [] for empty lists:
+
+{
+{fields_schema}
+}
+
+Exchange:
+---
+{conversation}
+---
+
+JSON:"""
+
+EXTRACTION_SCOPING_PROMPT = """Extract structured scoping output from the proposal below. Output valid JSON only, no other text. Use this exact schema:
+
+""" + SCOPING_OUTPUT_SCHEMA + """
 
 Proposal text:
 ---
@@ -69,3 +97,62 @@ User response:
 ---
 
 One word:"""
+
+EXTRACTION_SCOPE_PATCH_PROMPT = """A PM and a founder are negotiating an MVP scope. Below is the current agreed-so-far scope and the latest exchange. Output ONLY the changes the PM's latest reply commits to, as a JSON object:
+
+{
+  "add": [{"name": string, "description": string, "priority": "P0" or "P1" or "P2", "phase": 1 or 2 or 3}],
+  "remove": [{"name": string, "reason": string}],
+  "reprioritize": [{"name": string, "priority": "P0" or "P1" or "P2", "phase": 1 or 2 or 3 or null}]
+}
+
+Rules:
+- add: features the PM agrees to include (including previously cut features being brought back).
+- remove: MVP features the PM now cuts; reason is one line.
+- reprioritize: existing features whose priority or phase the PM changes.
+- Use the exact feature names from the current scope when referring to existing features.
+- If the PM holds firm and changes nothing, return {"add": [], "remove": [], "reprioritize": []}.
+
+Current scope:
+{scope}
+
+Founder:
+{user_message}
+
+PM (latest reply):
+{reply}
+
+JSON:"""
+
+CLASSIFY_SPEC_EDIT_PROMPT = """The founder has a finished product spec and sent the message below. Decide which spec sections it asks to change.
+
+Sections:
+- overview: product name, problem statement, target user persona, comparable products
+- phase_1: Phase 1 (core MVP) features, core user flow, key screens
+- phase_2: Phase 2 features and additional screens
+- phase_3: Phase 3 features
+- prioritization: cut features, RICE scoring summary
+- risks: open questions, risks, technical considerations
+
+Reply with the affected section ids, comma-separated (e.g. "phase_1, prioritization"), or NONE if the message is not a change request (thanks, a question, small talk).
+
+Message:
+---
+{user_response}
+---
+
+Sections:"""
+
+HISTORY_SUMMARY_PROMPT = """Summarize the earlier part of a product conversation between a PM and a founder so it can replace the original turns. Keep every concrete fact the founder stated (users, problems, alternatives, features, numbers, constraints, decisions, agreed or disputed scope). Drop pleasantries. Plain text, at most 200 words, no preamble.
+
+Previous summary (may be empty):
+---
+{previous_summary}
+---
+
+Turns to fold into the summary:
+---
+{conversation}
+---
+
+Summary:"""
@@ -1,5 +1,8 @@
 """System prompt for Spec Writer (documenter)."""
 
+# Bump when spec generation changes in ways the prompt texts don't show (invalidates the spec cache)
+SPEC_PROMPT_VERSION = "1"
+
 SPEC_WRITER_SYSTEM_PROMPT = """You are a product spec writer. You take discovery and scoping outputs and produce a clean, structured product spec in Markdown. You are NOT conversational — you produce a single document.
 
 Rules:
@@ -11,3 +14,66 @@ Rules:
 - No meta-commentary. Output only the Markdown document.
 - Problem statement, persona, MVP features, user flow, key screens, and open questions/risks must reflect exactly what was agreed in the conversation.
 - Include RICE scoring summary when scoping provided RICE data (Reach, Impact, Confidence, Effort, RICE score per feature)."""
+
+# Section-parallel mode: each template section is generated by its own call with the same context
+SPEC_SECTION_PROMPT = """Generate ONLY the "{section_title}" part of the product spec, following the template fragment below exactly (same headers, same order). Other sections are written separately — do not include them, and do not add an introduction or closing remarks.
+
+{section_guidance}
+
+Context:
+
+{context}
+
+Template fragment to follow:
+{section_template}
+
+Output only the Markdown for this fragment."""
+
+SPEC_SECTION_GUIDANCE = {
+    "overview": (
+        "Title, problem statement, target user persona",
+        "Name the product from the discussion. Problem and persona must reflect exactly what the founder said. List comparable products with one line each on relevance.",
+    ),
+    "phase_1": (
+        "Implementation Plan — Phase 1",
+        "Phase 1 is the core MVP: P0 features, the one core user flow step by step, and the key screens. It must be buildable without reading later phases.",
+    ),
+    "phase_2": (
+        "Phase 2",
+        "Phase 2 adds the essential P1 features and any additional screens. Do not repeat Phase 1 features.",
+    ),
+    "phase_3": (
+        "Phase 3",
+        "Phase 3 covers growth and polish (P2 features). If nothing was scoped for it, write \"TBD — needs further discovery\".",
+    ),
+    "prioritization": (
+        "Cut features and RICE scoring summary",
+        "List every cut feature with its one-line reason. Include the RICE summary only from RICE data provided in the context.",
+    ),
+    "risks": (
+        "Open questions, risks and technical considerations",
+        "Open questions and risks must come from gaps or concerns raised in discovery and scoping. Technical considerations stay high-level and follow from the constraints.",
+    ),
+}
+
+# Polish pass (template mode): the section is already rendered from structured data
+SPEC_POLISH_INSTRUCTIONS = (
+    "A deterministic draft of this section is below. Rewrite it as clear, readable prose for "
+    "a developer: keep every fact, name and number, add nothing that is not in the context, "
+    "and keep the same headers."
+)
+
+# Done-phase revision: one section rewritten to apply a founder's change request
+SPEC_REVISION_PROMPT = """Revise ONE section of a finished product spec to apply the founder's change request. Keep the same headers and structure, change only what the request requires, and keep everything else word for word. Do not add other sections, an introduction or closing remarks.
+
+Change request:
+{change_request}
+
+Context:
+
+{context}
+
+Current section:
+{section}
+
+Output only the revised Markdown for this section."""
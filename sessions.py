@@ -0,0 +1,132 @@
+"""Session store and admission control for serving many programmatic clients from one worker.
+
+SessionStore keeps one Orchestrator per session id in memory, expiring idle sessions
+after a TTL and refusing new ones beyond a cap. AdmissionController bounds how many
+turns run at once and how many may wait; past that, callers are told to retry instead
+of piling up behind the LLM rate limit.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+from models import telemetry
+from orchestrator import Orchestrator
+
+
+class Overloaded(Exception):
+    """No capacity right now; retry_after_s is a hint for the client."""
+
+    def __init__(self, message: str, retry_after_s: int = 5):
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+@dataclass
+class Session:
+    id: str
+    orchestrator: Orchestrator
+    created: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # one turn at a time per session
+
+    def touch(self) -> None:
+        self.last_used = time.monotonic()
+
+
+class SessionStore:
+    """In-memory sessions, least recently used first; idle ones expire after ttl_s."""
+
+    def __init__(self, max_sessions: int, ttl_s: float):
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self) -> Session:
+        """New session with a fresh Orchestrator. Raises Overloaded when the store is full."""
+        self.expire()
+        if len(self._sessions) >= self.max_sessions:
+            telemetry.incr("sessions.rejected")
+            raise Overloaded("session limit reached", retry_after_s=60)
+        session = Session(id=uuid.uuid4().hex, orchestrator=Orchestrator())
+        self._sessions[session.id] = session
+        telemetry.incr("sessions.created")
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if time.monotonic() - session.last_used > self.ttl_s and not session.lock.locked():
+            self._drop(session_id)
+            return None
+        session.touch()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        return self._drop(session_id)
+
+    def expire(self) -> int:
+        """Drop idle sessions past the TTL (never one mid-turn). Returns how many were dropped."""
+        now = time.monotonic()
+        stale = [
+            sid for sid, s in self._sessions.items()
+            if now - s.last_used > self.ttl_s and not s.lock.locked()
+        ]
+        for sid in stale:
+            self._drop(sid)
+        if stale:
+            telemetry.incr("sessions.expired", len(stale))
+        return len(stale)
+
+    def _drop(self, session_id: str) -> bool:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        polish = session.orchestrator.spec_polish
+        if polish is not None and not polish.done():
+            polish.cancel()
+        return True
+
+
+class AdmissionController:
+    """
+    At most max_active turns run concurrently; at most max_queued wait for a slot.
+    A turn is admit()ted up front, runs inside slot(), and gives its place back with release().
+    """
+
+    def __init__(self, max_active: int, max_queued: int):
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self._slots = asyncio.Semaphore(max_active)
+        self._admitted = 0  # running + waiting
+
+    @property
+    def admitted(self) -> int:
+        return self._admitted
+
+    def admit(self) -> None:
+        """Reserve a place (running or queued). Raises Overloaded when the queue is full."""
+        if self._admitted >= self.max_active + self.max_queued:
+            telemetry.incr("admission.rejected")
+            raise Overloaded("too many requests in flight")
+        self._admitted += 1
+        telemetry.incr("admission.admitted")
+
+    def release(self) -> None:
+        """Give back a place reserved by admit() (once per admitted turn)."""
+        self._admitted -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Run a previously admitted turn once a slot is free."""
+        async with self._slots:
+            yield
@@ -0,0 +1,81 @@
+"""Speculative execution: run likely-next work in the background while the founder reads/types.
+
+A Speculation wraps one asyncio task started on a snapshot of state, tagged with a key
+describing the inputs it was computed from. The caller later commits it (if the key still
+matches and the branch was taken) or cancels it. A per-session budget caps how many
+speculative launches each kind may make. Outcomes are counted in telemetry as
+speculation.<kind>.{launched,committed,cancelled,stale,failed}.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Optional
+
+from models import telemetry
+
+
+class Speculation:
+    """One background computation started from a snapshot of inputs identified by `key`."""
+
+    def __init__(self, kind: str, key: str, coro: Awaitable[Any]):
+        self.kind = kind
+        self.key = key
+        self.task: asyncio.Task = asyncio.ensure_future(coro)
+        telemetry.incr(f"speculation.{kind}.launched")
+
+    def matches(self, key: str) -> bool:
+        """True if the speculation was computed from the same inputs as `key`."""
+        return self.key == key
+
+    async def commit(self, key: str) -> Optional[Any]:
+        """
+        Await and return the result if `key` still matches; otherwise cancel.
+        Returns None (caller recomputes) when stale or when the background task failed.
+        """
+        if not self.matches(key):
+            self._cancel("stale")
+            return None
+        try:
+            result = await self.task
+        except asyncio.CancelledError:
+            telemetry.incr(f"speculation.{self.kind}.cancelled")
+            return None
+        except Exception:
+            telemetry.incr(f"speculation.{self.kind}.failed")
+            return None
+        telemetry.incr(f"speculation.{self.kind}.committed")
+        return result
+
+    def cancel(self) -> None:
+        """Discard the speculation (branch not taken)."""
+        self._cancel("cancelled")
+
+    def _cancel(self, outcome: str) -> None:
+        if not self.task.done():
+            self.task.cancel()
+        else:
+            # Retrieve the exception, if any, so asyncio doesn't warn it was never retrieved
+            if not self.task.cancelled():
+                self.task.exception()
+        telemetry.incr(f"speculation.{self.kind}.{outcome}")
+
+
+class SpeculationBudget:
+    """Per-session cap on speculative launches, per kind."""
+
+    def __init__(self, limits: dict[str, int]):
+        self._limits = dict(limits)
+        self._used: dict[str, int] = {}
+
+    def try_acquire(self, kind: str) -> bool:
+        """Reserve one launch of `kind`; False (and counted) once the cap is reached."""
+        used = self._used.get(kind, 0)
+        if used >= self._limits.get(kind, 0):
+            telemetry.incr(f"speculation.{kind}.over_budget")
+            return False
+        self._used[kind] = used + 1
+        return True
+
+
+def hit_rate(kind: str) -> Optional[float]:
+    """Committed / launched for a speculation kind (None before any launch)."""
+    return telemetry.rate(f"speculation.{kind}.committed", f"speculation.{kind}.launched")
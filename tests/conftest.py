@@ -0,0 +1,8 @@
+"""Make the project root importable when pytest is run from anywhere."""
+
+import sys
+from pathlib import Path
+
+_root = Path(__file__).resolve().parent.parent
+if str(_root) not in sys.path:
+    sys.path.insert(0, str(_root))
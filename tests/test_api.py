@@ -0,0 +1,136 @@
+"""API turn handling: SSE order, one turn per session (409), admission control (503)."""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import api
+from api import MessageIn
+from sessions import AdmissionController, Overloaded, SessionStore
+
+
+class _Turn:
+    """Fake Orchestrator.handle_message that reports one step and can be held open."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self, content, step_callback=None):
+        self.started.set()
+        if step_callback is not None:
+            await step_callback("Thinking")
+        await self.gate.wait()
+        return f"re: {content}", SimpleNamespace(phase="scoping", spec_markdown=None, spec_versions=[])
+
+
+def _setup(max_active: int = 1, max_queued: int = 0):
+    api.app.state.sessions = SessionStore(max_sessions=10, ttl_s=3600)
+    api.app.state.admission = AdmissionController(max_active, max_queued)
+    return api.app.state.sessions, api.app.state.admission
+
+
+def _new_session(sessions: SessionStore) -> tuple[str, _Turn]:
+    session = sessions.create()
+    turn = _Turn()
+    session.orchestrator.handle_message = turn
+    return session.id, turn
+
+
+def _events(body: str) -> list[str]:
+    return [line[len("event: "):] for line in body.splitlines() if line.startswith("event: ")]
+
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://test")
+
+
+def test_events_stream_in_order():
+    async def run():
+        sessions, admission = _setup()
+        sid, _ = _new_session(sessions)
+        async with _client() as client:
+            r = await client.post(f"/sessions/{sid}/messages", json={"content": "hi"})
+        return r, admission
+
+    r, admission = asyncio.run(run())
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    assert _events(r.text) == ["step", "message", "end"]
+    assert '"content": "re: hi"' in r.text
+    assert admission.admitted == 0
+
+
+def test_second_message_to_busy_session_gets_409_and_other_sessions_503():
+    async def run():
+        sessions, admission = _setup(max_active=1, max_queued=0)
+        sid, turn = _new_session(sessions)
+        other, _ = _new_session(sessions)
+        turn.gate.clear()
+        async with _client() as client:
+            first = asyncio.ensure_future(client.post(f"/sessions/{sid}/messages", json={"content": "one"}))
+            await asyncio.wait_for(turn.started.wait(), 5)
+            busy = await client.post(f"/sessions/{sid}/messages", json={"content": "two"})
+            overloaded = await client.post(f"/sessions/{other}/messages", json={"content": "three"})
+            turn.gate.set()
+            done = await first
+            after = await client.post(f"/sessions/{other}/messages", json={"content": "four"})
+        return busy, overloaded, done, after, admission
+
+    busy, overloaded, done, after, admission = asyncio.run(run())
+    assert busy.status_code == 409
+    assert overloaded.status_code == 503
+    assert overloaded.headers["Retry-After"]
+    assert _events(done.text) == ["step", "message", "end"]
+    assert after.status_code == 200
+    assert admission.admitted == 0
+
+
+def test_concurrent_posts_to_one_session_run_one_turn():
+    async def run():
+        sessions, _ = _setup(max_active=2, max_queued=2)
+        sid, turn = _new_session(sessions)
+        turn.gate.clear()
+        request = SimpleNamespace(app=api.app)
+        results = await asyncio.gather(
+            api.post_message(request, sid, MessageIn(content="a")),
+            api.post_message(request, sid, MessageIn(content="b")),
+            return_exceptions=True,
+        )
+        turn.gate.set()
+        return results
+
+    results = asyncio.run(run())
+    assert sum(isinstance(r, api.HTTPException) and r.status_code == 409 for r in results) == 1
+
+
+def test_reservation_released_when_stream_is_never_read():
+    async def run():
+        sessions, admission = _setup(max_active=1, max_queued=0)
+        sid, turn = _new_session(sessions)
+        request = SimpleNamespace(app=api.app)
+        response = await api.post_message(request, sid, MessageIn(content="hi"))
+        del response  # client gone before the first event
+        await asyncio.wait_for(turn.started.wait(), 5)
+        while api._turns:
+            await asyncio.sleep(0.01)
+        return sessions.get(sid), admission
+
+    session, admission = asyncio.run(run())
+    assert admission.admitted == 0
+    assert not session.lock.locked()
+    assert session.orchestrator.handle_message.started.is_set()
+
+
+def test_admission_rejects_beyond_queue():
+    admission = AdmissionController(max_active=1, max_queued=1)
+    admission.admit()
+    admission.admit()
+    with pytest.raises(Overloaded):
+        admission.admit()
+    admission.release()
+    admission.admit()
+    assert admission.admitted == 2
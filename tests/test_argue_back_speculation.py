@@ -0,0 +1,62 @@
+"""Speculative argue-back is kept for messages that look like pushback."""
+
+import asyncio
+
+import pytest
+
+import agents.scoping as scoping
+from agents.scoping import ScopingAgent
+from models.schemas import ConversationState, DiscoverySummary, Feature, ScopingOutput
+from tools.intent import likely_scoping_pushback
+
+
+@pytest.mark.parametrize("message", [
+    "ok", "Sounds good, let's go!", "yes", "LGTM", "looks great", "what about payments?", "Why P2 for export?",
+])
+def test_questions_and_affirmations_are_not_pushback(message):
+    assert not likely_scoping_pushback(message)
+
+
+@pytest.mark.parametrize("message", [
+    "We need payments in the MVP",
+    "ok but add payments",
+    "yes, though export has to be P0",
+    "sounds good for v1 except I really want offline mode in phase one",
+])
+def test_pushback_and_qualified_agreement_are_speculated(message):
+    assert likely_scoping_pushback(message)
+
+
+def test_question_turn_leaves_budget_for_later_pushback(monkeypatch):
+    labels = {"what does phase 2 include?": "QUESTION", "we need payments now": "PUSHBACK"}
+
+    async def classify(message):
+        return labels[message]
+
+    monkeypatch.setattr(scoping, "classify_scoping_intent", classify)
+    monkeypatch.setattr(scoping, "SCOPE_PATCH_ENABLED", False)
+    agent = ScopingAgent()
+    replies = []
+
+    async def pushback_reply(state):
+        replies.append(state.messages[-1]["content"])
+        return "Fair point, payments go in."
+
+    async def llm_conversation(messages, system_prompt, state, call_site=None):
+        return "Phase 2 adds exports. Ready to proceed?"
+
+    monkeypatch.setattr(agent, "_pushback_reply", pushback_reply)
+    monkeypatch.setattr(agent, "_llm_conversation", llm_conversation)
+    state = ConversationState(
+        phase="scoping",
+        discovery_summary=DiscoverySummary(),
+        scoping_output=ScopingOutput(mvp_features=[Feature(name="Booking", description="Book slots", priority="P0")]),
+    )
+
+    async def run():
+        await agent.handle_message(state, "what does phase 2 include?")
+        await agent.handle_message(state, "we need payments now")
+
+    asyncio.run(run())
+    assert agent.speculation_budget._used == {"argue_back": 1}
+    assert replies == ["we need payments now"]  # the speculative reply was committed, not recomputed
@@ -0,0 +1,81 @@
+"""Batch checkpoint/resume and brief id handling."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import batch.pipeline as pipeline
+from batch.briefs import load_briefs, parse_brief
+from batch.pipeline import CHECKPOINT_FILE, completed_ids, run_batch
+
+
+def _brief(brief_id: str):
+    return parse_brief({"id": brief_id, "problem": "Too many spreadsheets"}, 0)
+
+
+@pytest.fixture
+def fake_run(monkeypatch) -> list[str]:
+    """run_brief without LLM calls; briefs whose id starts with "bad" produce no spec."""
+    ran: list[str] = []
+
+    async def run_brief(brief, mode="auto"):
+        ran.append(brief.id)
+        spec = None if brief.id.startswith("bad") else f"# Spec for {brief.id}"
+        state = SimpleNamespace(
+            spec_markdown=spec,
+            phase="done" if spec else "scoping",
+            discovery_summary=brief.summary,
+            scoping_output=None,
+            negotiation_rounds=0,
+        )
+        return SimpleNamespace(state=state), [{"user": "hi", "assistant": "ok", "phase": state.phase}]
+
+    monkeypatch.setattr(pipeline, "run_brief", run_brief)
+    return ran
+
+
+def test_completed_ids_later_lines_win_and_torn_lines_are_skipped(tmp_path):
+    lines = [
+        json.dumps({"id": "a", "status": "error"}),
+        json.dumps({"id": "b", "status": "ok"}),
+        json.dumps({"id": "a", "status": "ok"}),
+        json.dumps({"id": "b", "status": "error"}),
+        '{"id": "c", "sta',
+    ]
+    (tmp_path / CHECKPOINT_FILE).write_text("\n".join(lines), encoding="utf-8")
+    assert completed_ids(tmp_path) == {"a"}
+
+
+def test_completed_ids_without_checkpoint(tmp_path):
+    assert completed_ids(tmp_path) == set()
+
+
+def test_resume_skips_ok_briefs_and_retries_failures(tmp_path, fake_run):
+    briefs = [_brief("one"), _brief("bad-two"), _brief("three")]
+    first = asyncio.run(run_batch(briefs, tmp_path, requests_per_minute=None))
+    assert (first.ok, first.failed, first.skipped) == (2, 1, 0)
+    assert (tmp_path / "one" / "spec.md").read_text(encoding="utf-8") == "# Spec for one"
+
+    fake_run.clear()
+    second = asyncio.run(run_batch(briefs, tmp_path, requests_per_minute=None))
+    assert fake_run == ["bad-two"]
+    assert (second.total, second.skipped, second.failed) == (3, 2, 1)
+
+    fake_run.clear()
+    asyncio.run(run_batch(briefs, tmp_path, requests_per_minute=None, resume=False))
+    assert sorted(fake_run) == ["bad-two", "one", "three"]
+
+
+def test_run_batch_rejects_duplicate_ids(tmp_path, fake_run):
+    with pytest.raises(ValueError, match="dup"):
+        asyncio.run(run_batch([_brief("dup"), _brief("dup")], tmp_path, requests_per_minute=None))
+    assert fake_run == []
+
+
+def test_load_briefs_suffixes_duplicate_ids(tmp_path):
+    path = tmp_path / "briefs.jsonl"
+    rows = [{"id": "a"}, {"id": "a"}, {"id": "a-2"}, {"name": "A"}]
+    path.write_text("\n".join(json.dumps(r) for r in rows), encoding="utf-8")
+    assert [b.id for b in load_briefs(path)] == ["a", "a-2", "a-2-2", "a-3"]
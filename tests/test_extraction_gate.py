@@ -0,0 +1,57 @@
+"""Discovery extraction gate: skip / narrow / full decisions."""
+
+import pytest
+
+from models.schemas import ConversationState, DiscoverySummary
+from tools.extraction_gate import decide, targeted_fields
+
+
+def _state(question: str, answer: str, **summary) -> ConversationState:
+    """Second user turn: an opening message, the PM's question, then the founder's answer."""
+    return ConversationState(
+        messages=[
+            {"role": "user", "content": "An app for independent dog trainers to manage their clients"},
+            {"role": "assistant", "content": question},
+            {"role": "user", "content": answer},
+        ],
+        discovery_summary=DiscoverySummary(
+            target_user="Independent dog trainers", core_problem="Scheduling chaos", **summary
+        ),
+    )
+
+
+@pytest.mark.parametrize("question, fields", [
+    ("Would trainers pay a $15/month subscription for this?", ["revenue_model"]),
+    ("Who would use this every day?", ["target_user"]),
+    ("What frustrates them most about scheduling?", ["core_problem"]),
+    ("How big is your team, and is there a deadline?", ["constraints"]),
+    ("Tell me about the whole steam of payments you see", []),
+])
+def test_targeted_fields_match_whole_words(question, fields):
+    assert targeted_fields(question) == fields
+
+
+@pytest.mark.parametrize("answer", ["yes", "Yes!", "no", "nope", "definitely"])
+def test_yes_no_answer_to_open_gap_is_narrowed(answer):
+    decision = decide(_state("Would trainers pay a $15/month subscription for this?", answer), answer)
+    assert (decision.action, decision.fields) == ("narrow", ["revenue_model"])
+
+
+def test_yes_no_answer_to_filled_field_is_skipped():
+    state = _state("Would trainers pay a $15/month subscription for this?", "yes", revenue_model="Subscription")
+    assert decide(state, "yes").action == "skip"
+
+
+def test_filler_without_question_is_skipped():
+    assert decide(_state("Got it, that makes sense.", "ok"), "ok").action == "skip"
+
+
+def test_short_answer_is_narrowed_to_question_field():
+    answer = "Probably around $20 a month per trainer"
+    decision = decide(_state("How would you make money from this?", answer), answer)
+    assert (decision.action, decision.fields) == ("narrow", ["revenue_model"])
+
+
+def test_pivot_language_forces_full_extraction():
+    answer = "Actually, scratch that, it should be for groomers"
+    assert decide(_state("Who is your target user?", answer), answer).action == "full"
@@ -0,0 +1,85 @@
+"""Deterministic spec fact check: Aho-Corasick matcher, coverage and unsupported claims."""
+
+import pytest
+
+from models.schemas import ComparableProduct, DiscoverySummary, Feature, ScopingOutput
+from tools.fact_check import AhoCorasick, check_spec_facts, normalize
+from tools.spec_renderer import render_spec
+
+
+@pytest.fixture
+def summary() -> DiscoverySummary:
+    return DiscoverySummary(
+        target_user="Independent dog trainers with 10-30 clients",
+        core_problem="Trainers juggle session bookings across texts and paper calendars",
+        current_alternatives=["Google Sheets", "WhatsApp groups"],
+        feature_wishlist=["session booking", "client reminders", "progress notes"],
+        success_metric="40 paying trainers in 3 months",
+        revenue_model="$15/month subscription",
+        constraints="Solo founder, 6 weeks",
+    )
+
+
+@pytest.fixture
+def scope() -> ScopingOutput:
+    return ScopingOutput(
+        mvp_features=[
+            Feature(name="Session booking", description="Clients book open slots", priority="P0"),
+            Feature(name="Client reminders", description="Reminder before each session", priority="P1", phase=2),
+            Feature(name="Progress notes", description="Notes after each session", priority="P2", phase=3),
+        ],
+        comparable_products=[ComparableProduct(name="PetExec", description="Kennel software", relevance="Booking for pet businesses")],
+    )
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+    assert {matcher.patterns[i] for i in matcher.found("ushers")} == {"he", "she", "hers"}
+    assert matcher.found("xyz") == set()
+    assert AhoCorasick([]).found("anything") == set()
+
+
+def test_normalize_stems_and_strips_separators():
+    assert normalize("Booking 1,500 Sessions!") == " book 1500 session "
+
+
+def test_rendered_spec_is_fully_supported(summary, scope):
+    report = check_spec_facts(render_spec(summary, scope), summary, scope)
+    assert report.coverage == 1.0
+    assert report.unsupported == []
+    assert report.ok()
+
+
+def test_invented_entities_and_numbers_are_unsupported(summary, scope):
+    spec = render_spec(summary, scope) + (
+        "\n\n## Market\nUnlike Rover Premium and Acme Trainer Cloud, pricing starts at $49 for 2,000 clients.\n"
+    )
+    report = check_spec_facts(spec, summary, scope)
+    assert report.unsupported_entities == ["Rover Premium", "Acme Trainer Cloud"]
+    assert report.unsupported_numbers == ["$49", "2,000"]
+
+
+def test_technology_names_are_not_hallucinations(summary, scope):
+    spec = render_spec(summary, scope) + (
+        "\n\n## Delivery\n"
+        "Use Next.js with Stripe Connect for payouts. Data lives in Postgres on Supabase.\n"
+        "Reminders go out via Twilio SMS and sync with Google Calendar.\n"
+        "\n## Technical Considerations\n"
+        "Host on Acme Edge Cloud behind Zorg Gateway.\n"
+    )
+    report = check_spec_facts(spec, summary, scope)
+    assert report.unsupported == []
+    assert report.ok()
+
+
+def test_entities_end_on_a_capitalized_word(summary, scope):
+    spec = "We compete with Rover Premium for walkers and Bank of America for banking.\n"
+    report = check_spec_facts(spec, summary, scope)
+    assert report.unsupported_entities == ["Rover Premium", "Bank of America"]
+
+
+def test_missing_discovery_facts_lower_coverage(summary, scope):
+    report = check_spec_facts("# Product Spec: Untitled\n\nA booking tool.\n", summary, scope)
+    assert report.coverage < 0.6
+    assert "revenue_model: $15/month subscription" in report.missing
+    assert not report.ok()
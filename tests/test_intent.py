@@ -0,0 +1,51 @@
+"""Spec edit classification: keyword shortcut only for change requests."""
+
+import asyncio
+
+import pytest
+
+import tools.intent as intent
+
+
+@pytest.fixture
+def classifier(monkeypatch):
+    """Fake classification model answering NONE; records the prompts it was asked."""
+    calls = []
+
+    async def fake_llm_call(task, messages, **kwargs):
+        calls.append(messages[0]["content"])
+        return "NONE"
+
+    monkeypatch.setattr(intent, "llm_call", fake_llm_call)
+    return calls
+
+
+@pytest.mark.parametrize("message", [
+    "thanks, the technical plan looks good",
+    "what are the biggest risks here?",
+    "great, growth looks right",
+    "can you explain the RICE scores?",
+    "why did you cut the chat feature?",
+])
+def test_praise_and_questions_are_not_edits(classifier, message):
+    assert asyncio.run(intent.classify_spec_edit(message)) == []
+    assert len(classifier) == 1  # the classifier decided, not the keywords
+
+
+@pytest.mark.parametrize("message, sections", [
+    ("add a risk about app store review", ["risks"]),
+    ("can you move offline mode to phase 3?", ["phase_3"]),
+    ("rename the product in the title to PawPal", ["overview"]),
+    ("Please cut feature X and update the RICE scores", ["prioritization"]),
+])
+def test_change_requests_use_keywords(classifier, message, sections):
+    assert asyncio.run(intent.classify_spec_edit(message)) == sections
+    assert classifier == []
+
+
+def test_unnamed_change_goes_to_classifier(monkeypatch):
+    async def fake_llm_call(task, messages, **kwargs):
+        return "phase_1, prioritization"
+
+    monkeypatch.setattr(intent, "llm_call", fake_llm_call)
+    assert asyncio.run(intent.classify_spec_edit("drop the social login")) == ["phase_1", "prioritization"]
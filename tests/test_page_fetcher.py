@@ -0,0 +1,121 @@
+"""PageFetcher against httpx.MockTransport: caching, conditional requests, limits, deadline."""
+
+import asyncio
+
+import httpx
+
+from tools.page_fetcher import PageCache, PageFetcher, enrich_comparables
+
+_HTML = "<html><head><title>Acme</title></head><body><p>Acme schedules dog playdates in your city.</p></body></html>"
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _fetcher(tmp_path, handler, **kw) -> PageFetcher:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return PageFetcher(client=client, cache=PageCache(tmp_path), **kw)
+
+
+def test_200_is_cached_and_fresh_hit_skips_network(tmp_path):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        return httpx.Response(200, headers={"content-type": "text/html"}, text=_HTML)
+
+    fetcher = _fetcher(tmp_path, handler)
+    first = _run(fetcher.fetch_all(["https://acme.test/"]))
+    assert "Acme schedules dog playdates" in first["https://acme.test/"]
+    assert PageCache(tmp_path).get("https://acme.test/")["text"] == first["https://acme.test/"]
+    assert _run(fetcher.fetch_all(["https://acme.test/"])) == first
+    assert len(calls) == 1
+
+
+def _conditional_handler(validator_header: str, response_header: str, value: str, seen: list):
+    def handler(request):
+        seen.append(request.headers.get(validator_header))
+        if request.headers.get(validator_header) == value:
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"content-type": "text/html", response_header: value}, text=_HTML)
+
+    return handler
+
+
+def test_304_reuses_cached_body_for_etag_and_last_modified(tmp_path):
+    for validator, header, value in (
+        ("if-none-match", "etag", '"v1"'),
+        ("if-modified-since", "last-modified", "Wed, 01 Jan 2025 00:00:00 GMT"),
+    ):
+        seen: list = []
+        fetcher = _fetcher(tmp_path / header, _conditional_handler(validator, header, value, seen), fresh_s=0)
+        first = _run(fetcher.fetch_all(["https://acme.test/"]))
+        second = _run(fetcher.fetch_all(["https://acme.test/"]))
+        assert seen == [None, value]
+        assert second == first and first
+
+
+def test_per_host_limit(tmp_path):
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.05)
+        in_flight["now"] -= 1
+        return httpx.Response(200, headers={"content-type": "text/html"}, text=_HTML)
+
+    fetcher = _fetcher(tmp_path, handler, per_host=2)
+    urls = [f"https://acme.test/{i}" for i in range(6)]
+    assert len(_run(fetcher.fetch_all(urls))) == 6
+    assert in_flight["max"] == 2
+
+
+def test_deadline_drops_slow_pages(tmp_path):
+    async def handler(request):
+        if request.url.host == "slow.test":
+            await asyncio.sleep(5)
+        return httpx.Response(200, headers={"content-type": "text/html"}, text=_HTML)
+
+    fetcher = _fetcher(tmp_path, handler)
+    texts = _run(fetcher.fetch_all(["https://fast.test/", "https://slow.test/"], deadline_s=0.3))
+    assert list(texts) == ["https://fast.test/"]
+
+
+def test_endless_page_is_cut_at_max_bytes(tmp_path):
+    sent = {"bytes": 0}
+
+    async def endless():
+        chunk = b"<p>" + b"word " * 200 + b"</p>"
+        while True:
+            sent["bytes"] += len(chunk)
+            yield chunk
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=endless())
+
+    fetcher = _fetcher(tmp_path, handler, max_bytes=50_000)
+    texts = _run(fetcher.fetch_all(["https://huge.test/"], deadline_s=5))
+    assert texts["https://huge.test/"]
+    assert sent["bytes"] < 60_000
+
+
+def test_enrich_comparables_within_deadline(tmp_path, monkeypatch):
+    async def fake_summary(title, url, text):
+        return f"summary of {title}"
+
+    monkeypatch.setattr("tools.page_fetcher.summarize_page", fake_summary)
+
+    async def handler(request):
+        if request.url.host == "slow.test":
+            await asyncio.sleep(5)
+        return httpx.Response(200, headers={"content-type": "text/html"}, text=_HTML)
+
+    results = [
+        {"title": "Fast", "href": "https://fast.test/"},
+        {"title": "Slow", "href": "https://slow.test/"},
+        {"title": "No link"},
+    ]
+    summaries = _run(enrich_comparables(results, _fetcher(tmp_path, handler), deadline_s=0.5))
+    assert summaries == {"https://fast.test/": "summary of Fast"}
@@ -0,0 +1,97 @@
+"""Phase planner: exact knapsack, priority bounds and phases pinned by scope patches."""
+
+import asyncio
+import itertools
+
+import numpy as np
+
+import agents.scoping as scoping
+from models.schemas import ConversationState, DiscoverySummary, Feature, ScopingOutput
+from tools.phase_planner import Capacity, _closure, _knapsack, plan_phases
+
+_CAPACITY = Capacity(team_size=1.0, phase_weeks=(2.0, 2.0, 2.0))
+
+
+def _feature(name: str, priority: str, reach: int, effort: float = 1.0, **kw) -> Feature:
+    return Feature(
+        name=name, description=name, priority=priority,
+        rice_reach=reach, rice_impact=1, rice_confidence=1.0, rice_effort=effort, **kw,
+    )
+
+
+def _phases(plan) -> dict[str, int]:
+    return {name: p.number for p in plan.phases for name in p.features}
+
+
+def test_priority_bounds_phase_one():
+    scope = ScopingOutput(mvp_features=[
+        _feature("Core", "P0", 10, effort=3.0),  # over the phase 1 budget on its own
+        _feature("Polish", "P2", 1000),  # best value, but P2 never goes to phase 1
+        _feature("Extra", "P1", 50),
+    ])
+    assert _phases(plan_phases(scope, _CAPACITY)) == {"Core": 1, "Polish": 2, "Extra": 2}
+
+
+def test_pinned_phase_is_kept_and_pulls_dependencies():
+    scope = ScopingOutput(mvp_features=[
+        _feature("A", "P0", 100),
+        _feature("B", "P1", 90),
+        _feature("C", "P1", 80, depends_on=["B"]),
+    ])
+    assert _phases(plan_phases(scope, _CAPACITY, pinned={"B": 3, "C": 3})) == {"A": 1, "B": 3, "C": 3}
+    assert _phases(plan_phases(scope, _CAPACITY, pinned={"C": 1}))["B"] == 1
+
+
+def test_patch_phase_survives_replan(monkeypatch):
+    scope = ScopingOutput(mvp_features=[
+        _feature("A", "P0", 100), _feature("B", "P0", 90), _feature("C", "P1", 25),
+    ])
+    state = ConversationState(
+        phase="scoping", discovery_summary=DiscoverySummary(constraints="solo, 6 weeks"), scoping_output=scope
+    )
+    scoping._replan_phases(state)
+    assert {f.name: f.phase for f in state.scoping_output.mvp_features}["B"] == 1
+
+    async def fake_patch(*_):
+        return {"reprioritize": [{"name": "B", "priority": "P2", "phase": 3}]}
+
+    monkeypatch.setattr(scoping, "extract_scope_patch", fake_patch)
+    agent = scoping.ScopingAgent()
+    asyncio.run(agent._patch_scope(state, "move B later", "ok"))
+    features = {f.name: f for f in state.scoping_output.mvp_features}
+    assert (features["B"].priority, features["B"].phase) == ("P2", 3)
+    assert features["A"].phase == 1
+    phase_3 = next(p for p in state.scoping_output.implementation_phases if p.phase_number == 3)
+    assert "B" in phase_3.features
+
+
+def test_shared_dependency_counted_once():
+    # Auth + A + B (4 units, value 110) beats C (3 units, value 80), though each of
+    # A and B packed with its own copy of Auth would not fit next to the other
+    scope = ScopingOutput(mvp_features=[
+        _feature("Auth", "P1", 10, effort=1.0),
+        _feature("A", "P1", 25, effort=0.5, depends_on=["Auth"]),
+        _feature("B", "P1", 25, effort=0.5, depends_on=["Auth"]),
+        _feature("C", "P1", 120, effort=1.5),
+    ])
+    assert _phases(plan_phases(scope, _CAPACITY)) == {"Auth": 1, "A": 1, "B": 1, "C": 2}
+
+
+def test_knapsack_matches_brute_force():
+    rng = np.random.RandomState(7)
+    for _ in range(30):
+        n = 8
+        values = rng.randint(1, 100, size=n).astype(float)
+        weights = rng.randint(1, 5, size=n)
+        deps = [[j for j in range(i) if rng.rand() < 0.2] for i in range(n)]
+        closures = {i: frozenset(_closure(i, deps, {})) for i in range(n)}
+        capacity = int(rng.randint(3, 15))
+        best = 0.0
+        for subset in itertools.product((0, 1), repeat=n):
+            chosen = {i for i in range(n) if subset[i]}
+            if all(closures[i] <= chosen for i in chosen) and weights[list(chosen)].sum() <= capacity:
+                best = max(best, values[list(chosen)].sum())
+        picked = _knapsack(values, weights, closures, capacity)
+        assert all(closures[i] <= picked for i in picked)
+        assert weights[list(picked)].sum() <= capacity
+        assert values[list(picked)].sum() == best
@@ -0,0 +1,75 @@
+"""Adaptive reasoning policy and the latency llm_call reports to it."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import models.llm as llm
+import models.policy as policy
+from config import POLICY_DECAY_S, POLICY_MIN_SAMPLES
+from models import providers
+from models.policy import ReasoningPolicy
+
+_SITES = {"site": {"reasoning_effort": "medium", "target_latency_s": 1.0}}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(policy.time, "monotonic", clock)
+    return clock
+
+
+def test_slow_calls_lower_effort_and_quality_failures_raise_it(clock):
+    p = ReasoningPolicy(_SITES)
+    for _ in range(POLICY_MIN_SAMPLES):
+        p.observe_call("site", latency_s=5.0)
+    assert p.plan("site").reasoning_effort == "low"
+    for _ in range(POLICY_MIN_SAMPLES):
+        p.observe_quality("site", ok=False)
+    assert p.plan("site").reasoning_effort == "medium"
+
+
+def test_adapted_effort_decays_back_to_configured(clock):
+    p = ReasoningPolicy(_SITES)
+    for _ in range(POLICY_MIN_SAMPLES):
+        p.observe_call("site", latency_s=5.0)
+    assert p.plan("site").reasoning_effort == "low"
+    clock.now += POLICY_DECAY_S - 1
+    assert p.plan("site").reasoning_effort == "low"
+    clock.now += 2
+    assert p.plan("site").reasoning_effort == "medium"
+    clock.now += POLICY_DECAY_S * 2
+    assert p.plan("site").reasoning_effort == "medium"  # never past the configured effort
+
+
+def test_llm_call_reports_latency_of_the_successful_attempt_only(monkeypatch):
+    fresh = ReasoningPolicy({"argue_back": {"reasoning_effort": "medium", "target_latency_s": 8.0}})
+    monkeypatch.setattr(llm, "reasoning_policy", fresh)
+    monkeypatch.setattr(llm, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(llm, "MODELS", {"conversation": "groq/openai/gpt-oss-20b"})
+    monkeypatch.setattr(llm, "LLM_RETRY_DELAYS", (0.3, 0.3, 0.3))
+    calls = []
+
+    async def acompletion(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            await asyncio.sleep(0.2)
+            raise RuntimeError("provider hiccup")
+        message = SimpleNamespace(content="reply")
+        return SimpleNamespace(choices=[SimpleNamespace(finish_reason="stop", message=message)])
+
+    monkeypatch.setitem(providers._loaded, "litellm", SimpleNamespace(acompletion=acompletion))
+    reply = asyncio.run(llm.llm_call("conversation", [{"role": "user", "content": "hi"}], call_site="argue_back"))
+    assert reply == "reply" and len(calls) == 2
+    latencies = list(fresh._sites["argue_back"].latencies)
+    assert len(latencies) == 1 and latencies[0] < 0.1  # not the 0.2s failure + 0.3s backoff
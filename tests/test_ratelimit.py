@@ -0,0 +1,67 @@
+"""LLM rate limiter pacing, and that its waits do not eat into the turn deadline."""
+
+import asyncio
+import time
+
+import pytest
+
+import models.llm as llm
+from models import deadline
+from models.ratelimit import RateLimiter
+
+
+def test_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+
+
+def test_paces_acquisitions_to_the_rate():
+    async def run() -> list[float]:
+        limiter = RateLimiter(per_minute=600)  # one every 0.1s
+        stamps = []
+        for _ in range(5):
+            await limiter.acquire()
+            stamps.append(time.monotonic())
+        return stamps
+
+    stamps = asyncio.run(run())
+    assert stamps[-1] - stamps[0] == pytest.approx(0.4, abs=0.08)
+    assert all(b - a >= 0.09 for a, b in zip(stamps, stamps[1:]))
+
+
+def test_burst_is_served_immediately():
+    async def run() -> float:
+        limiter = RateLimiter(per_minute=60, burst=3)
+        t0 = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+        return time.monotonic() - t0
+
+    assert asyncio.run(run()) < 0.05
+
+
+def test_limiter_wait_does_not_consume_the_turn_deadline(monkeypatch):
+    monkeypatch.setattr(llm, "_rate_limiter", RateLimiter(per_minute=300))  # one every 0.2s
+
+    async def call() -> str:
+        for _ in range(3):
+            await llm._await_rate_limit()
+        return "answer"
+
+    async def run():
+        with deadline.turn_deadline(0.3) as budget:
+            answer = await deadline.within_budget(call(), "test", lambda: "fallback")
+        return answer, budget
+
+    answer, budget = asyncio.run(run())
+    assert answer == "answer"
+    assert budget.degraded == []
+    assert budget.excluded_s == pytest.approx(0.4, abs=0.1)
+
+
+def test_overlapping_exclusions_are_credited_once():
+    budget = deadline.TurnBudget(deadline=100.0)
+    budget.exclude(10.0, 12.0)
+    budget.exclude(11.0, 13.0)  # only 12..13 is new
+    budget.exclude(5.0, 9.0)  # ends before the watermark: not credited
+    assert budget.excluded_s == pytest.approx(3.0)
+    assert budget.deadline == pytest.approx(103.0)
@@ -0,0 +1,41 @@
+"""RICE engine: scoring and the confidence/effort sensitivity sweep."""
+
+import numpy as np
+
+from config import RICE_CONFIDENCE_SWEEP
+from models.schemas import Feature
+from tools.rice import rice_scores, score_features, sensitivity_grid
+
+
+def _feature(name: str, reach: float, confidence: float) -> Feature:
+    return Feature(
+        name=name, description=name, priority="P1",
+        rice_reach=reach, rice_impact=1, rice_confidence=confidence, rice_effort=1,
+    )
+
+
+def _features() -> list[Feature]:
+    # base scores [100, 90, 25, 12.5]
+    return [_feature("A", 100, 1.0), _feature("B", 90, 1.0), _feature("C", 50, 0.5), _feature("D", 25, 50)]
+
+
+def test_rice_scores_accepts_fractions_and_percentages():
+    scores = rice_scores(np.array([100.0, 100.0]), np.ones(2), np.array([0.8, 80.0]), np.ones(2))
+    assert np.allclose(scores, [80.0, 80.0])
+
+
+def test_sweep_caps_confidence_at_certainty():
+    reach, impact, confidence, effort = (np.array([100.0, 50.0]), np.ones(2), np.array([1.0, 0.5]), np.ones(2))
+    grid = sensitivity_grid(reach, impact, confidence, effort, confidence_factors=(1.25,), effort_factors=(1.0,))
+    assert np.allclose(grid[0, 0], [100.0, 31.25])
+
+
+def test_top_feature_is_stable_across_default_confidence_sweep():
+    assert 1.25 in RICE_CONFIDENCE_SWEEP
+    report = score_features(_features())
+    assert np.allclose(report.computed, [100.0, 90.0, 25.0, 12.5])
+    top = int(report.order()[0])
+    assert report.names[top] == "A"
+    assert report.bands[top] == "P0"
+    assert report.band_stability[top] == 1.0
+    assert report.band_stability[3] == 1.0  # already last: lowering nothing can demote it
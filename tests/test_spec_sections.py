@@ -0,0 +1,39 @@
+"""Spec section splitting, cleaning and stitching."""
+
+from models.schemas import DiscoverySummary, ScopingOutput
+from tools.spec_renderer import render_section, render_spec
+from tools.spec_sections import clean_section, foreign_sections, split_spec, stitch_sections
+from tools.templates import SPEC_SECTIONS
+
+_SUMMARY = DiscoverySummary(target_user="Dog trainers", core_problem="Scheduling chaos")
+_SCOPE = ScopingOutput()
+
+
+def test_split_and_stitch_round_trip():
+    spec = render_spec(_SUMMARY, _SCOPE)
+    sections = split_spec(spec)
+    assert list(sections) == list(SPEC_SECTIONS)
+    assert stitch_sections(sections).strip() == spec.strip()
+
+
+def test_clean_section_strips_fences_and_preamble():
+    overview = render_section("overview", _SUMMARY, _SCOPE)
+    raw = f"Sure! Here is the section:\n```markdown\n{overview}\n```"
+    assert clean_section("overview", raw) == overview.strip()
+
+
+def test_clean_section_cuts_at_another_section():
+    overview = render_section("overview", _SUMMARY, _SCOPE)
+    risks = render_section("risks", _SUMMARY, _SCOPE)
+    cleaned = clean_section("overview", f"{overview}\n\n{risks}")
+    assert cleaned == overview.strip()
+    assert foreign_sections("overview", f"{overview}\n\n{risks}") == ["risks"]
+
+    sections = split_spec(render_spec(_SUMMARY, _SCOPE))
+    sections["overview"] = cleaned
+    assert stitch_sections(sections).count("## Open Questions") == 1
+
+
+def test_clean_section_requires_headings():
+    assert clean_section("risks", "## Open Questions\n- none yet") is None
+    assert clean_section("phase_1", "### Phase 1: Core MVP\n- Booking").startswith("## Implementation Plan")
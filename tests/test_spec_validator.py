@@ -0,0 +1,71 @@
+"""Structural spec validation against the deterministic render."""
+
+import pytest
+
+from models.schemas import DiscoverySummary, Feature, ImplementationPhase, ScopingOutput
+from tools.spec_renderer import render_section, render_spec
+from tools.spec_sections import split_spec, stitch_sections
+from tools.spec_validator import section_defects, spec_defects
+
+
+@pytest.fixture
+def summary() -> DiscoverySummary:
+    return DiscoverySummary(target_user="Dog trainers", core_problem="Scheduling chaos")
+
+
+@pytest.fixture
+def scope() -> ScopingOutput:
+    return ScopingOutput(
+        mvp_features=[
+            Feature(name="Session booking", description="Clients book open slots", priority="P0"),
+            Feature(name="Client reminders", description="Reminder before each session", priority="P1", phase=2),
+        ],
+        core_user_flow="Trainer shares a link, client books a slot",
+        key_screens=["Calendar"],
+        implementation_phases=[
+            ImplementationPhase(phase_number=1, name="Core MVP", goal="Bookings", estimated_weeks="2 weeks",
+                                features=["Session booking"]),
+            ImplementationPhase(phase_number=2, name="Retention", goal="Fewer no-shows", estimated_weeks="1 week",
+                                features=["Client reminders"]),
+        ],
+    )
+
+
+def test_rendered_spec_has_no_defects(summary, scope):
+    assert spec_defects(render_spec(summary, scope), summary, scope) == {}
+
+
+def test_missing_section(summary, scope):
+    sections = split_spec(render_spec(summary, scope))
+    del sections["phase_3"]
+    assert spec_defects(stitch_sections(sections), summary, scope) == {"phase_3": ["missing"]}
+
+
+def test_missing_and_placeholder_headings(summary, scope):
+    phase_1 = render_section("phase_1", summary, scope)
+    without_flow = phase_1.replace("### Core User Flow", "### Notes")
+    assert "missing heading: core user flow" in section_defects("phase_1", without_flow, summary, scope)
+    tbd_flow = phase_1.replace("Trainer shares a link, client books a slot", "TBD")
+    assert section_defects("phase_1", tbd_flow, summary, scope) == ["empty: core user flow"]
+
+
+def test_placeholder_is_fine_where_the_conversation_had_no_data(summary, scope):
+    # No comparable products were found, so the rendered section says TBD as well
+    assert section_defects("overview", render_section("overview", summary, scope), summary, scope) == []
+
+
+def test_phase_feature_omitted(summary, scope):
+    phase_2 = render_section("phase_2", summary, scope).replace("Client reminders", "Notifications")
+    assert section_defects("phase_2", phase_2, summary, scope) == ["phase features missing: Client reminders"]
+
+
+def test_extra_section_is_flagged(summary, scope):
+    overview = render_section("overview", summary, scope)
+    risks = render_section("risks", summary, scope)
+    assert section_defects("overview", f"{overview}\n\n{risks}", summary, scope) == [
+        "contains other section: risks"
+    ]
+    # The same duplication inside a whole spec: the second copy lands in another section
+    spec = render_spec(summary, scope).replace(overview.strip(), f"{overview.strip()}\n\n{risks.strip()}")
+    assert spec.count("## Open Questions") == 2
+    assert spec_defects(spec, summary, scope) == {"prioritization": ["contains other section: risks"]}
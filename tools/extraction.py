@@ -4,7 +4,9 @@ import json
 import re
 from typing import Optional
 
-from models.llm import llm_call
+from config import EXTRACTION_JSON_MODE
+from models import telemetry
+from models.llm import llm_call, llm_stream, supports_json_mode
 from models.schemas import (
     DiscoverySummary,
     ScopingOutput,
@@ -13,11 +15,28 @@ from models.schemas import (
     ComparableProduct,
     ImplementationPhase,
 )
-from prompts.extraction import EXTRACTION_DISCOVERY_PROMPT, EXTRACTION_SCOPING_PROMPT
+from prompts.extraction import (
+    DISCOVERY_FIELD_SCHEMA,
+    EXTRACTION_DISCOVERY_FIELDS_PROMPT,
+    EXTRACTION_DISCOVERY_PROMPT,
+    EXTRACTION_SCOPE_PATCH_PROMPT,
+    EXTRACTION_SCOPING_PROMPT,
+)
+from prompts.scoping import SCOPING_JSON_DELIMITER
+from tools.json_repair import StreamingJSONParser
 
 
 def _extract_json_block(text: str) -> Optional[dict]:
-    """Try to parse JSON from text (handle markdown code blocks). Returns dict only."""
+    """
+    Parse a JSON object from text (handles markdown code blocks, prose around the object,
+    trailing commas and truncation). Returns dict only.
+    """
+    data, _ = _parse_json_object(text)
+    return data
+
+
+def _parse_json_object(text: str) -> tuple[Optional[dict], bool]:
+    """Strict parse first, then the tolerant parser. Returns (data, repaired)."""
     text = text.strip()
     # Strip optional markdown code block
     if "```" in text:
@@ -26,20 +45,88 @@ def _extract_json_block(text: str) -> Optional[dict]:
             text = match.group(1).strip()
     try:
         out = json.loads(text)
-        return out if isinstance(out, dict) else None
+        return (out if isinstance(out, dict) else None), False
     except json.JSONDecodeError:
-        return None
+        pass
+    parser = StreamingJSONParser()
+    parser.feed(text)
+    out = parser.result()
+    return out, out is not None and parser.repaired
 
 
-async def extract_discovery_summary(conversation_text: str) -> DiscoverySummary:
+def _record_parse(kind: str, outcome: str) -> None:
+    """Count a parse outcome ("ok" | "repaired" | "failed") for extraction_parse_stats."""
+    telemetry.incr(f"extraction.{kind}.{outcome}")
+
+
+def extraction_parse_stats() -> dict[str, dict]:
+    """Per-kind parse outcome counts and failure rate, from telemetry counters."""
+    stats: dict[str, dict] = {}
+    for name, count in telemetry.counters("extraction.").items():
+        _, kind, outcome = name.split(".", 2)
+        stats.setdefault(kind, {"ok": 0, "repaired": 0, "failed": 0})[outcome] = count
+    for entry in stats.values():
+        total = entry["ok"] + entry["repaired"] + entry["failed"]
+        entry["failure_rate"] = round(entry["failed"] / total, 3) if total else 0.0
+    return stats
+
+
+async def _request_json(prompt: str, kind: str) -> Optional[dict]:
+    """
+    Run an extraction prompt and parse the JSON object it returns.
+    Uses JSON mode when the extraction model supports it; otherwise (or if the JSON-mode
+    call fails) streams the reply through the tolerant parser, so a truncated or broken
+    stream still yields the members completed so far.
+    """
+    messages = [{"role": "user", "content": prompt}]
+    if EXTRACTION_JSON_MODE and supports_json_mode("extraction"):
+        try:
+            raw = await llm_call("extraction", messages, response_format={"type": "json_object"})
+        except Exception:
+            raw = None
+        if raw is not None:
+            data, repaired = _parse_json_object(raw)
+            _record_parse(kind, "failed" if data is None else ("repaired" if repaired else "ok"))
+            return data
+
+    parser = StreamingJSONParser()
+    stream = llm_stream("extraction", messages)
+    try:
+        async for chunk in stream:
+            parser.feed(chunk)
+            if parser.complete:
+                break
+    except Exception:
+        if parser.partial() is None:
+            _record_parse(kind, "failed")
+            raise
+    finally:
+        await stream.aclose()
+    data = parser.result()
+    _record_parse(kind, "failed" if data is None else ("repaired" if parser.repaired else "ok"))
+    return data
+
+
+async def extract_discovery_summary(
+    conversation_text: str, fields: Optional[list[str]] = None
+) -> DiscoverySummary:
     """
     Extract/update DiscoverySummary from conversation using Mistral.
+    fields narrows the schema to those fields (the extraction gate's "narrow" decision);
+    fields not requested come back empty.
     On parse failure, returns empty DiscoverySummary (graceful degradation).
     """
     try:
-        prompt = EXTRACTION_DISCOVERY_PROMPT.replace("{conversation}", conversation_text)
-        raw = await llm_call("extraction", [{"role": "user", "content": prompt}])
-        data = _extract_json_block(raw)
+        if fields:
+            fields_schema = ",\n".join(f"  {DISCOVERY_FIELD_SCHEMA[f]}" for f in fields if f in DISCOVERY_FIELD_SCHEMA)
+            prompt = EXTRACTION_DISCOVERY_FIELDS_PROMPT.replace("{fields_schema}", fields_schema).replace(
+                "{conversation}", conversation_text
+            )
+        else:
+            prompt = EXTRACTION_DISCOVERY_PROMPT.replace("{conversation}", conversation_text)
+        data = await _request_json(prompt, "discovery")
+        if data is not None and fields:
+            data = {k: v for k, v in data.items() if k in fields}
         if data is None:
             return DiscoverySummary()
         # Coerce to schema types so LLM oddities (e.g. list for string field) don't raise
@@ -65,6 +152,77 @@ async def extract_discovery_summary(conversation_text: str) -> DiscoverySummary:
         return DiscoverySummary()
 
 
+def _scoping_output_from_data(data: dict) -> ScopingOutput:
+    """Coerce parsed scoping JSON into ScopingOutput, dropping malformed entries."""
+    mvp = []
+    for f in data.get("mvp_features") or []:
+        if isinstance(f, dict) and f.get("name") and f.get("priority") in ("P0", "P1", "P2"):
+            phase = f.get("phase")
+            if phase not in (1, 2, 3):
+                phase = 1
+            mvp.append(
+                Feature(
+                    name=str(f["name"]),
+                    description=str(f.get("description", "")),
+                    priority=f["priority"],
+                    phase=int(phase) if phase is not None else 1,
+                    rice_reach=int(f["rice_reach"]) if f.get("rice_reach") is not None else None,
+                    rice_impact=float(f["rice_impact"]) if f.get("rice_impact") is not None else None,
+                    rice_confidence=float(f["rice_confidence"]) if f.get("rice_confidence") is not None else None,
+                    rice_effort=float(f["rice_effort"]) if f.get("rice_effort") is not None else None,
+                    rice_score=float(f["rice_score"]) if f.get("rice_score") is not None else None,
+                    depends_on=[
+                        d.strip() for d in (f.get("depends_on") if isinstance(f.get("depends_on"), list) else [])
+                        if isinstance(d, str) and d.strip()
+                    ],
+                )
+            )
+    cut = []
+    for f in data.get("cut_features") or []:
+        if isinstance(f, dict) and f.get("name"):
+            cut.append(
+                CutFeature(name=str(f["name"]), reason_cut=str(f.get("reason_cut", "")))
+            )
+    comp = []
+    for c in data.get("comparable_products") or []:
+        if isinstance(c, dict) and c.get("name"):
+            comp.append(
+                ComparableProduct(
+                    name=str(c["name"]),
+                    url=c.get("url"),
+                    relevance=str(c.get("relevance", "")),
+                )
+            )
+    key_screens = []
+    for s in data.get("key_screens") or []:
+        if isinstance(s, str) and s.strip():
+            key_screens.append(s.strip())
+    impl_phases = []
+    for p in data.get("implementation_phases") or []:
+        if isinstance(p, dict) and p.get("phase_number") in (1, 2, 3) and p.get("name"):
+            features = p.get("features") or []
+            if not isinstance(features, list):
+                features = []
+            impl_phases.append(
+                ImplementationPhase(
+                    phase_number=int(p["phase_number"]),
+                    name=str(p["name"]),
+                    goal=str(p.get("goal", "")),
+                    estimated_weeks=str(p.get("estimated_weeks", "1-2 weeks")),
+                    features=[str(x) for x in features if x],
+                )
+            )
+    return ScopingOutput(
+        mvp_features=mvp,
+        cut_features=cut,
+        comparable_products=comp,
+        core_user_flow=data.get("core_user_flow"),
+        scope_rationale=data.get("scope_rationale"),
+        key_screens=key_screens,
+        implementation_phases=impl_phases,
+    )
+
+
 async def extract_scoping_output(proposal_text: str) -> ScopingOutput:
     """
     Extract ScopingOutput from scoping proposal text using Mistral.
@@ -72,72 +230,57 @@ async def extract_scoping_output(proposal_text: str) -> ScopingOutput:
     """
     try:
         prompt = EXTRACTION_SCOPING_PROMPT.replace("{proposal}", proposal_text)
-        raw = await llm_call("extraction", [{"role": "user", "content": prompt}])
-        data = _extract_json_block(raw)
+        data = await _request_json(prompt, "scoping")
         if data is None:
             return ScopingOutput()
-        mvp = []
-        for f in data.get("mvp_features") or []:
-            if isinstance(f, dict) and f.get("name") and f.get("priority") in ("P0", "P1", "P2"):
-                phase = f.get("phase")
-                if phase not in (1, 2, 3):
-                    phase = 1
-                mvp.append(
-                    Feature(
-                        name=str(f["name"]),
-                        description=str(f.get("description", "")),
-                        priority=f["priority"],
-                        phase=int(phase) if phase is not None else 1,
-                        rice_reach=int(f["rice_reach"]) if f.get("rice_reach") is not None else None,
-                        rice_impact=float(f["rice_impact"]) if f.get("rice_impact") is not None else None,
-                        rice_confidence=float(f["rice_confidence"]) if f.get("rice_confidence") is not None else None,
-                        rice_effort=float(f["rice_effort"]) if f.get("rice_effort") is not None else None,
-                        rice_score=float(f["rice_score"]) if f.get("rice_score") is not None else None,
-                    )
-                )
-        cut = []
-        for f in data.get("cut_features") or []:
-            if isinstance(f, dict) and f.get("name"):
-                cut.append(
-                    CutFeature(name=str(f["name"]), reason_cut=str(f.get("reason_cut", "")))
-                )
-        comp = []
-        for c in data.get("comparable_products") or []:
-            if isinstance(c, dict) and c.get("name"):
-                comp.append(
-                    ComparableProduct(
-                        name=str(c["name"]),
-                        url=c.get("url"),
-                        relevance=str(c.get("relevance", "")),
-                    )
-                )
-        key_screens = []
-        for s in data.get("key_screens") or []:
-            if isinstance(s, str) and s.strip():
-                key_screens.append(s.strip())
-        impl_phases = []
-        for p in data.get("implementation_phases") or []:
-            if isinstance(p, dict) and p.get("phase_number") in (1, 2, 3) and p.get("name"):
-                features = p.get("features") or []
-                if not isinstance(features, list):
-                    features = []
-                impl_phases.append(
-                    ImplementationPhase(
-                        phase_number=int(p["phase_number"]),
-                        name=str(p["name"]),
-                        goal=str(p.get("goal", "")),
-                        estimated_weeks=str(p.get("estimated_weeks", "1-2 weeks")),
-                        features=[str(x) for x in features if x],
-                    )
-                )
-        return ScopingOutput(
-            mvp_features=mvp,
-            cut_features=cut,
-            comparable_products=comp,
-            core_user_flow=data.get("core_user_flow"),
-            scope_rationale=data.get("scope_rationale"),
-            key_screens=key_screens,
-            implementation_phases=impl_phases,
-        )
+        return _scoping_output_from_data(data)
     except Exception:
         return ScopingOutput()
+
+
+async def extract_scope_patch(
+    scope: ScopingOutput, user_message: str, reply: str
+) -> Optional[dict]:
+    """
+    Extract add/remove/reprioritize operations from one negotiation exchange, given only
+    the current ScopingOutput (compact) and the latest turn. Returns None on failure.
+    """
+    compact = {
+        "mvp_features": [
+            {"name": f.name, "priority": f.priority, "phase": f.phase} for f in scope.mvp_features
+        ],
+        "cut_features": [c.name for c in scope.cut_features],
+    }
+    try:
+        prompt = (
+            EXTRACTION_SCOPE_PATCH_PROMPT.replace("{scope}", json.dumps(compact))
+            .replace("{user_message}", user_message)
+            .replace("{reply}", reply)
+        )
+        return await _request_json(prompt, "scope_patch")
+    except Exception:
+        return None
+
+
+def parse_structured_proposal(reply: str) -> tuple[str, Optional[ScopingOutput]]:
+    """
+    Split a single-call scoping proposal into (prose, ScopingOutput).
+    The structured part follows SCOPING_JSON_DELIMITER. Returns None for the output when
+    the delimiter or JSON is missing, or the JSON has no usable MVP features, so the
+    caller can fall back to extract_scoping_output on the prose.
+    """
+    prose, sep, tail = reply.partition(SCOPING_JSON_DELIMITER)
+    prose = prose.strip()
+    if not sep:
+        return prose, None
+    data, repaired = _parse_json_object(tail)
+    _record_parse("proposal", "failed" if data is None else ("repaired" if repaired else "ok"))
+    if data is None:
+        return prose, None
+    try:
+        output = _scoping_output_from_data(data)
+    except Exception:
+        return prose, None
+    if not output.mvp_features:
+        return prose, None
+    return prose, output
@@ -0,0 +1,170 @@
+"""Change-detection gate for discovery extraction — pure Python, no LLM.
+
+Decides per turn whether the 8B extraction call can be skipped (no new information),
+narrowed to the field(s) the PM's last question targeted, or must run in full.
+Every decision is logged and recorded in telemetry so missed extractions can be audited.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Literal, Optional
+
+from config import EXTRACTION_GATE_ENABLED, EXTRACTION_GATE_SHORT_WORDS
+from models import telemetry
+from models.schemas import ConversationState
+from tools.completeness import is_aspect_filled
+
+logger = logging.getLogger("vibe_pm.extraction_gate")
+
+# Keywords that tie a PM question (or a founder answer) to a discovery field. Matched as
+# whole words (plural "s" allowed); a trailing "*" matches any ending ("frustrat*").
+FIELD_KEYWORDS = {
+    "target_user": ("who", "target user", "ideal user", "end user", "persona", "customer", "audience", "typical day", "for whom"),
+    "core_problem": ("problem", "pain", "frustrat*", "struggle", "challenge", "how often"),
+    "current_alternatives": ("alternative", "today", "currently", "existing", "instead", "competitor", "use now"),
+    "why_now": ("why now", "timing", "right time", "changed recently", "why is now"),
+    "feature_wishlist": ("feature", "ideal solution", "build", "ship", "functionality", "one thing"),
+    "success_metric": ("metric", "measure", "success", "kpi", "working", "know it"),
+    "revenue_model": ("revenue", "monetiz*", "pay", "pricing", "price", "money", "business model"),
+    "constraints": ("constraint", "timeline", "budget", "team", "deadline", "regulat*", "limit"),
+}
+_FIELD_RES = {
+    f: re.compile(
+        "|".join(rf"\b{re.escape(k.rstrip('*'))}" + (r"\w*" if k.endswith("*") else r"s?\b") for k in kws)
+    )
+    for f, kws in FIELD_KEYWORDS.items()
+}
+
+# Replies that carry no extractable content on their own
+_FILLER = frozenset({
+    "ok", "okay", "k", "yes", "yeah", "yep", "sure", "no", "nope", "maybe", "idk",
+    "not sure", "dunno", "i don't know", "i dont know", "hmm", "hm", "fine", "cool",
+    "thanks", "thank you", "sounds good", "good", "great", "right", "correct", "true",
+    "no idea", "not really", "kind of", "kinda", "whatever", "same",
+})
+# Filler that still answers a yes/no question ("Would they pay $15/month?" - "yes")
+_YES_NO = frozenset({
+    "yes", "yeah", "yep", "sure", "no", "nope", "correct", "right", "true", "not really",
+    "definitely", "absolutely", "of course", "probably", "probably not", "never",
+})
+
+_PIVOT_MARKERS = ("actually", "instead", "change", "pivot", "rather", "scratch that", "new idea")
+
+_STOPWORDS = frozenset({
+    "the", "and", "for", "that", "this", "with", "they", "them", "their", "are", "was",
+    "but", "not", "you", "your", "our", "its", "have", "has", "just", "like", "really",
+    "would", "could", "should", "what", "when", "where", "how", "why", "who", "about",
+    "some", "any", "all", "from", "into", "then", "than", "there", "here", "also",
+    "very", "much", "more", "most", "think", "guess", "maybe", "sure", "yes", "yeah",
+    "okay", "dont", "don't", "know", "well", "kind", "sort", "thing", "things", "lot",
+})
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9'$%-]*")
+
+
+@dataclass
+class GateDecision:
+    """Outcome of the gate for one turn."""
+
+    action: Literal["skip", "narrow", "full"]
+    fields: list[str] = field(default_factory=list)
+    reason: str = ""
+
+
+def _content_words(text: str) -> set[str]:
+    return {
+        w for w in _WORD_RE.findall(text.lower())
+        if (len(w) >= 3 or any(c.isdigit() for c in w)) and w not in _STOPWORDS
+    }
+
+
+def targeted_fields(text: str) -> list[str]:
+    """Discovery fields a piece of text refers to, in FIELD_KEYWORDS order."""
+    lower = (text or "").lower()
+    return [f for f, pattern in _FIELD_RES.items() if pattern.search(lower)]
+
+
+def _last_assistant_message(state: ConversationState) -> Optional[str]:
+    for m in reversed(state.messages):
+        if m.get("role") == "assistant":
+            return m.get("content")
+    return None
+
+
+def _known_words(state: ConversationState, exclude_last_user: bool = True) -> set[str]:
+    """Content words already seen: earlier user turns plus the current summary."""
+    user_msgs = [m["content"] for m in state.messages if m.get("role") == "user"]
+    if exclude_last_user and user_msgs:
+        user_msgs = user_msgs[:-1]
+    summary_text = " ".join(
+        " ".join(v) if isinstance(v, list) else str(v)
+        for v in state.discovery_summary.model_dump().values()
+        if v
+    )
+    return _content_words(" ".join(user_msgs) + " " + summary_text)
+
+
+def decide(state: ConversationState, user_message: str) -> GateDecision:
+    """
+    Gate rules (first match wins):
+    - gate disabled, first user turn, or pivot language -> full
+    - yes/no reply to a PM question about a still-empty field -> narrow to that field
+    - filler reply -> skip
+    - no new content words -> narrow if the PM's question targeted a still-empty field, else skip
+    - short reply (<= EXTRACTION_GATE_SHORT_WORDS words) answering a targeted question -> narrow
+      to the targeted field(s) plus any fields the reply itself mentions
+    - otherwise -> full
+    Expects user_message to already be appended to state.messages.
+    """
+    msg = (user_message or "").strip()
+    lower = msg.lower().strip(" .!?")
+    user_turns = sum(1 for m in state.messages if m.get("role") == "user")
+
+    if not EXTRACTION_GATE_ENABLED:
+        return GateDecision("full", reason="gate disabled")
+    if user_turns <= 1:
+        return GateDecision("full", reason="first user turn")
+    if any(p in lower for p in _PIVOT_MARKERS):
+        return GateDecision("full", reason="pivot/correction language")
+    question = _last_assistant_message(state) or ""
+    question_fields = targeted_fields(question)
+    open_gaps = [f for f in question_fields if not is_aspect_filled(state.discovery_summary, f)]
+    if lower in _YES_NO and "?" in question and open_gaps:
+        return GateDecision("narrow", fields=open_gaps, reason="yes/no answer to an open gap")
+    if not lower or lower in _FILLER:
+        return GateDecision("skip", reason="filler reply")
+
+    new_words = _content_words(msg) - _known_words(state)
+    if not new_words:
+        # Repeating earlier words can still answer a question about a field we never captured
+        if open_gaps:
+            return GateDecision("narrow", fields=open_gaps, reason="restated answer to an open gap")
+        return GateDecision("skip", reason="no new content words")
+
+    word_count = len(msg.split())
+    if word_count <= EXTRACTION_GATE_SHORT_WORDS and question_fields:
+        fields = list(dict.fromkeys(question_fields + targeted_fields(msg)))
+        return GateDecision("narrow", fields=fields, reason=f"short answer ({word_count} words)")
+    return GateDecision("full", reason=f"{len(new_words)} new content words")
+
+
+def gate_extraction(state: ConversationState, user_message: str) -> GateDecision:
+    """decide() plus audit logging/telemetry."""
+    decision = decide(state, user_message)
+    telemetry.record(
+        "extraction_gate",
+        action=decision.action,
+        fields=decision.fields,
+        reason=decision.reason,
+        message=(user_message or "")[:120],
+    )
+    telemetry.incr(f"extraction_gate.{decision.action}")
+    logger.info(
+        "extraction gate: %s %s (%s) msg=%r",
+        decision.action,
+        decision.fields or "",
+        decision.reason,
+        (user_message or "")[:80],
+    )
+    return decision
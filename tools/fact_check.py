@@ -0,0 +1,242 @@
+"""Deterministic spec fact check: discovery-fact coverage and unsupported entities / numbers.
+
+All texts are normalized to space-separated lowercase word stems, so a phrase match is a
+substring match on word boundaries. Two Aho-Corasick automata keep each scan linear:
+- discovery facts (content words of each DiscoverySummary value) are matched against the
+  spec; a fact is covered when most of its content words appear;
+- candidate named entities and numbers found in the spec are matched against the
+  sources (transcript, summary, scoping output, deterministic render); those not found
+  are reported as unsupported. Well-known technologies and vendors are not entities to
+  verify (a spec is expected to name its stack), and entities under "Technical
+  Considerations" are not checked at all.
+"""
+
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from config import (
+    FACT_CHECK_MAX_UNSUPPORTED,
+    FACT_CHECK_MIN_COVERAGE,
+    FACT_CHECK_SMALL_NUMBER,
+    FACT_COVERAGE_MIN_SHARE,
+)
+from models.schemas import DiscoverySummary, ScopingOutput
+from tools.spec_renderer import render_spec
+from tools.templates import SPEC_TEMPLATE
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_NUMBER_RE = re.compile(r"(?<![\w.])\$?\d[\d,]*(?:\.\d+)?%?(?![\w])")
+# Capitalized tokens, joined by "of" / "for" / "&" ("Bank of America") but ending on a capitalized token
+_CAP_TOKEN = r"[A-Z][\w&'+.-]*[A-Za-z0-9]"
+_ENTITY_RE = re.compile(rf"\b{_CAP_TOKEN}(?:(?:\s+(?:&|of|for))*\s+{_CAP_TOKEN})*")
+_SENTENCE_START_RE = re.compile(r"(?:^|[.!?:]\s+|^\s*(?:[-*#>|]+\s*|\d+\.\s+))$")
+_MARKDOWN_RE = re.compile(r"[*_`#>|\[\]()]")
+_SUFFIXES = ("ings", "ing", "ers", "er", "es", "ed", "e", "s")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can for from has have in into is it its of on or so that the "
+    "their them they this to too was we who will with you your not no more most less very just "
+    "also than then when what which while each every any all some one".split()
+)
+
+
+# Imperative verbs and connectives that start spec sentences ("Use Stripe ...", "Unlike Rover ...")
+_LEADING_WORDS = frozenset(
+    "use add build store send show let allow support integrate connect host deploy run sync "
+    "track consider start offer provide require enable display create keep limit launch "
+    "unlike like after before during once only without both first next finally instead".split()
+)
+# Technologies and vendors a spec may name without the founder having mentioned them
+_TECHNOLOGIES = (
+    "React", "React Native", "Next.js", "Vue", "Svelte", "Angular", "Flutter", "Swift", "SwiftUI",
+    "Kotlin", "Expo", "Node", "Node.js", "Express", "Django", "Flask", "FastAPI", "Rails", "Laravel",
+    "Python", "TypeScript", "JavaScript", "Go", "Postgres", "PostgreSQL", "MySQL", "SQLite",
+    "MongoDB", "Redis", "Supabase", "Firebase", "Firestore", "Prisma", "GraphQL", "REST", "AWS",
+    "S3", "Lambda", "GCP", "Google", "Azure", "Microsoft", "Apple", "Amazon", "Vercel", "Netlify",
+    "Heroku", "Render", "Fly.io", "Cloudflare", "Docker", "Kubernetes", "Stripe", "PayPal",
+    "Twilio", "SendGrid", "Mailgun", "Postmark", "Resend", "Auth0", "Clerk", "OAuth", "Okta",
+    "OpenAI", "Anthropic", "Groq", "LLM", "GPT", "Mapbox", "Algolia", "Sentry", "Segment",
+    "Mixpanel", "Amplitude", "PostHog", "Zapier", "Slack", "Discord", "WhatsApp", "Shopify",
+    "Webflow", "Bubble", "Airtable", "Notion", "Calendly", "Zoom", "iOS", "Android", "API",
+    "SDK", "SMS", "PWA", "GDPR", "HIPAA", "SOC", "CSV", "JSON", "PDF", "URL", "UI", "UX",
+)
+
+
+def _stem(word: str) -> str:
+    if word[0].isdigit():
+        return word.rstrip("0").rstrip(".") if "." in word else word
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith("ss"):
+            return word[: -len(suffix)]
+    return word
+
+
+def normalize(text: str) -> str:
+    """' stem stem ... ' (lowercase, accents stripped, thousands separators removed, padded)."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    text = re.sub(r"(?<=\d),(?=\d{3})", "", text)
+    return " " + " ".join(_stem(w) for w in _WORD_RE.findall(text)) + " "
+
+
+_TECH_KEYS = frozenset(normalize(t).strip() for t in _TECHNOLOGIES)
+
+
+def _is_technology(key: str) -> bool:
+    """Entity names a known technology or a product of one ("Stripe Connect", "Google Calendar")."""
+    words = key.split()
+    return any(" ".join(words[:n]) in _TECH_KEYS for n in (1, 2))
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: which of the patterns occur in a text, in one pass over it."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(patterns)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        for i, pattern in enumerate(self.patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(i)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def found(self, text: str) -> set[int]:
+        """Indices of patterns occurring anywhere in text."""
+        hits: set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            if self._out[node]:
+                hits.update(self._out[node])
+        return hits
+
+
+@dataclass
+class FactReport:
+    facts: list[str] = field(default_factory=list)  # "field: value"
+    covered: list[str] = field(default_factory=list)
+    unsupported_entities: list[str] = field(default_factory=list)
+    unsupported_numbers: list[str] = field(default_factory=list)
+
+    @property
+    def coverage(self) -> float:
+        return len(self.covered) / len(self.facts) if self.facts else 1.0
+
+    @property
+    def missing(self) -> list[str]:
+        return [f for f in self.facts if f not in self.covered]
+
+    @property
+    def unsupported(self) -> list[str]:
+        return self.unsupported_entities + self.unsupported_numbers
+
+    def ok(
+        self, min_coverage: float = FACT_CHECK_MIN_COVERAGE, max_unsupported: int = FACT_CHECK_MAX_UNSUPPORTED
+    ) -> bool:
+        return self.coverage >= min_coverage and len(self.unsupported) <= max_unsupported
+
+
+def discovery_facts(summary: DiscoverySummary) -> list[tuple[str, list[str]]]:
+    """("field: value", content-word stems) for each non-empty discovery value."""
+    facts = []
+    for name, value in summary.model_dump().items():
+        for item in value if isinstance(value, list) else [value]:
+            if not item or not str(item).strip():
+                continue
+            words = [w for w in normalize(str(item)).split() if w not in _STOPWORDS and len(w) > 2]
+            if words:
+                facts.append((f"{name}: {item}", list(dict.fromkeys(words))))
+    return facts
+
+
+def _spec_candidates(spec_md: str) -> tuple[dict[str, str], dict[str, str]]:
+    """Named-entity and number candidates in the spec: {normalized: as written}."""
+    entities: dict[str, str] = {}
+    numbers: dict[str, str] = {}
+    check_entities = True
+    for line in spec_md.splitlines():
+        heading = re.match(r"\s*(#{1,2})\s+(.*)", line)
+        if heading:
+            check_entities = "technical considerations" not in heading.group(2).lower()
+        if line.lstrip().startswith("#"):
+            continue  # headings come from the template
+        for m in _NUMBER_RE.finditer(line):
+            raw = m.group(0)
+            key = normalize(raw).strip()
+            try:
+                small = float(key) <= FACT_CHECK_SMALL_NUMBER and not raw.startswith("$")
+            except ValueError:
+                small = False
+            if key and not small:
+                numbers.setdefault(key, raw)
+        for m in _ENTITY_RE.finditer(line) if check_entities else ():
+            words = m.group(0).split()
+            at_start = bool(_SENTENCE_START_RE.search(_MARKDOWN_RE.sub("", line[: m.start()])))
+            if at_start and (words[0].lower() in _STOPWORDS or words[0].lower() in _LEADING_WORDS):
+                words = words[1:]  # "The Session ...", "Use Next.js ..." at a sentence start
+            while words and words[0].lower() in _STOPWORDS:
+                words = words[1:]  # connective left at the front by the cut above
+            if not words or (at_start and len(words) == 1):
+                continue  # a single capitalized word starting a sentence or list item
+            key = normalize(" ".join(words)).strip()
+            if key and any(w not in _STOPWORDS for w in key.split()) and not _is_technology(key):
+                entities.setdefault(key, " ".join(words))
+    return entities, numbers
+
+
+def check_spec_facts(
+    spec_md: str,
+    summary: DiscoverySummary,
+    scope: Optional[ScopingOutput] = None,
+    sources: Iterable[str] = (),
+) -> FactReport:
+    """
+    Coverage of the discovery facts in spec_md, and the spec's named entities / numbers
+    that appear in none of: summary, scope, sources (transcript etc.), the spec template
+    and the deterministic render of summary + scope.
+    """
+    report = FactReport()
+    spec_norm = normalize(spec_md)
+
+    facts = discovery_facts(summary)
+    words = sorted({w for _, ws in facts for w in ws})
+    found = AhoCorasick(f" {w} " for w in words).found(spec_norm)
+    present = {words[i] for i in found}
+    for label, ws in facts:
+        report.facts.append(label)
+        if sum(w in present for w in ws) >= FACT_COVERAGE_MIN_SHARE * len(ws):
+            report.covered.append(label)
+
+    entities, numbers = _spec_candidates(spec_md)
+    candidates = list(entities) + list(numbers)
+    if candidates:
+        corpus = [summary.model_dump_json(), SPEC_TEMPLATE, render_spec(summary, scope), *sources]
+        if scope is not None:
+            corpus.append(scope.model_dump_json())
+        supported_idx = AhoCorasick(f" {c} " for c in candidates).found(normalize("\n".join(corpus)))
+        supported = {candidates[i] for i in supported_idx}
+        report.unsupported_entities = [entities[k] for k in entities if k not in supported]
+        report.unsupported_numbers = [numbers[k] for k in numbers if k not in supported]
+    return report
@@ -0,0 +1,252 @@
+"""Local similar-idea index: MinHash signatures of DiscoverySummary text with LSH banding.
+
+Every finished session is appended to an on-disk JSONL log (summary, ScopingOutput, spec)
+together with its MinHash signature. At load the log is replayed into memory and the
+signatures are bucketed by LSH band, so a lookup hashes the new summary once, reads the
+candidates sharing at least one band, and ranks them by estimated Jaccard similarity
+(share of equal signature slots). Later records with the same id supersede earlier ones
+and deletions are tombstones; compact() rewrites the log with live records only.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from config import (
+    IDEA_INDEX_BANDS,
+    IDEA_INDEX_DIR,
+    IDEA_INDEX_ENABLED,
+    IDEA_INDEX_MIN_SIMILARITY,
+    IDEA_INDEX_NUM_PERM,
+)
+from models import telemetry
+from models.schemas import DiscoverySummary, ScopingOutput
+
+logger = logging.getLogger("vibe_pm.idea_index")
+
+LOG_FILE = "ideas.jsonl"
+_PRIME = np.uint64((1 << 31) - 1)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and app are as at be but by for from has have i in into is it its of on or our so that "
+    "the their them they this to too up want we who with you your".split()
+)
+
+
+@dataclass
+class IdeaMatch:
+    id: str
+    similarity: float  # estimated Jaccard similarity of the summaries' shingle sets
+    summary: DiscoverySummary
+    scoping_output: Optional[ScopingOutput]
+    spec_markdown: Optional[str]
+
+
+def _tokens(text: str) -> list[str]:
+    words = [w for w in _TOKEN_RE.findall(text.lower()) if w not in _STOPWORDS]
+    return [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w for w in words]
+
+
+def summary_shingles(summary: DiscoverySummary) -> set[str]:
+    """Word unigrams and bigrams (within each field) of the fields that identify an idea."""
+    fields = [summary.target_user or "", summary.core_problem or ""]
+    fields += list(summary.feature_wishlist) + list(summary.current_alternatives)
+    shingles: set[str] = set()
+    for text in fields:
+        words = _tokens(text)
+        shingles.update(words)
+        shingles.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return shingles
+
+
+def _permutations(num_perm: int) -> tuple[np.ndarray, np.ndarray]:
+    """Fixed (seeded) hash-permutation coefficients, so signatures are stable across runs."""
+    rng = np.random.RandomState(1)
+    a = rng.randint(1, int(_PRIME), size=num_perm).astype(np.uint64)
+    b = rng.randint(0, int(_PRIME), size=num_perm).astype(np.uint64)
+    return a, b
+
+
+def minhash(shingles: set[str], a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """MinHash signature: per permutation, the minimum of (a*x + b) mod p over shingle hashes x."""
+    if not shingles:
+        return np.full(len(a), int(_PRIME), dtype=np.uint64)
+    x = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little") % int(_PRIME) for s in shingles],
+        dtype=np.uint64,
+    )
+    return ((np.outer(x, a) + b) % _PRIME).min(axis=0)
+
+
+class IdeaIndex:
+    """Append-only on-disk log of finished sessions with an in-memory LSH index over it."""
+
+    def __init__(self, directory: Path, num_perm: int, bands: int, enabled: bool = True):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.directory = Path(directory)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.enabled = enabled
+        self._a, self._b = _permutations(num_perm)
+        self._records: Optional[dict[str, dict]] = None  # id -> record (lazy-loaded)
+        self._signatures: dict[str, np.ndarray] = {}
+        self._buckets: dict[tuple, set[str]] = {}
+        self._log_lines = 0
+
+    @property
+    def path(self) -> Path:
+        return self.directory / LOG_FILE
+
+    def signature(self, summary: DiscoverySummary) -> np.ndarray:
+        return minhash(summary_shingles(summary), self._a, self._b)
+
+    def _band_keys(self, signature: np.ndarray) -> list[tuple]:
+        return [(i, signature[i * self.rows:(i + 1) * self.rows].tobytes()) for i in range(self.bands)]
+
+    def _index(self, record_id: str, signature: np.ndarray) -> None:
+        self._unindex(record_id)
+        self._signatures[record_id] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(record_id)
+
+    def _unindex(self, record_id: str) -> None:
+        old = self._signatures.pop(record_id, None)
+        if old is not None:
+            for key in self._band_keys(old):
+                self._buckets.get(key, set()).discard(record_id)
+
+    def _load(self) -> dict[str, dict]:
+        """Replay the log once: later lines win, tombstones delete, torn lines are skipped."""
+        if self._records is not None:
+            return self._records
+        self._records = {}
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                record_id = entry["id"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            self._log_lines += 1
+            if entry.get("deleted"):
+                self._records.pop(record_id, None)
+                self._unindex(record_id)
+                continue
+            signature = np.array(entry.get("signature") or [], dtype=np.uint64)
+            if signature.shape != (self.num_perm,):
+                signature = self.signature(DiscoverySummary(**entry.get("summary", {})))
+            self._records[record_id] = entry
+            self._index(record_id, signature)
+        return self._records
+
+    def _append(self, entry: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._log_lines += 1
+
+    def add(
+        self,
+        summary: DiscoverySummary,
+        scoping_output: Optional[ScopingOutput],
+        spec_markdown: Optional[str],
+        record_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """Append a finished session; returns its id (None when disabled or the write failed)."""
+        if not self.enabled:
+            return None
+        records = self._load()
+        signature = self.signature(summary)
+        entry = {
+            "id": record_id or uuid.uuid4().hex,
+            "ts": time.time(),
+            "signature": signature.tolist(),
+            "summary": summary.model_dump(mode="json"),
+            "scoping_output": scoping_output.model_dump(mode="json") if scoping_output else None,
+            "spec_markdown": spec_markdown,
+        }
+        try:
+            self._append(entry)
+        except OSError as e:
+            logger.warning("idea index write failed: %s", e)
+            return None
+        records[entry["id"]] = entry
+        self._index(entry["id"], signature)
+        telemetry.incr("idea_index.added")
+        return entry["id"]
+
+    def delete(self, record_id: str) -> bool:
+        records = self._load()
+        if record_id not in records:
+            return False
+        self._append({"id": record_id, "deleted": True, "ts": time.time()})
+        records.pop(record_id)
+        self._unindex(record_id)
+        return True
+
+    def query(
+        self, summary: DiscoverySummary, k: int = 1, min_similarity: float = IDEA_INDEX_MIN_SIMILARITY
+    ) -> list[IdeaMatch]:
+        """Up to k prior sessions most similar to summary (estimated Jaccard >= min_similarity)."""
+        if not self.enabled:
+            return []
+        records = self._load()
+        if not records or not summary_shingles(summary):
+            return []
+        signature = self.signature(summary)
+        candidates: set[str] = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+        scored = sorted(
+            ((float(np.mean(self._signatures[c] == signature)), c) for c in candidates),
+            reverse=True,
+        )
+        matches = []
+        for similarity, record_id in scored[:k]:
+            if similarity < min_similarity:
+                break
+            entry = records[record_id]
+            scope = entry.get("scoping_output")
+            matches.append(
+                IdeaMatch(
+                    id=record_id,
+                    similarity=round(similarity, 3),
+                    summary=DiscoverySummary(**entry["summary"]),
+                    scoping_output=ScopingOutput(**scope) if scope else None,
+                    spec_markdown=entry.get("spec_markdown"),
+                )
+            )
+        telemetry.incr("idea_index.hit" if matches else "idea_index.miss")
+        return matches
+
+    def compact(self) -> int:
+        """Rewrite the log with live records only (atomic replace). Returns lines dropped."""
+        records = self._load()
+        before = self._log_lines
+        if not self.path.exists():
+            return 0
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for entry in records.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+        self._log_lines = len(records)
+        return before - self._log_lines
+
+
+idea_index = IdeaIndex(Path(IDEA_INDEX_DIR), IDEA_INDEX_NUM_PERM, IDEA_INDEX_BANDS, enabled=IDEA_INDEX_ENABLED)
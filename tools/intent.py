@@ -1,10 +1,53 @@
-"""User intent classification for discovery review and scoping agreement."""
+"""User intent classification for discovery review, scoping agreement and spec edits."""
+
+import re
 
 from prompts.extraction import (
     CLASSIFY_DISCOVERY_REVIEW_PROMPT,
     CLASSIFY_SCOPING_INTENT_PROMPT,
+    CLASSIFY_SPEC_EDIT_PROMPT,
 )
+from config import ARGUE_BACK_AFFIRMATION_MAX_WORDS
 from models.llm import llm_call
+from tools.spec_sections import sections_mentioned
+from tools.templates import SPEC_SECTIONS
+
+# A done-phase message is only taken as an edit on keywords alone when it asks for a change
+_EDIT_VERB_RE = re.compile(
+    r"\b(change|add|remove|delete|drop|cut|rename|replace|rewrite|reword|update|make|move|swap|"
+    r"switch|include|expand|shorten|simplify|fix|edit|revise|merge|split|adjust|reduce|increase|"
+    r"lower|raise|bump|push|reorder|reprioriti[sz]e|mention)\b",
+    re.IGNORECASE,
+)
+# Questions about the spec ("why did you cut X?"), unlike requests ("can you cut X?")
+_QUESTION_START_RE = re.compile(
+    r"^\W*(why|what|how|who|which|when|where|is|are|does|do|did|was|were|has|have)\b", re.IGNORECASE
+)
+
+
+# Short scoping replies that agree rather than push back ("ok", "sounds good, ship it")
+_AFFIRMATION_RE = re.compile(
+    r"^\W*(yes|yeah|yep|yup|ok|okay|sure|great|perfect|agreed?|lgtm|deal|love it|ship it|go ahead|"
+    r"sounds (good|great|fine|right)|looks (good|great|fine|right)|let'?s (go|do it|proceed|build it))\b",
+    re.IGNORECASE,
+)
+_CONTRAST_RE = re.compile(r"\b(but|except|although|though|however)\b", re.IGNORECASE)
+
+
+def _asks_for_change(text: str) -> bool:
+    return bool(_EDIT_VERB_RE.search(text)) and not _QUESTION_START_RE.match(text)
+
+
+def likely_scoping_pushback(user_response: str) -> bool:
+    """
+    Cheap guess, before the classifier answers, whether a scoping reply is PUSHBACK:
+    questions and short unqualified affirmations are not worth a speculative argue-back.
+    """
+    text = user_response.strip()
+    if "?" in text:
+        return False
+    short = len(text.split()) <= ARGUE_BACK_AFFIRMATION_MAX_WORDS
+    return not (short and _AFFIRMATION_RE.match(text) and not _CONTRAST_RE.search(text))
 
 
 async def classify_discovery_review(user_response: str) -> bool:
@@ -40,3 +83,22 @@ async def classify_scoping_intent(user_response: str) -> str:
         return "PUSHBACK"  # default to treat as pushback if unclear
     except Exception:
         return "PUSHBACK"
+
+
+async def classify_spec_edit(user_response: str) -> list[str]:
+    """
+    Which spec sections (ids from SPEC_SECTIONS) does a done-phase message ask to change?
+    A change request that names its sections is answered by keyword match (no LLM call);
+    anything else (praise, questions, unnamed sections) goes to the classifier, which can
+    answer NONE. [] means not an edit.
+    """
+    mentioned = sections_mentioned(user_response)
+    if mentioned and _asks_for_change(user_response):
+        return mentioned
+    try:
+        prompt = CLASSIFY_SPEC_EDIT_PROMPT.format(user_response=user_response.strip())
+        raw = await llm_call("classification", [{"role": "user", "content": prompt}])
+    except Exception:
+        return []
+    lower = raw.lower()
+    return [s for s in SPEC_SECTIONS if s in lower]
@@ -0,0 +1,136 @@
+"""Tolerant incremental JSON parser: repairs truncated / trailing-comma JSON objects as tokens stream in."""
+
+import json
+from typing import Optional
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class StreamingJSONParser:
+    """
+    Feed chunks of model output; get the best-effort top-level JSON object at any point.
+
+    Text before the first "{" (prose, ``` fences) and after the top-level object closes is
+    ignored. Trailing commas before "}" / "]" are dropped as they arrive. partial() closes
+    any open string, array and object, falling back to the last complete member when the
+    tail is mid-key or mid-literal. Scanning is O(total chars); each partial() costs
+    O(nesting depth) plus one json.loads.
+    """
+
+    def __init__(self) -> None:
+        self._buf: list[str] = []
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self.complete = False
+        self.repaired = False
+        # Last position where the buffer can be cut and closed cleanly, with the stack at that point
+        self._safe_len = 0
+        self._safe_stack: tuple[str, ...] = ()
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of text."""
+        for ch in chunk:
+            if self.complete:
+                return
+            if not self._started:
+                if ch != "{":
+                    continue
+                self._started = True
+            self._consume(ch)
+
+    def _consume(self, ch: str) -> None:
+        buf = self._buf
+        if self._in_string:
+            buf.append(ch)
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+            elif ch == "\n":
+                # Raw newline inside a string is invalid JSON; keep it escaped
+                buf[-1] = "\\n"
+                self.repaired = True
+            return
+        if ch == '"':
+            self._in_string = True
+            buf.append(ch)
+        elif ch in _CLOSERS:
+            self._stack.append(ch)
+            buf.append(ch)
+            self._mark_safe()
+        elif ch in "}]":
+            self._drop_trailing_comma()
+            if self._stack:
+                self._stack.pop()
+            buf.append(ch)
+            self._mark_safe()
+            if not self._stack:
+                self.complete = True
+        elif ch == ",":
+            # Cutting just before the comma leaves the previous member complete
+            self._safe_len = self._trimmed_len()
+            self._safe_stack = tuple(self._stack)
+            buf.append(ch)
+        else:
+            buf.append(ch)
+
+    def _trimmed_len(self) -> int:
+        n = len(self._buf)
+        while n and self._buf[n - 1].isspace():
+            n -= 1
+        return n
+
+    def _mark_safe(self) -> None:
+        self._safe_len = len(self._buf)
+        self._safe_stack = tuple(self._stack)
+
+    def _drop_trailing_comma(self) -> None:
+        n = self._trimmed_len()
+        if n and self._buf[n - 1] == ",":
+            del self._buf[n - 1:]
+            self.repaired = True
+
+    @staticmethod
+    def _close(text: str, stack) -> str:
+        text = text.rstrip()
+        if text.endswith(","):
+            text = text[:-1]
+        return text + "".join(_CLOSERS[c] for c in reversed(stack))
+
+    def _load(self, text: str) -> Optional[dict]:
+        try:
+            out = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return out if isinstance(out, dict) else None
+
+    def partial(self) -> Optional[dict]:
+        """Best-effort object for the text seen so far (None before any "{" arrives)."""
+        if not self._started:
+            return None
+        text = "".join(self._buf)
+        if self.complete:
+            return self._load(text)
+        closed = text + ('"' if self._in_string else "")
+        out = self._load(self._close(closed, self._stack))
+        if out is None:
+            out = self._load(self._close(text[: self._safe_len], self._safe_stack))
+        return out
+
+    def result(self) -> Optional[dict]:
+        """Final object; marks the parse as repaired when the object never closed."""
+        out = self.partial()
+        if out is not None and not self.complete:
+            self.repaired = True
+        return out
+
+
+def repair_json(text: str) -> Optional[dict]:
+    """Parse a JSON object from model output, repairing truncation and trailing commas."""
+    parser = StreamingJSONParser()
+    parser.feed(text)
+    return parser.result()
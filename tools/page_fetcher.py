@@ -0,0 +1,260 @@
+"""Comparable-page enrichment: concurrent fetch, main-text extraction, HTTP cache, 8B summaries.
+
+Pages are fetched with httpx under a per-host connection limit and one overall deadline;
+whatever is not done by then is cancelled and simply left out. Fetched pages are cached
+on disk with their ETag / Last-Modified validators, so a repeat fetch is a conditional
+request (304 -> cached text) and pages fetched within PAGE_CACHE_FRESH_S are not
+requested at all. Bodies are streamed and cut off at PAGE_MAX_BYTES, so a huge or
+endless page cannot exhaust memory. The httpx client is injectable (e.g.
+httpx.MockTransport or a client pointed at a local fixture server).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+from urllib.parse import urlsplit
+
+from config import (
+    ENRICH_DEADLINE_S,
+    ENRICH_FETCH_TIMEOUT_S,
+    ENRICH_MAX_PAGES,
+    ENRICH_PER_HOST_LIMIT,
+    PAGE_CACHE_DIR,
+    PAGE_CACHE_FRESH_S,
+    PAGE_MAX_BYTES,
+    PAGE_TEXT_MAX_CHARS,
+)
+from models import providers, telemetry
+from models.llm import llm_call
+from prompts.scoping import COMPARABLE_PAGE_SUMMARY_PROMPT
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger("vibe_pm.page_fetcher")
+
+USER_AGENT = "Mozilla/5.0 (compatible; VibePM/1.0; comparable-product research)"
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "svg", "nav", "header", "footer", "aside", "form", "template"})
+_BLOCK_TAGS = frozenset({"p", "div", "section", "article", "li", "h1", "h2", "h3", "h4", "br", "tr", "main"})
+_SPACE_RE = re.compile(r"[ \t\r\f\v]+")
+
+
+class _MainTextParser(HTMLParser):
+    """Visible text outside boilerplate containers, with block boundaries as newlines."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self.title = ""
+        self.description = ""
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            a = dict(attrs)
+            if (a.get("name") or a.get("property") or "").lower() in ("description", "og:description"):
+                self.description = self.description or (a.get("content") or "").strip()
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self.parts.append(data)
+
+
+def extract_main_text(html: str, max_chars: int = PAGE_TEXT_MAX_CHARS) -> str:
+    """Title, meta description and body text (boilerplate containers dropped), whitespace collapsed."""
+    parser = _MainTextParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+    lines = [_SPACE_RE.sub(" ", line).strip() for line in "".join(parser.parts).splitlines()]
+    # Short fragments are mostly menus, buttons and cookie banners
+    body = "\n".join(line for line in lines if len(line.split()) >= 4)
+    head = "\n".join(x for x in (parser.title.strip(), parser.description) if x)
+    return (head + "\n\n" + body).strip()[:max_chars]
+
+
+async def _read_capped(response: "httpx.Response", max_bytes: int) -> str:
+    """Body of a streamed response, decoded, reading at most max_bytes."""
+    chunks, size = [], 0
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes:
+            telemetry.incr("page_fetch.truncated")
+            break
+    return b"".join(chunks)[:max_bytes].decode(response.charset_encoding or "utf-8", errors="replace")
+
+
+class PageCache:
+    """One JSON file per URL: extracted text plus ETag / Last-Modified validators."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[dict]:
+        try:
+            return json.loads(self._path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, text: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        entry = {"url": url, "text": text, "etag": etag, "last_modified": last_modified, "fetched": time.time()}
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(url))
+        except OSError as e:
+            logger.warning("page cache write failed: %s", e)
+
+
+class PageFetcher:
+    """Concurrent fetcher with a per-host connection limit and conditional requests."""
+
+    def __init__(
+        self,
+        client: Optional["httpx.AsyncClient"] = None,
+        cache: Optional[PageCache] = None,
+        per_host: int = ENRICH_PER_HOST_LIMIT,
+        timeout_s: float = ENRICH_FETCH_TIMEOUT_S,
+        fresh_s: float = PAGE_CACHE_FRESH_S,
+        max_bytes: int = PAGE_MAX_BYTES,
+    ):
+        self._client = client
+        self.cache = cache if cache is not None else PageCache(PAGE_CACHE_DIR)
+        self.per_host = per_host
+        self.timeout_s = timeout_s
+        self.fresh_s = fresh_s
+        self.max_bytes = max_bytes
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return self._host_slots[host]
+
+    async def fetch_text(self, client: "httpx.AsyncClient", url: str) -> Optional[str]:
+        """Main text of url (from cache when fresh or not modified), or None on failure."""
+        cached = self.cache.get(url)
+        if cached and time.time() - cached.get("fetched", 0) < self.fresh_s:
+            telemetry.incr("page_fetch.cache_fresh")
+            return cached["text"]
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        html = None
+        async with self._slot(url):
+            try:
+                async with client.stream(
+                    "GET", url, headers=headers, timeout=self.timeout_s, follow_redirects=True
+                ) as response:
+                    status = response.status_code
+                    if status == 200 and "html" in response.headers.get("content-type", "html"):
+                        html = await _read_capped(response, self.max_bytes)
+            except providers.httpx().HTTPError as e:
+                telemetry.incr("page_fetch.error")
+                logger.debug("fetch %s failed: %s", url, e)
+                return cached["text"] if cached else None
+        if status == 304 and cached:
+            telemetry.incr("page_fetch.not_modified")
+            self.cache.put(url, cached["text"], cached.get("etag"), cached.get("last_modified"))
+            return cached["text"]
+        if html is None:
+            telemetry.incr("page_fetch.error")
+            return cached["text"] if cached else None
+        text = extract_main_text(html)
+        self.cache.put(url, text, response.headers.get("etag"), response.headers.get("last-modified"))
+        telemetry.incr("page_fetch.fetched")
+        return text
+
+    async def fetch_all(self, urls: list[str], deadline_s: float = ENRICH_DEADLINE_S) -> dict[str, str]:
+        """Fetch urls concurrently; returns {url: text} for pages done (non-empty) by the deadline."""
+        if not urls:
+            return {}
+        client = self._client or providers.httpx().AsyncClient(headers={"User-Agent": USER_AGENT})
+        try:
+            tasks = {asyncio.ensure_future(self.fetch_text(client, u)): u for u in urls}
+            done, pending = await asyncio.wait(tasks, timeout=deadline_s)
+            for task in pending:
+                task.cancel()
+            if pending:
+                telemetry.incr("page_fetch.deadline", len(pending))
+            return {tasks[t]: t.result() for t in done if not t.exception() and t.result()}
+        finally:
+            if self._client is None:
+                await client.aclose()
+
+
+async def summarize_page(title: str, url: str, text: str) -> Optional[str]:
+    """Short factual summary of one page with the extraction model; None on failure."""
+    prompt = COMPARABLE_PAGE_SUMMARY_PROMPT.format(title=title, url=url, text=text)
+    try:
+        return (await llm_call("extraction", [{"role": "user", "content": prompt}])).strip() or None
+    except Exception:
+        return None
+
+
+async def enrich_comparables(
+    results: list[dict[str, Any]],
+    fetcher: Optional[PageFetcher] = None,
+    max_pages: int = ENRICH_MAX_PAGES,
+    deadline_s: float = ENRICH_DEADLINE_S,
+) -> dict[str, str]:
+    """
+    {href: summary} for the top comparable results with a URL: pages fetched concurrently,
+    then summarized in parallel, all within deadline_s. Missing entries mean "use the snippet".
+    """
+    started = time.monotonic()
+    targets = [r for r in results if isinstance(r, dict) and r.get("href")][:max_pages]
+    if not targets:
+        return {}
+    fetcher = fetcher or PageFetcher()
+    texts = await fetcher.fetch_all([r["href"] for r in targets], deadline_s)
+    remaining = deadline_s - (time.monotonic() - started)
+    jobs = {
+        r["href"]: asyncio.ensure_future(summarize_page(r.get("title") or "", r["href"], texts[r["href"]]))
+        for r in targets
+        if r["href"] in texts
+    }
+    if not jobs:
+        return {}
+    done, pending = await asyncio.wait(jobs.values(), timeout=max(remaining, 0.1))
+    for task in pending:
+        task.cancel()
+    summaries = {href: t.result() for href, t in jobs.items() if t in done and t.result()}
+    telemetry.record("comparable_enrichment", pages=len(targets), fetched=len(texts), summarized=len(summaries))
+    return summaries
@@ -0,0 +1,254 @@
+"""Effort-budgeted phase planner: assigns features to phases 1/2/3 without an LLM.
+
+Capacity comes from DiscoverySummary.constraints (team size, overall timeline) and the
+per-phase week budgets in config. Each phase is filled in turn by an exact 0/1 knapsack
+over the unassigned features (value = locally computed RICE score, weight = rice_effort
+in person-weeks) with dependency constraints: a feature is only chosen together with the
+unplaced features it depends_on, so no feature lands before its dependencies, and a
+dependency shared by several chosen features is counted once. The search is branch and
+bound (MVP scopes are a few dozen features at most), capped at PHASE_PLANNER_MAX_NODES.
+Priority bounds the search: P0 features are always in phase 1 and P2 features are never
+chosen for it. Pinned features (phases the founder set explicitly) are placed in their
+phase as given. Required features, and the dependencies they pull in, are placed
+first and the knapsack fills whatever budget is left.
+Whatever does not fit phase 3 is reported as overflow and kept in phase 3.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from config import (
+    PHASE_PLANNER_DEFAULT_EFFORT,
+    PHASE_PLANNER_DEFAULT_TEAM,
+    PHASE_PLANNER_EFFORT_STEP,
+    PHASE_PLANNER_MAX_NODES,
+    PHASE_WEEK_BUDGETS,
+)
+from models.schemas import ImplementationPhase, ScopingOutput
+from tools.rice import score_features
+from tools.spec_renderer import DEFAULT_PHASE_GOALS, DEFAULT_PHASE_NAMES
+
+_NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "ten": 10}
+_NUM = r"(\d+(?:\.\d+)?|" + "|".join(_NUMBER_WORDS) + r")"
+_TEAM_RE = re.compile(_NUM + r"\s*(?:-\s*person|full[- ]time\s+)?\s*(?:developers?|devs?|engineers?|people|persons?|co-?founders?)\b", re.I)
+_SOLO_RE = re.compile(r"\b(solo|just me|by myself|on my own|alone|one[- ]person|single developer)\b", re.I)
+_WEEKS_RE = re.compile(_NUM + r"\s*(weeks?|wks?|months?)\b", re.I)
+
+# Priority weights stand in for RICE value when a feature has no computable score
+_PRIORITY_VALUE = {"P0": 3.0, "P1": 2.0, "P2": 1.0}
+
+
+@dataclass
+class Capacity:
+    """Team size and per-phase person-week budgets."""
+
+    team_size: float
+    phase_weeks: tuple[float, float, float]
+    source: str = "default"
+
+    @property
+    def phase_budgets(self) -> tuple[float, ...]:
+        return tuple(w * self.team_size for w in self.phase_weeks)
+
+
+@dataclass
+class PlannedPhase:
+    number: int
+    features: list[str] = field(default_factory=list)
+    effort: float = 0.0  # person-weeks
+    value: float = 0.0
+    budget: float = 0.0  # person-weeks
+
+    def weeks(self, team_size: float) -> int:
+        return max(1, math.ceil(self.effort / max(team_size, 1e-9)))
+
+
+@dataclass
+class PhasePlan:
+    capacity: Capacity
+    phases: list[PlannedPhase]
+    overflow: list[str] = field(default_factory=list)  # did not fit any budget (left in phase 3)
+
+
+def _to_number(token: str) -> float:
+    return float(_NUMBER_WORDS.get(token.lower(), token))
+
+
+def parse_capacity(constraints: Optional[str]) -> Capacity:
+    """
+    Team size and timeline from free-text constraints ("2 devs, 6 weeks", "solo founder,
+    3 months"). An overall timeline shorter than the summed phase budgets scales them down.
+    """
+    text = constraints or ""
+    team = PHASE_PLANNER_DEFAULT_TEAM
+    source = "default"
+    m = _TEAM_RE.search(text)
+    if m:
+        team, source = max(_to_number(m.group(1)), 1.0), "constraints"
+    elif _SOLO_RE.search(text):
+        team, source = 1.0, "constraints"
+
+    weeks = tuple(float(w) for w in PHASE_WEEK_BUDGETS)
+    m = _WEEKS_RE.search(text)
+    if m:
+        total = _to_number(m.group(1)) * (4.33 if m.group(2).lower().startswith("month") else 1.0)
+        if total < sum(weeks):
+            scale = total / sum(weeks)
+            weeks = tuple(w * scale for w in weeks)
+        source = "constraints"
+    return Capacity(team_size=team, phase_weeks=weeks, source=source)
+
+
+def _knapsack(
+    values: np.ndarray,
+    weights: np.ndarray,
+    closures: dict[int, frozenset],
+    capacity: int,
+    max_nodes: int = PHASE_PLANNER_MAX_NODES,
+) -> set[int]:
+    """
+    Exact 0/1 knapsack with dependency constraints, by branch and bound: the most valuable
+    set of candidates (the keys of closures) within capacity that holds the whole closure of
+    every feature in it. Stops after max_nodes with the best set found so far.
+    """
+    order = sorted(closures, key=lambda i: -values[i] / max(weights[i], 1))
+    dependents = {i: frozenset(j for j in closures if i in closures[j]) for i in closures}
+    best_value, best, nodes = 0.0, frozenset(), 0
+
+    def bound(k: int, decided: frozenset, room: int) -> float:
+        # Fractional knapsack over the undecided features, dependencies relaxed
+        extra = 0.0
+        for i in order[k:]:
+            if i in decided:
+                continue
+            if weights[i] > room:
+                return extra + values[i] * room / weights[i]
+            room -= weights[i]
+            extra += values[i]
+        return extra
+
+    def search(k: int, chosen: frozenset, excluded: frozenset, weight: int, value: float) -> None:
+        nonlocal best_value, best, nodes
+        nodes += 1
+        if value > best_value:
+            best_value, best = value, chosen
+        if k == len(order) or nodes > max_nodes:
+            return
+        if value + bound(k, chosen | excluded, capacity - weight) <= best_value + 1e-9:
+            return
+        i = order[k]
+        if i in chosen or i in excluded:
+            search(k + 1, chosen, excluded, weight, value)
+            return
+        add = closures[i] - chosen
+        add_weight = int(sum(weights[j] for j in add))
+        if not add & excluded and weight + add_weight <= capacity:
+            search(k + 1, chosen | add, excluded, weight + add_weight, value + float(sum(values[j] for j in add)))
+        # Leaving i out also rules out everything that depends on it
+        search(k + 1, chosen, excluded | dependents[i], weight, value)
+
+    search(0, frozenset(), frozenset(), 0, 0.0)
+    return set(best)
+
+
+def _closure(i: int, deps: list[list[int]], placed, fixed=()) -> list[int]:
+    """Feature i plus its transitive dependencies that are not placed (nor fixed elsewhere) yet."""
+    out, stack = {i}, [i]
+    while stack:
+        for d in deps[stack.pop()]:
+            if d not in out and d not in placed and d not in fixed:
+                out.add(d)
+                stack.append(d)
+    return sorted(out)
+
+
+def plan_phases(
+    scope: ScopingOutput, capacity: Capacity, pinned: Optional[dict[str, int]] = None
+) -> PhasePlan:
+    """
+    Allocate scope.mvp_features to phases 1-3 maximizing value within each phase budget.
+    pinned maps feature names to the phase they must stay in (unknown names are ignored).
+    """
+    features = scope.mvp_features
+    names = [f.name for f in features]
+    index = {n: i for i, n in enumerate(names)}
+    fixed = {index[n]: p for n, p in (pinned or {}).items() if n in index and p in (1, 2, 3)}
+    report = score_features(features)
+    scored = report.computed[~np.isnan(report.computed)]
+    unit = float(np.median(scored)) if scored.size else 1.0
+    values = np.array([
+        report.computed[i] if not np.isnan(report.computed[i]) else _PRIORITY_VALUE[f.priority] * unit
+        for i, f in enumerate(features)
+    ])
+    efforts = np.array([
+        f.rice_effort if f.rice_effort and f.rice_effort > 0 else PHASE_PLANNER_DEFAULT_EFFORT
+        for f in features
+    ])
+    weights = np.ceil(efforts / PHASE_PLANNER_EFFORT_STEP - 1e-9).astype(int)
+    deps = [[index[d] for d in f.depends_on if d in index and d != f.name] for f in features]
+
+    placed: dict[int, int] = {}  # feature index -> phase number
+    phases = []
+    for number, budget in zip((1, 2, 3), capacity.phase_budgets):
+        # Pinned to this phase, or P0 in phase 1: placed regardless of budget, with the
+        # dependencies they need (a dependency pinned to a later phase keeps its pin)
+        required: set[int] = set()
+        for i in range(len(features)):
+            if i in placed:
+                continue
+            if fixed.get(i) == number or (number == 1 and i not in fixed and features[i].priority == "P0"):
+                required.update(_closure(i, deps, placed, fixed.keys() - {i}))
+        taken = placed.keys() | required
+        candidates = [i for i in range(len(features)) if i not in taken and i not in fixed]
+        # A candidate whose closure would pull a pinned feature, or a P2 into phase 1, is left out
+        closures = {
+            i: frozenset(c) for i in candidates for c in (_closure(i, deps, taken),)
+            if not any(j in fixed or (number == 1 and features[j].priority == "P2") for j in c)
+        }
+        used = int(weights[list(required)].sum()) if required else 0
+        cap_units = int(budget / PHASE_PLANNER_EFFORT_STEP + 1e-9)
+        picked = _knapsack(values, weights, closures, cap_units - used)
+        picked |= required
+        for i in picked:
+            placed[i] = number
+        chosen = sorted(picked)
+        phases.append(PlannedPhase(
+            number=number,
+            features=[names[i] for i in chosen],
+            effort=float(efforts[chosen].sum()) if chosen else 0.0,
+            value=float(values[chosen].sum()) if chosen else 0.0,
+            budget=budget,
+        ))
+
+    overflow = [names[i] for i in range(len(features)) if i not in placed]
+    if overflow:
+        last = phases[-1]
+        last.features += overflow
+        last.effort += float(sum(efforts[index[n]] for n in overflow))
+    return PhasePlan(capacity=capacity, phases=phases, overflow=overflow)
+
+
+def _weeks_label(weeks: int) -> str:
+    return f"{weeks} week" if weeks == 1 else f"{weeks} weeks"
+
+
+def apply_plan(scope: ScopingOutput, plan: PhasePlan) -> None:
+    """Write the plan into Feature.phase and implementation_phases (keeping existing names/goals)."""
+    phase_of = {name: p.number for p in plan.phases for name in p.features}
+    for f in scope.mvp_features:
+        f.phase = phase_of.get(f.name, f.phase)
+    existing = {p.phase_number: p for p in scope.implementation_phases}
+    scope.implementation_phases = [
+        ImplementationPhase(
+            phase_number=p.number,
+            name=existing[p.number].name if p.number in existing else DEFAULT_PHASE_NAMES[p.number],
+            goal=existing[p.number].goal if p.number in existing else DEFAULT_PHASE_GOALS[p.number],
+            estimated_weeks=_weeks_label(p.weeks(plan.capacity.team_size)) if p.features else "—",
+            features=p.features,
+        )
+        for p in plan.phases
+    ]
@@ -0,0 +1,148 @@
+"""Local comparable-products corpus: in-memory inverted index with BM25 ranking.
+
+Documents are {title, href, body} dicts, the same shape DuckDuckGo text results have.
+The corpus is the bundled dataset (data/comparable_products.jsonl) plus every web search
+result seen so far, which is appended to a learned-results log under .cache/ and
+indexed immediately, so the corpus grows with use and survives restarts.
+"""
+
+import json
+import logging
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Optional
+
+from config import (
+    PRODUCT_CORPUS_BM25_B,
+    PRODUCT_CORPUS_BM25_K1,
+    PRODUCT_CORPUS_BUNDLED,
+    PRODUCT_CORPUS_DIR,
+)
+from models import telemetry
+
+logger = logging.getLogger("vibe_pm.product_corpus")
+
+LEARNED_FILE = "learned.jsonl"
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and app are as at be by for from in into is it its of on or that the their to with "
+    "your you who users user product platform software tool".split()
+)
+_SUFFIXES = ("ings", "ing", "ers", "er", "es", "ed", "e", "s")
+
+
+def _stem(word: str) -> str:
+    """Crude suffix stripping so schedule/scheduling and freelance/freelancers meet."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith("ss"):
+            return word[: -len(suffix)]
+    return word
+
+
+def _tokens(text: str) -> list[str]:
+    return [_stem(w) for w in _TOKEN_RE.findall(text.lower()) if w not in _STOPWORDS and len(w) > 1]
+
+
+class ProductCorpus:
+    """BM25 over title + body; add() updates postings incrementally (no rebuild)."""
+
+    def __init__(
+        self,
+        bundled: Optional[Path],
+        directory: Optional[Path],
+        k1: float = PRODUCT_CORPUS_BM25_K1,
+        b: float = PRODUCT_CORPUS_BM25_B,
+    ):
+        self.bundled = Path(bundled) if bundled else None
+        self.directory = Path(directory) if directory else None
+        self.k1 = k1
+        self.b = b
+        self._docs: list[dict[str, Any]] = []
+        self._lengths: list[int] = []
+        self._postings: dict[str, dict[int, int]] = {}  # term -> {doc index: term frequency}
+        self._keys: set[str] = set()
+        self._total_length = 0
+        self._loaded = False
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._docs)
+
+    @staticmethod
+    def _key(doc: dict) -> str:
+        return (doc.get("href") or doc.get("title") or "").strip().lower().rstrip("/")
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        for path in (self.bundled, self.directory / LEARNED_FILE if self.directory else None):
+            if path is None:
+                continue
+            try:
+                lines = path.read_text(encoding="utf-8").splitlines()
+            except OSError:
+                continue
+            for line in lines:
+                try:
+                    self._index(json.loads(line))
+                except (ValueError, TypeError, AttributeError):
+                    continue
+
+    def _index(self, doc: dict) -> bool:
+        """Add one document to the in-memory index; False for duplicates and empty docs."""
+        key = self._key(doc)
+        if not key or key in self._keys or not doc.get("title"):
+            return False
+        terms = Counter(_tokens(f"{doc['title']} {doc['title']} {doc.get('body') or ''}"))
+        if not terms:
+            return False
+        i = len(self._docs)
+        self._docs.append({"title": doc["title"], "href": doc.get("href"), "body": doc.get("body") or ""})
+        length = sum(terms.values())
+        self._lengths.append(length)
+        self._total_length += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[i] = tf
+        self._keys.add(key)
+        return True
+
+    def add(self, results: list[dict[str, Any]]) -> int:
+        """Index new search results and append them to the learned log. Returns how many were new."""
+        self._load()
+        new = [r for r in results if isinstance(r, dict) and self._index(r)]
+        if new and self.directory is not None:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with open(self.directory / LEARNED_FILE, "a", encoding="utf-8") as f:
+                    for r in new:
+                        doc = {"title": r.get("title"), "href": r.get("href"), "body": r.get("body") or ""}
+                        f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+            except OSError as e:
+                logger.warning("product corpus write failed: %s", e)
+        telemetry.incr("product_corpus.added", len(new))
+        return len(new)
+
+    def search(self, query: str, k: int = 5) -> list[dict[str, Any]]:
+        """Top-k documents by BM25 score (score > 0 only), each with a "score" field."""
+        self._load()
+        n = len(self._docs)
+        if not n:
+            return []
+        avg_length = self._total_length / n
+        scores: dict[int, float] = {}
+        for term in set(_tokens(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i, tf in postings.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[i] / avg_length)
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / norm
+        top = sorted(scores.items(), key=lambda kv: -kv[1])[:k]
+        return [{**self._docs[i], "score": round(score, 3)} for i, score in top]
+
+
+product_corpus = ProductCorpus(PRODUCT_CORPUS_BUNDLED, PRODUCT_CORPUS_DIR)
@@ -0,0 +1,185 @@
+"""Deterministic RICE engine: vectorized scoring, mismatch detection, ranking, bands, sensitivity.
+
+RICE = Reach * Impact * Confidence / Effort. All functions take parallel NumPy arrays
+(one entry per feature, NaN where the model gave no value), so scoring hundreds of
+backlog features is a handful of array operations. apply_rice() is the ScopingOutput-level
+entry point used by the scoping agent and the spec renderer.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from config import (
+    RICE_BAND_SHARES,
+    RICE_CONFIDENCE_SWEEP,
+    RICE_EFFORT_SWEEP,
+    RICE_MISMATCH_RTOL,
+    RICE_REASSIGN_PRIORITIES,
+)
+from models.schemas import Feature, ScopingOutput
+
+BANDS = ("P0", "P1", "P2")
+
+
+@dataclass
+class RiceReport:
+    """Per-feature arrays in input order plus derived views."""
+
+    names: list[str]
+    computed: np.ndarray  # NaN when an input is missing or effort <= 0
+    reported: np.ndarray  # rice_score as extracted (NaN if absent)
+    mismatch: np.ndarray  # bool: reported differs from computed beyond RICE_MISMATCH_RTOL
+    rank: np.ndarray  # 1 = highest score; unscored features rank last
+    bands: list[str]  # P0/P1/P2 from score rank ("" for unscored)
+    band_stability: np.ndarray  # share of sweep cells where the feature keeps its band
+    reassigned: list[str] = field(default_factory=list)  # names whose priority was changed
+
+    def mismatches(self) -> list[tuple[str, float, float]]:
+        """(name, reported, computed) for features with LLM arithmetic mismatches."""
+        idx = np.flatnonzero(self.mismatch)
+        return [(self.names[i], float(self.reported[i]), float(self.computed[i])) for i in idx]
+
+    def order(self) -> np.ndarray:
+        """Feature indices from highest to lowest rank."""
+        return np.argsort(self.rank, kind="stable")
+
+
+def feature_arrays(features: list[Feature]) -> tuple[np.ndarray, ...]:
+    """(reach, impact, confidence, effort, reported) as float arrays with NaN for missing values."""
+    def col(attr: str) -> np.ndarray:
+        return np.array(
+            [np.nan if getattr(f, attr) is None else float(getattr(f, attr)) for f in features],
+            dtype=float,
+        )
+
+    return col("rice_reach"), col("rice_impact"), col("rice_confidence"), col("rice_effort"), col("rice_score")
+
+
+def normalize_confidence(confidence: np.ndarray) -> np.ndarray:
+    """Accept 0-1 fractions or 0-100 percentages; result is clipped to [0, 1]."""
+    conf = np.where(confidence > 1.0, confidence / 100.0, confidence)
+    return np.clip(conf, 0.0, 1.0)
+
+
+def rice_scores(
+    reach: np.ndarray, impact: np.ndarray, confidence: np.ndarray, effort: np.ndarray
+) -> np.ndarray:
+    """Vectorized RICE (confidence as a fraction or a percentage); broadcasts. NaN where undefined."""
+    return _scores(reach, impact, normalize_confidence(confidence), effort)
+
+
+def _scores(reach: np.ndarray, impact: np.ndarray, confidence: np.ndarray, effort: np.ndarray) -> np.ndarray:
+    """RICE with confidence already normalized to [0, 1]; broadcasts, so sweep grids can be passed directly."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = reach * impact * confidence / effort
+    return np.where(effort > 0, scores, np.nan)
+
+
+def find_mismatches(computed: np.ndarray, reported: np.ndarray, rtol: float = RICE_MISMATCH_RTOL) -> np.ndarray:
+    """True where both values exist and differ by more than rtol (relative to computed)."""
+    both = ~np.isnan(computed) & ~np.isnan(reported)
+    with np.errstate(invalid="ignore"):
+        off = ~np.isclose(reported, computed, rtol=rtol, atol=1e-9)
+    return both & off
+
+
+def rank_scores(scores: np.ndarray) -> np.ndarray:
+    """1-based ranks along the last axis, highest score first; NaN scores rank last (stable)."""
+    keyed = np.where(np.isnan(scores), -np.inf, scores)
+    order = np.argsort(-keyed, axis=-1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, scores.shape[-1] + 1), axis=-1)
+    return ranks
+
+
+def _band_cuts(n_scored, shares: tuple[float, float]):
+    """Last rank in P0 and in P1 for n_scored features (at least one P0 when any is scored)."""
+    p0_cut = np.maximum(np.ceil(n_scored * shares[0]), np.minimum(n_scored, 1))
+    return p0_cut, p0_cut + np.ceil(n_scored * shares[1])
+
+
+def band_indices(scores: np.ndarray, shares: tuple[float, float] = RICE_BAND_SHARES) -> np.ndarray:
+    """
+    Band per feature along the last axis: 0 = P0 (top shares[0] of scored features),
+    1 = P1 (next shares[1]), 2 = P2 (rest), -1 = unscored.
+    """
+    ranks = rank_scores(scores)
+    p0_cut, p1_cut = _band_cuts((~np.isnan(scores)).sum(axis=-1, keepdims=True), shares)
+    bands = np.where(ranks <= p0_cut, 0, np.where(ranks <= p1_cut, 1, 2))
+    return np.where(np.isnan(scores), -1, bands)
+
+
+def sensitivity_grid(
+    reach: np.ndarray,
+    impact: np.ndarray,
+    confidence: np.ndarray,
+    effort: np.ndarray,
+    confidence_factors=RICE_CONFIDENCE_SWEEP,
+    effort_factors=RICE_EFFORT_SWEEP,
+) -> np.ndarray:
+    """
+    Scores under every (confidence factor, effort factor) pair: shape (n_conf, n_effort, n_features).
+    Confidence is normalized once, then scaled and capped at 1 (a factor above 1 cannot exceed certainty).
+    """
+    cf = np.asarray(confidence_factors, dtype=float)[:, None, None]
+    ef = np.asarray(effort_factors, dtype=float)[None, :, None]
+    conf = np.clip(normalize_confidence(confidence)[None, None, :] * cf, 0.0, 1.0)
+    return _scores(reach[None, None, :], impact[None, None, :], conf, effort[None, None, :] * ef)
+
+
+def band_stability(
+    grid: np.ndarray, base: np.ndarray, shares: tuple[float, float] = RICE_BAND_SHARES
+) -> np.ndarray:
+    """
+    One-at-a-time sensitivity: share of sweep cells in which a feature keeps its band when
+    only its own confidence/effort estimate is off by the cell's factors (others at base).
+    """
+    n = base.shape[-1]
+    if n == 0:
+        return np.zeros(0)
+    base_bands = band_indices(base, shares)
+    others = np.where(np.isnan(base), -np.inf, base)
+    perturbed = np.where(np.isnan(grid), -np.inf, grid)
+    # rank of feature i = 1 + number of other features whose base score beats its perturbed score
+    beats = others[None, None, None, :] > perturbed[..., :, None]
+    beats &= ~np.eye(n, dtype=bool)
+    ranks = 1 + beats.sum(axis=-1)
+    p0_cut, p1_cut = _band_cuts((~np.isnan(base)).sum(), shares)
+    bands = np.where(ranks <= p0_cut, 0, np.where(ranks <= p1_cut, 1, 2))
+    bands = np.where(np.isnan(grid), -1, bands)
+    return (bands == base_bands).reshape(-1, n).mean(axis=0)
+
+
+def score_features(features: list[Feature]) -> RiceReport:
+    """Recompute, rank, band and sweep a list of features (no mutation)."""
+    reach, impact, confidence, effort, reported = feature_arrays(features)
+    computed = rice_scores(reach, impact, confidence, effort)
+    bands = band_indices(computed)
+    grid = sensitivity_grid(reach, impact, confidence, effort)
+    return RiceReport(
+        names=[f.name for f in features],
+        computed=computed,
+        reported=reported,
+        mismatch=find_mismatches(computed, reported),
+        rank=rank_scores(computed),
+        bands=[BANDS[b] if b >= 0 else "" for b in bands],
+        band_stability=band_stability(grid, computed),
+    )
+
+
+def apply_rice(scope: ScopingOutput, reassign_priorities: bool = RICE_REASSIGN_PRIORITIES) -> RiceReport:
+    """
+    Overwrite each feature's rice_score with the recomputed value (where computable) and,
+    if reassign_priorities, set priority to the score band. Returns the report.
+    """
+    report = score_features(scope.mvp_features)
+    for i, feature in enumerate(scope.mvp_features):
+        if np.isnan(report.computed[i]):
+            continue
+        feature.rice_score = round(float(report.computed[i]), 2)
+        band = report.bands[i]
+        if reassign_priorities and band and band != feature.priority:
+            feature.priority = band
+            report.reassigned.append(feature.name)
+    return report
@@ -0,0 +1,97 @@
+"""Apply add / remove / reprioritize operations from a negotiation round to a ScopingOutput."""
+
+from typing import Optional
+
+from models.schemas import CutFeature, Feature, ScopingOutput
+
+_PRIORITIES = ("P0", "P1", "P2")
+
+
+def _phase(value, default: int) -> int:
+    return value if value in (1, 2, 3) else default
+
+
+def _find(items, name: str) -> Optional[int]:
+    key = name.strip().lower()
+    for i, item in enumerate(items):
+        if item.name.strip().lower() == key:
+            return i
+    return None
+
+
+def apply_scope_patch(scope: ScopingOutput, patch: dict) -> list[str]:
+    """
+    Apply patch ops in place; malformed ops are skipped. Returns human-readable changes.
+    - add: new MVP feature (or update of an existing one); also un-cuts it
+    - remove: MVP feature moved to cut_features with the given reason
+    - reprioritize: priority and/or phase of an existing MVP feature
+    """
+    changes: list[str] = []
+
+    for op in patch.get("add") or []:
+        if not isinstance(op, dict) or not op.get("name"):
+            continue
+        name = str(op["name"]).strip()
+        priority = op.get("priority") if op.get("priority") in _PRIORITIES else "P1"
+        cut_idx = _find(scope.cut_features, name)
+        if cut_idx is not None:
+            scope.cut_features.pop(cut_idx)
+        idx = _find(scope.mvp_features, name)
+        if idx is not None:
+            feature = scope.mvp_features[idx]
+            feature.priority = priority
+            feature.phase = _phase(op.get("phase"), feature.phase)
+            changes.append(f"updated {feature.name} ({priority})")
+            continue
+        scope.mvp_features.append(
+            Feature(
+                name=name,
+                description=str(op.get("description") or ""),
+                priority=priority,
+                phase=_phase(op.get("phase"), 1 if priority == "P0" else 2),
+            )
+        )
+        changes.append(f"added {name} ({priority})")
+
+    for op in patch.get("remove") or []:
+        if not isinstance(op, dict) or not op.get("name"):
+            continue
+        idx = _find(scope.mvp_features, str(op["name"]))
+        if idx is None:
+            continue
+        feature = scope.mvp_features.pop(idx)
+        for phase in scope.implementation_phases:
+            phase.features = [n for n in phase.features if n != feature.name]
+        if _find(scope.cut_features, feature.name) is None:
+            scope.cut_features.append(
+                CutFeature(name=feature.name, reason_cut=str(op.get("reason") or "Cut during scope negotiation"))
+            )
+        changes.append(f"cut {feature.name}")
+
+    for op in patch.get("reprioritize") or []:
+        if not isinstance(op, dict) or not op.get("name"):
+            continue
+        idx = _find(scope.mvp_features, str(op["name"]))
+        if idx is None:
+            continue
+        feature = scope.mvp_features[idx]
+        before = (feature.priority, feature.phase)
+        if op.get("priority") in _PRIORITIES:
+            feature.priority = op["priority"]
+        feature.phase = _phase(op.get("phase"), feature.phase)
+        if (feature.priority, feature.phase) != before:
+            changes.append(f"{feature.name} -> {feature.priority}, phase {feature.phase}")
+
+    return changes
+
+
+def patched_phases(scope: ScopingOutput, patch: dict) -> dict[str, int]:
+    """{feature name: phase} for MVP features whose phase the patch set explicitly."""
+    phases: dict[str, int] = {}
+    for op in (patch.get("add") or []) + (patch.get("reprioritize") or []):
+        if not isinstance(op, dict) or not op.get("name") or op.get("phase") not in (1, 2, 3):
+            continue
+        idx = _find(scope.mvp_features, str(op["name"]))
+        if idx is not None:
+            phases[scope.mvp_features[idx].name] = op["phase"]
+    return phases
@@ -0,0 +1,132 @@
+"""Content-addressed on-disk cache for generated specs.
+
+A spec is a pure function of DiscoverySummary, ScopingOutput, the template, the spec
+prompts, the spec model and the generation mode, so the cache key is a SHA-256 over a
+canonical JSON encoding of exactly those inputs (plus SPEC_PROMPT_VERSION for changes
+the texts alone don't capture). Entries are one JSON file per key; the least recently
+used entries beyond SPEC_CACHE_MAX_ENTRIES and entries older than SPEC_CACHE_TTL_DAYS
+are evicted on write.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from config import (
+    MODELS,
+    SPEC_CACHE_DIR,
+    SPEC_CACHE_ENABLED,
+    SPEC_CACHE_MAX_ENTRIES,
+    SPEC_CACHE_TTL_DAYS,
+)
+from models import telemetry
+from prompts.spec_writer import (
+    SPEC_POLISH_INSTRUCTIONS,
+    SPEC_PROMPT_VERSION,
+    SPEC_SECTION_GUIDANCE,
+    SPEC_SECTION_PROMPT,
+    SPEC_WRITER_SYSTEM_PROMPT,
+)
+from tools.templates import SPEC_TEMPLATE
+
+logger = logging.getLogger("vibe_pm.spec_cache")
+
+
+def spec_cache_key(summary, scope, kind: str, **extra: Any) -> str:
+    """
+    Canonical hash of everything a spec of `kind` ("single", "sections", "polish") depends on.
+    extra carries kind-specific inputs (e.g. the polished section ids).
+    """
+    payload = {
+        "kind": kind,
+        "discovery": summary.model_dump(mode="json"),
+        "scoping": scope.model_dump(mode="json") if scope is not None else None,
+        "template": SPEC_TEMPLATE,
+        "prompts": [
+            SPEC_WRITER_SYSTEM_PROMPT,
+            SPEC_SECTION_PROMPT,
+            SPEC_SECTION_GUIDANCE,
+            SPEC_POLISH_INSTRUCTIONS,
+        ],
+        "prompt_version": SPEC_PROMPT_VERSION,
+        "model": MODELS["spec"],
+        "extra": extra,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SpecCache:
+    """One JSON file per key under `directory`; file mtime doubles as last-access time."""
+
+    def __init__(self, directory: Path, max_entries: int, ttl_days: float, enabled: bool = True):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.ttl_s = ttl_days * 86400
+        self.enabled = enabled
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached spec Markdown for key, or None. A hit refreshes the entry's recency."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_s:
+                path.unlink(missing_ok=True)
+                raise FileNotFoundError(path)
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            markdown = entry["markdown"]
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            telemetry.incr("spec_cache.miss")
+            return None
+        telemetry.incr("spec_cache.hit")
+        return markdown
+
+    def put(self, key: str, markdown: str) -> None:
+        """Store markdown under key (atomic replace), then evict. Failures are logged, not raised."""
+        if not self.enabled:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entry = {"key": key, "created": time.time(), "markdown": markdown}
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+            telemetry.incr("spec_cache.store")
+            self.evict()
+        except OSError as e:
+            logger.warning("spec cache write failed: %s", e)
+
+    def evict(self) -> int:
+        """Drop expired entries and the least recently used beyond max_entries. Returns count removed."""
+        try:
+            entries = sorted(
+                ((p.stat().st_mtime, p) for p in self.directory.glob("*.json")),
+                reverse=True,
+            )
+        except OSError:
+            return 0
+        now = time.time()
+        removed = 0
+        for i, (mtime, path) in enumerate(entries):
+            if i >= self.max_entries or now - mtime > self.ttl_s:
+                path.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            telemetry.incr("spec_cache.evicted", removed)
+        return removed
+
+
+spec_cache = SpecCache(
+    Path(SPEC_CACHE_DIR), SPEC_CACHE_MAX_ENTRIES, SPEC_CACHE_TTL_DAYS, enabled=SPEC_CACHE_ENABLED
+)
@@ -0,0 +1,232 @@
+"""Deterministic spec renderer: fills SPEC_TEMPLATE from DiscoverySummary + ScopingOutput, no LLM.
+
+Every section is derived from the structured outputs, so the result is a complete, usable
+spec in milliseconds. "TBD — needs further discovery." only appears where the conversation
+genuinely left a gap. The spec writer uses this as its template-first mode, as the
+per-section fallback, and as the draft an optional LLM polish pass rewrites.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from models.schemas import DiscoverySummary, ScopingOutput
+from tools.rice import score_features
+from tools.templates import SPEC_SECTION_TEMPLATES, SPEC_TEMPLATE
+
+TBD = "TBD — needs further discovery."
+
+# Default phase names/durations when scoping produced features but no explicit phases
+DEFAULT_PHASE_NAMES = {1: "Core MVP", 2: "Essential Additions", 3: "Growth & Polish"}
+DEFAULT_PHASE_WEEKS = "1-2 weeks"
+DEFAULT_PHASE_GOALS = {
+    1: "Prove the core value proposition with the smallest buildable product.",
+    2: "Add the features users need to stick with the product after the first use.",
+    3: "Grow usage and polish the experience once the core loop is validated.",
+}
+
+_PAYMENT_WORDS = ("subscription", "pay", "price", "pricing", "fee", "commission", "premium", "freemium")
+
+_DISCOVERY_GAP_QUESTIONS = {
+    "target_user": "Who exactly is the primary user?",
+    "core_problem": "What is the core problem, and how often does it occur?",
+    "why_now": "Why is now the right time for this product?",
+    "success_metric": "How will success be measured (one primary metric)?",
+    "revenue_model": "How will the product make money?",
+    "constraints": "What constraints (timeline, budget, team, regulation) apply?",
+}
+
+
+def _bullets(items) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+
+def _feature_lines(features) -> str:
+    return _bullets(f"{f.name} ({f.priority}): {f.description}" for f in features)
+
+
+def phase_content(scope: Optional[ScopingOutput], phase_num: int) -> tuple[str, str, str, str, str, str]:
+    """Build phase name, weeks, goal, features, flow, screens for phase_num (1/2/3)."""
+    name = DEFAULT_PHASE_NAMES[phase_num]
+    weeks = DEFAULT_PHASE_WEEKS
+    goal = DEFAULT_PHASE_GOALS[phase_num]
+    features = flow = screens = TBD
+    if not scope:
+        return (name, weeks, TBD, features, flow, screens)
+
+    phase = next((p for p in scope.implementation_phases if p.phase_number == phase_num), None)
+    phase_features = [f for f in scope.mvp_features if f.phase == phase_num]
+    if phase is not None:
+        name = phase.name or name
+        weeks = phase.estimated_weeks or weeks
+        goal = phase.goal or goal
+        listed = set(phase.features or [])
+        phase_features = [f for f in scope.mvp_features if f.name in listed or f.phase == phase_num]
+        if not phase_features and phase.features:
+            features = _bullets(phase.features)
+    if phase_features:
+        features = _feature_lines(phase_features)
+    elif phase is None:
+        goal = TBD
+
+    if phase_num == 1 and scope.core_user_flow:
+        flow = scope.core_user_flow
+    if scope.key_screens:
+        half = len(scope.key_screens) // 2
+        if phase_num == 1:
+            screens = _bullets(scope.key_screens)
+        elif phase_num == 2 and scope.key_screens[half:]:
+            screens = _bullets(scope.key_screens[half:])
+    return (name, weeks, goal, features, flow, screens)
+
+
+def rice_summary(scope: Optional[ScopingOutput]) -> str:
+    """RICE summary from scoping output, ranked by locally computed score (tools/rice.py)."""
+    if not scope or not scope.mvp_features:
+        return TBD
+    report = score_features(scope.mvp_features)
+    lines = []
+    for i in report.order():
+        f = scope.mvp_features[i]
+        if f.rice_score is None and f.rice_reach is None:
+            continue
+        parts = [f.name]
+        if f.rice_reach is not None:
+            parts.append(f"Reach: {f.rice_reach}")
+        if f.rice_impact is not None:
+            parts.append(f"Impact: {f.rice_impact}")
+        if f.rice_confidence is not None:
+            parts.append(f"Confidence: {f.rice_confidence}")
+        if f.rice_effort is not None:
+            parts.append(f"Effort: {f.rice_effort} person-weeks")
+        score = report.computed[i] if not np.isnan(report.computed[i]) else f.rice_score
+        if score is not None:
+            parts.append(f"RICE score: {score:.2f}")
+        if report.bands[i]:
+            band = f"Rank {report.rank[i]} ({report.bands[i]} band"
+            if report.bands[i] != f.priority:
+                band += f", scoped as {f.priority}"
+            if report.band_stability[i] < 0.5:
+                band += ", sensitive to confidence/effort estimates"
+            parts.append(band + ")")
+        lines.append(" — ".join(parts))
+    return "\n".join(f"- {line}" for line in lines) if lines else TBD
+
+
+def _product_name(summary: DiscoverySummary) -> str:
+    text = (summary.core_problem or "Product").strip().rstrip(".")
+    if len(text) <= 50:
+        return text
+    return text[:50].rsplit(" ", 1)[0] + "…"
+
+
+def _problem_statement(summary: DiscoverySummary) -> str:
+    if not summary.core_problem:
+        return TBD
+    parts = [summary.core_problem.strip()]
+    if summary.why_now:
+        parts.append(f"**Why now**: {summary.why_now.strip()}")
+    if summary.current_alternatives:
+        parts.append(f"**Today they use**: {', '.join(summary.current_alternatives)}")
+    return "\n\n".join(parts)
+
+
+def _persona(summary: DiscoverySummary) -> str:
+    if not summary.target_user:
+        return TBD
+    parts = [summary.target_user.strip()]
+    if summary.success_metric:
+        parts.append(f"**Success for them looks like**: {summary.success_metric.strip()}")
+    return "\n\n".join(parts)
+
+
+def _open_questions(summary: DiscoverySummary, scope: Optional[ScopingOutput]) -> str:
+    items = [q for f, q in _DISCOVERY_GAP_QUESTIONS.items() if not getattr(summary, f)]
+    if scope is None:
+        items.append("Scope has not been agreed yet.")
+    else:
+        if not scope.core_user_flow:
+            items.append("The core user flow still needs to be defined.")
+        low_confidence = [
+            f.name for f in scope.mvp_features
+            if f.priority == "P0" and f.rice_confidence is not None and f.rice_confidence < 0.5
+        ]
+        if low_confidence:
+            items.append(f"Low-confidence P0 features — validate early: {', '.join(low_confidence)}")
+        if scope.cut_features:
+            items.append(
+                "Risk that cut features are expected by early users: "
+                + ", ".join(c.name for c in scope.cut_features)
+            )
+    if summary.constraints:
+        items.append(f"Delivery risk from constraints: {summary.constraints.strip()}")
+    return _bullets(items) if items else TBD
+
+
+def _technical_considerations(summary: DiscoverySummary, scope: Optional[ScopingOutput]) -> str:
+    items = []
+    if summary.constraints:
+        items.append(f"Constraints: {summary.constraints.strip()}")
+    if scope and scope.mvp_features:
+        phase_1 = [f for f in scope.mvp_features if f.phase == 1]
+        items.append(
+            f"Phase 1 covers {len(phase_1)} feature(s) across {len(scope.key_screens)} key screen(s); "
+            "build only what the core user flow needs."
+        )
+    revenue = (summary.revenue_model or "").lower()
+    if any(w in revenue for w in _PAYMENT_WORDS):
+        items.append(f"Revenue model ({summary.revenue_model.strip()}) needs a payments integration before launch.")
+    if summary.success_metric:
+        items.append(f"Instrument analytics for the success metric from day one: {summary.success_metric.strip()}")
+    return _bullets(items) if items else TBD
+
+
+def template_values(summary: DiscoverySummary, scope: Optional[ScopingOutput]) -> dict[str, str]:
+    """Placeholder values for SPEC_TEMPLATE (and its section fragments)."""
+    p1_name, p1_weeks, p1_goal, p1_features, p1_flow, p1_screens = phase_content(scope, 1)
+    p2_name, p2_weeks, p2_goal, p2_features, _, p2_screens = phase_content(scope, 2)
+    p3_name, p3_weeks, p3_goal, p3_features, _, _ = phase_content(scope, 3)
+
+    cut_features = comparable_products = TBD
+    if scope:
+        cut_features = _bullets(f"{c.name}: {c.reason_cut}" for c in scope.cut_features) or TBD
+        comparable_products = _bullets(
+            f"{c.name}: {c.relevance}" + (f" ({c.url})" if c.url else "")
+            for c in scope.comparable_products
+        ) or TBD
+
+    return dict(
+        product_name=_product_name(summary),
+        problem_statement=_problem_statement(summary),
+        target_user_persona=_persona(summary),
+        comparable_products=comparable_products,
+        phase_1_name=p1_name,
+        phase_1_weeks=p1_weeks,
+        phase_1_goal=p1_goal,
+        phase_1_features=p1_features,
+        phase_1_flow=p1_flow,
+        phase_1_screens=p1_screens,
+        phase_2_name=p2_name,
+        phase_2_weeks=p2_weeks,
+        phase_2_goal=p2_goal,
+        phase_2_features=p2_features,
+        phase_2_screens=p2_screens,
+        phase_3_name=p3_name,
+        phase_3_weeks=p3_weeks,
+        phase_3_goal=p3_goal,
+        phase_3_features=p3_features,
+        cut_features=cut_features,
+        rice_summary=rice_summary(scope),
+        open_questions_risks=_open_questions(summary, scope),
+        technical_considerations=_technical_considerations(summary, scope),
+    )
+
+
+def render_spec(summary: DiscoverySummary, scope: Optional[ScopingOutput]) -> str:
+    """Complete spec Markdown from structured outputs."""
+    return SPEC_TEMPLATE.format(**template_values(summary, scope)).strip()
+
+
+def render_section(section_id: str, summary: DiscoverySummary, scope: Optional[ScopingOutput]) -> str:
+    """One template section (see SPEC_SECTIONS) from structured outputs."""
+    return SPEC_SECTION_TEMPLATES[section_id].format(**template_values(summary, scope)).strip()
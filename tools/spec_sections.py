@@ -0,0 +1,114 @@
+"""Split a spec Markdown document into template sections and stitch sections back together."""
+
+import re
+from typing import Optional
+
+from tools.templates import SPEC_SECTIONS
+
+# Heading that opens each section (matched at line start, case-insensitive)
+SECTION_START_PATTERNS = {
+    "overview": r"#\s+Product Spec\b",
+    "phase_1": r"##\s+Implementation Plan\b",
+    "phase_2": r"###\s+Phase 2\b",
+    "phase_3": r"###\s+Phase 3\b",
+    "prioritization": r"##\s+Cut Features\b",
+    "risks": r"##\s+Open Questions\b",
+}
+
+# Headings a generated section must contain to be accepted
+SECTION_REQUIRED_HEADINGS = {
+    "overview": (r"##\s+Problem Statement", r"##\s+Target User Persona"),
+    "phase_1": (r"###\s+Phase 1\b",),
+    "phase_2": (r"###\s+Phase 2\b",),
+    "phase_3": (r"###\s+Phase 3\b",),
+    "prioritization": (r"##\s+Cut Features", r"##\s+RICE Scoring Summary"),
+    "risks": (r"##\s+Open Questions", r"##\s+Technical Considerations"),
+}
+
+# Words in an edit request that point at a section
+SECTION_KEYWORDS = {
+    "overview": ("product name", "title", "problem statement", "persona", "target user", "comparable", "competitor"),
+    "phase_1": ("phase 1", "core mvp", "user flow", "core flow", "key screen"),
+    "phase_2": ("phase 2", "additional screen"),
+    "phase_3": ("phase 3", "growth"),
+    "prioritization": ("cut feature", "rice score", " rice", "priorit", "cut list"),
+    "risks": ("open question", "risk", "technical", "tech stack", "architecture"),
+}
+
+_FENCE_RE = re.compile(r"^```(?:markdown|md)?\s*\n|\n```\s*$", re.IGNORECASE)
+
+
+def _find(pattern: str, text: str) -> Optional[re.Match]:
+    return re.search(rf"(?im)^{pattern}", text)
+
+
+def _opener(section_id: str, text: str) -> Optional[int]:
+    """Start of the section's opening heading (phase_1 may open at "### Phase 1" directly)."""
+    openers = (SECTION_START_PATTERNS[section_id], SECTION_REQUIRED_HEADINGS[section_id][0])
+    starts = [m.start() for m in (_find(p, text) for p in openers) if m]
+    return min(starts) if starts else None
+
+
+def _foreign_starts(section_id: str, text: str) -> dict[str, int]:
+    """{other section: position} for other sections' opening headings after this section's opener."""
+    start = _opener(section_id, text) or 0
+    found = {}
+    for other, pattern in SECTION_START_PATTERNS.items():
+        m = re.compile(rf"(?im)^{pattern}").search(text, start + 1)
+        if other != section_id and m:
+            found[other] = m.start()
+    return found
+
+
+def foreign_sections(section_id: str, text: str) -> list[str]:
+    """Other sections whose opening heading appears in a generated section, in template order."""
+    found = _foreign_starts(section_id, (text or "").strip())
+    return [s for s in SPEC_SECTIONS if s in found]
+
+
+def clean_section(section_id: str, text: str) -> Optional[str]:
+    """
+    Normalise one generated section: strip code fences, any preamble before the section's
+    opening heading and anything from another section's opening heading on (a model that
+    answered with two sections). Returns None if required headings are missing.
+    """
+    text = _FENCE_RE.sub("", (text or "").strip()).strip()
+    start = _opener(section_id, text)
+    if start is None:
+        return None
+    end = min(_foreign_starts(section_id, text).values(), default=len(text))
+    text = text[start:end].strip()
+    if not all(_find(p, text) for p in SECTION_REQUIRED_HEADINGS[section_id]):
+        return None
+    if section_id == "phase_1" and not _find(SECTION_START_PATTERNS["phase_1"], text):
+        text = "## Implementation Plan\n\n" + text
+    return text.strip()
+
+
+def sections_mentioned(text: str) -> list[str]:
+    """Sections an edit request names explicitly, in template order."""
+    lower = (text or "").lower()
+    return [s for s in SPEC_SECTIONS if any(k in lower for k in SECTION_KEYWORDS[s])]
+
+
+def split_spec(markdown: str) -> dict[str, str]:
+    """
+    Split a full spec into {section_id: text} using the section opening headings.
+    Sections whose heading is missing are absent from the result.
+    """
+    positions = []
+    for section_id in SPEC_SECTIONS:
+        m = _find(SECTION_START_PATTERNS[section_id], markdown or "")
+        if m:
+            positions.append((m.start(), section_id))
+    positions.sort()
+    out: dict[str, str] = {}
+    for i, (start, section_id) in enumerate(positions):
+        end = positions[i + 1][0] if i + 1 < len(positions) else len(markdown)
+        out[section_id] = markdown[start:end].strip()
+    return out
+
+
+def stitch_sections(sections: dict[str, str]) -> str:
+    """Join sections in template order, separated by blank lines."""
+    return "\n\n".join(sections[s].strip() for s in SPEC_SECTIONS if sections.get(s)) + "\n"
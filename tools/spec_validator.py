@@ -0,0 +1,98 @@
+"""Structural spec validation: missing, empty or placeholder sections and phase/scope mismatches.
+
+Each template section of a generated spec is compared with its deterministic render
+(tools/spec_renderer.py): a heading whose rendered body has content must be present and
+non-empty in the generated section, so "TBD" is only a defect where the conversation did
+provide the data. Phase sections must also list the features scoping assigned to them,
+and no section may carry another section's opening heading (a model that answered with
+two sections would otherwise duplicate one in the stitched spec).
+Pure string work: a few milliseconds per spec, no model calls.
+"""
+
+import re
+from typing import Optional
+
+from models.schemas import DiscoverySummary, ScopingOutput
+from tools.spec_renderer import render_section
+from tools.spec_sections import clean_section, foreign_sections, split_spec
+from tools.templates import SPEC_SECTIONS
+
+_HEADING_RE = re.compile(r"^(#{1,4})\s+(.+?)\s*$", re.MULTILINE)
+_PLACEHOLDER_RE = re.compile(r"[\s\-*_>]*(?:(?:tbd|todo)\b.*|n/?a|none|\.\.\.|…)?[\s.]*", re.IGNORECASE)
+_UNFILLED_RE = re.compile(r"\{[a-z0-9_]+\}")
+_PHASE_IDS = {"phase_1": 1, "phase_2": 2, "phase_3": 3}
+
+
+def _heading_key(title: str) -> str:
+    """'Phase 1: Core MVP (2 weeks)' -> 'phase 1'; 'Cut Features (with rationale)' -> 'cut features'."""
+    title = title.strip("*# ").lower()
+    m = re.match(r"phase\s+(\d)", title)
+    if m:
+        return f"phase {m.group(1)}"
+    return re.sub(r"[:(].*", "", title).strip()
+
+
+def heading_blocks(text: str) -> dict[str, str]:
+    """{heading key: body up to the next heading} for the section's Markdown headings."""
+    matches = list(_HEADING_RE.finditer(text or ""))
+    blocks: dict[str, str] = {}
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        blocks.setdefault(_heading_key(m.group(2)), text[m.end():end].strip())
+    return blocks
+
+
+def _is_placeholder(body: str) -> bool:
+    return bool(_PLACEHOLDER_RE.fullmatch(body.strip()))
+
+
+def _phase_features(scope: ScopingOutput, phase_num: int) -> list[str]:
+    phase = next((p for p in scope.implementation_phases if p.phase_number == phase_num), None)
+    if phase is None:
+        return []
+    names = list(phase.features or [])
+    names += [f.name for f in scope.mvp_features if f.phase == phase_num and f.name not in names]
+    return [n for n in names if n and n.strip()]
+
+
+def section_defects(
+    section_id: str, text: Optional[str], summary: DiscoverySummary, scope: Optional[ScopingOutput]
+) -> list[str]:
+    """Problems with one generated section (empty list when it is structurally sound)."""
+    if not text or not text.strip():
+        return ["missing"]
+    if clean_section(section_id, text) is None:
+        return ["required headings missing"]
+    defects = []
+    foreign = foreign_sections(section_id, text)
+    if foreign:
+        defects.append(f"contains other section: {', '.join(foreign)}")
+    if _UNFILLED_RE.search(text):
+        defects.append("unfilled template placeholder")
+    blocks = heading_blocks(text)
+    for key, rendered_body in heading_blocks(render_section(section_id, summary, scope)).items():
+        if key.startswith("product spec") or _is_placeholder(rendered_body):
+            continue  # title line, or no data for this heading either
+        if key not in blocks:
+            defects.append(f"missing heading: {key}")
+        elif _is_placeholder(blocks[key]):
+            defects.append(f"empty: {key}")
+    if section_id in _PHASE_IDS and scope is not None:
+        lower = text.lower()
+        missing = [n for n in _phase_features(scope, _PHASE_IDS[section_id]) if n.lower() not in lower]
+        if missing:
+            defects.append(f"phase features missing: {', '.join(missing)}")
+    return defects
+
+
+def spec_defects(
+    spec_md: str, summary: DiscoverySummary, scope: Optional[ScopingOutput]
+) -> dict[str, list[str]]:
+    """{section_id: problems} for every defective template section of spec_md."""
+    sections = split_spec(spec_md or "")
+    defects = {}
+    for section_id in SPEC_SECTIONS:
+        problems = section_defects(section_id, sections.get(section_id), summary, scope)
+        if problems:
+            defects[section_id] = problems
+    return defects
@@ -1,6 +1,12 @@
-"""Spec Markdown template for Spec Writer (phased implementation plan)."""
+"""Spec Markdown template for Spec Writer (phased implementation plan).
 
-SPEC_TEMPLATE = """# Product Spec: {product_name}
+The template is assembled from independent section fragments so sections can be
+generated (or re-rendered) separately and stitched back in order.
+"""
+
+# Ordered section fragments; "".join(...) is the full SPEC_TEMPLATE
+SPEC_SECTION_TEMPLATES = {
+    "overview": """# Product Spec: {product_name}
 
 ## Problem Statement
 {problem_statement}
@@ -11,7 +17,8 @@ SPEC_TEMPLATE = """# Product Spec: {product_name}
 ## Comparable Products
 {comparable_products}
 
-## Implementation Plan
+""",
+    "phase_1": """## Implementation Plan
 
 ### Phase 1: {phase_1_name} ({phase_1_weeks})
 **Goal**: {phase_1_goal}
@@ -25,7 +32,8 @@ SPEC_TEMPLATE = """# Product Spec: {product_name}
 #### Key Screens
 {phase_1_screens}
 
-### Phase 2: {phase_2_name} ({phase_2_weeks})
+""",
+    "phase_2": """### Phase 2: {phase_2_name} ({phase_2_weeks})
 **Goal**: {phase_2_goal}
 
 #### Features
@@ -34,21 +42,29 @@ SPEC_TEMPLATE = """# Product Spec: {product_name}
 #### Additional Screens
 {phase_2_screens}
 
-### Phase 3: {phase_3_name} ({phase_3_weeks})
+""",
+    "phase_3": """### Phase 3: {phase_3_name} ({phase_3_weeks})
 **Goal**: {phase_3_goal}
 
 #### Features
 {phase_3_features}
 
-## Cut Features (with rationale)
+""",
+    "prioritization": """## Cut Features (with rationale)
 {cut_features}
 
 ## RICE Scoring Summary
 {rice_summary}
 
-## Open Questions & Risks
+""",
+    "risks": """## Open Questions & Risks
 {open_questions_risks}
 
 ## Technical Considerations
 {technical_considerations}
-"""
+""",
+}
+
+SPEC_SECTIONS = tuple(SPEC_SECTION_TEMPLATES)
+
+SPEC_TEMPLATE = "".join(SPEC_SECTION_TEMPLATES.values())
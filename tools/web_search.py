@@ -1,23 +1,21 @@
-"""DuckDuckGo search for comparable products."""
+"""DuckDuckGo search for comparable products (duckduckgo_search is imported on first search)."""
 
 import asyncio
 import time
-import warnings
 from typing import Any
 
-# Suppress the package-rename deprecation warning emitted by duckduckgo_search
-# (it was renamed to 'ddgs', but ddgs requires Python 3.10+ and this project
-# targets Python 3.9, so we stay on duckduckgo_search for now).
-warnings.filterwarnings(
-    "ignore",
-    message=r".*has been renamed.*ddgs.*",
-    category=RuntimeWarning,
+from config import (
+    COMPARABLE_SEARCH_STRATEGY,
+    DEADLINE_RESERVE_S,
+    PRODUCT_CORPUS_MIN_SCORE,
+    PRODUCT_CORPUS_SUFFICIENT,
+    WEB_SEARCH_DEADLINE_S,
+    WEB_SEARCH_MAX_RESULTS,
 )
-
-from duckduckgo_search import DDGS
-
-from config import WEB_SEARCH_MAX_RESULTS
+from models import providers, telemetry
+from models.deadline import within_budget
 from models.schemas import DiscoverySummary
+from tools.product_corpus import product_corpus
 
 # Retry config: DuckDuckGo rate-limits after a few calls in quick succession.
 # Later scenarios in a run (arguer, pivoter) frequently hit empty results without this.
@@ -29,7 +27,7 @@ def _run_sync_search(query: str, max_results: int) -> list[dict[str, Any]]:
     """Run DDGS search in a thread (DDGS is sync), with retry on empty/error."""
     for attempt in range(_SEARCH_MAX_ATTEMPTS):
         try:
-            results = list(DDGS().text(query, max_results=max_results))
+            results = list(providers.ddgs().text(query, max_results=max_results))
             if results:
                 return results
         except Exception:
@@ -39,17 +37,67 @@ def _run_sync_search(query: str, max_results: int) -> list[dict[str, Any]]:
     return []
 
 
+def _merge(web: list[dict[str, Any]], local: list[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    """Web results first, then local matches not already present (by URL or title)."""
+    seen = {(r.get("href") or r.get("title") or "").lower().rstrip("/") for r in web}
+    out = list(web)
+    for r in local:
+        key = (r.get("href") or r.get("title") or "").lower().rstrip("/")
+        if key not in seen:
+            out.append(r)
+            seen.add(key)
+    return out[:limit]
+
+
+def _learn(future: "asyncio.Future") -> None:
+    """Add web results to the local corpus whenever they arrive (even after the deadline)."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    product_corpus.add(future.result())
+
+
 async def search_comparable_products(discovery_summary: DiscoverySummary) -> list[dict[str, Any]]:
     """
     Search for comparable products using target_user and core_problem.
     Returns list of dicts with title, href, body (DuckDuckGo text result format).
+    Per COMPARABLE_SEARCH_STRATEGY, the local BM25 corpus answers first ("local_first")
+    or alongside DuckDuckGo ("parallel"), filling in when the web search is slow or empty
+    or when the turn deadline (models/deadline.py) cuts it short.
     """
     user = discovery_summary.target_user or "users"
     problem = discovery_summary.core_problem or "product"
     query = f"{problem} app for {user}"
+
+    local: list[dict[str, Any]] = []
+    if COMPARABLE_SEARCH_STRATEGY != "web":
+        local = [
+            {**r, "source": "local"}
+            for r in product_corpus.search(query, WEB_SEARCH_MAX_RESULTS)
+            if r["score"] >= PRODUCT_CORPUS_MIN_SCORE
+        ]
+        if COMPARABLE_SEARCH_STRATEGY == "local_first" and len(local) >= PRODUCT_CORPUS_SUFFICIENT:
+            telemetry.incr("web_search.local_only")
+            return local
+
     loop = asyncio.get_event_loop()
-    results = await loop.run_in_executor(
+    web = loop.run_in_executor(
         None,
         lambda: _run_sync_search(query, WEB_SEARCH_MAX_RESULTS),
     )
-    return results
+    web.add_done_callback(_learn)
+
+    async def web_results() -> list[dict[str, Any]]:
+        if COMPARABLE_SEARCH_STRATEGY == "web":
+            return await asyncio.shield(web)
+        try:
+            # shield: past the deadline the search keeps running so its results still reach the corpus
+            return await asyncio.wait_for(asyncio.shield(web), WEB_SEARCH_DEADLINE_S)
+        except asyncio.TimeoutError:
+            telemetry.incr("web_search.deadline")
+            return []
+
+    # Past the turn deadline: local (cached) results only, possibly none
+    results = await within_budget(web_results(), "search", list, reserve_s=DEADLINE_RESERVE_S["search"])
+    if not results and local:
+        telemetry.incr("web_search.local_fallback")
+    return _merge(results, local, WEB_SEARCH_MAX_RESULTS)